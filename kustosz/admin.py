@@ -5,6 +5,7 @@ from kustosz import models
 
 admin.site.register(models.User, UserAdmin)
 admin.site.register(models.Channel)
+admin.site.register(models.ChannelFetchLog)
 admin.site.register(models.Entry)
 admin.site.register(models.EntryContent)
 admin.site.register(models.EntryFilter)
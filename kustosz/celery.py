@@ -1,6 +1,8 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_process_shutdown
+from celery.signals import worker_shutdown
 
 from kustosz.enums import SerialQueuesNamesEnum
 from kustosz.enums import TaskNamesEnum
@@ -17,5 +19,21 @@ app.conf.task_routes = {
     TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT: {
         "queue": SerialQueuesNamesEnum.FEED_FETCHER
     },
+    TaskNamesEnum.PRUNE_FEED_FETCHER_CACHE: {
+        "queue": SerialQueuesNamesEnum.FEED_FETCHER
+    },
 }
 app.autodiscover_tasks()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_feed_fetchers(**kwargs):
+    # worker processes may keep fetchers and feed parsing processes between
+    # tasks (tasks of threads and solo pools run in main worker process);
+    # imported here, as Django is not ready when module is loaded
+    from kustosz.fetchers.feed import close_warm_feed_fetchers
+    from kustosz.fetchers.parse_pool import shutdown_parse_pools
+
+    close_warm_feed_fetchers()
+    shutdown_parse_pools()
@@ -2,6 +2,7 @@ from pathlib import Path
 
 from django.conf import settings
 
+ADAPTIVE_UPDATE_FREQUENCY_SAMPLE_SIZE = 20
 AUTODETECT_CHANNEL_ENTRIES_MAX = 5
 AUTODETECT_RESULTS_EXPIRE_TIME = 3600
 DATA_EXPORT_CACHE_EXPIRE_TIME = 30
@@ -9,6 +10,12 @@ DATA_EXPORT_CACHE_KEY = "data_export_ott"
 DEFAULT_MARK_AS_READ_RATIO = 1
 DEFAULT_MARK_AS_READ_OPEN_TIME = 2
 DEFAULT_UPDATE_FREQUENCY = 3600
+ENTRIES_BULK_CREATE_BATCH_SIZE = 500
 FETCHERS_CACHE_DIR: Path = settings.BASE_DIR / "cache"
 FEED_FETCHER_LOCAL_FEEDS_DIR: Path = settings.BASE_DIR / "feeds"
+HOSTS_RETRY_AFTER_CACHE_KEY = "hosts_retry_after"
 SINGLE_URL_FETCHER_REQUEST_TIMEOUT = 10
+WEBSUB_LEASE_SECONDS_MAX = 365 * 86400
+WEBSUB_LEASE_SECONDS_MIN = 60
+WEBSUB_LEASE_RENEWAL_MARGIN = 600
+WEBSUB_REQUEST_TIMEOUT = 10
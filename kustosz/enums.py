@@ -33,6 +33,11 @@ class EntryMarkAsReadStrategiesEnum(models.TextChoices):
     RATIO_READ = "ratio_read", "When …% has been read"
 
 
+class FeedFetcherEnginesEnum(models.TextChoices):
+    THREADS = "threads", "reader thread workers"
+    ASYNCIO = "asyncio", "thread pool retrieval scheduled by asyncio event loop"
+
+
 class ImportChannelsActionsEnum(models.TextChoices):
     AUTODISCOVER = "autodiscover"
     OPML = "opml"
@@ -55,7 +60,10 @@ class TaskNamesEnum(models.TextChoices):
     DEDUPLICATE_ENTRIES = "kustosz.deduplicate_entries"
     FETCH_CHANNEL_CONTENT = "kustosz.fetch_channel_content"
     FETCH_FEED_CHANNEL_CONTENT = "kustosz.fetch_feed_channel_content"
+    FETCH_FEED_CHANNEL_CONTENT_PRIORITY = "kustosz.fetch_feed_channel_content_priority"
     FETCH_MANUAL_ENTRY_DATA = "kustosz.fetch_manual_entry_data"
     FETCH_MANUAL_ENTRY_METADATA = "kustosz.fetch_manual_entry_metadata"
     FILTER_ACTION_RUN_SCRIPT = "kustosz.filter_action_run_script"
+    PRUNE_FEED_FETCHER_CACHE = "kustosz.prune_feed_fetcher_cache"
     RUN_FILTERS_ON_ENTRIES = "kustosz.run_filters_on_entries"
+    WEBSUB_SUBSCRIBE = "kustosz.websub_subscribe"
@@ -23,3 +23,7 @@ class SerialTaskAlreadyInProgress(Exception):
 
 class TransientFetcherError(Exception):
     pass
+
+
+class HostRateLimitedError(TransientFetcherError):
+    pass
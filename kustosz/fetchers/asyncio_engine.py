@@ -0,0 +1,129 @@
+import asyncio
+import queue
+import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextlib import nullcontext
+from typing import NamedTuple
+
+from django.conf import settings
+from reader._parser import RetrieveResult
+
+from kustosz.fetchers.politeness import get_url_host
+
+
+# bodies larger than that are spooled to disk while waiting for parser
+SPOOLED_BODY_MAX_SIZE = 1024 * 1024
+
+
+class _RetrievalFailed(NamedTuple):
+    exception: BaseException
+
+
+@contextmanager
+def _prefetched_feed(retrieved, resource):
+    try:
+        yield retrieved
+    finally:
+        resource.close()
+
+
+class AsyncioRetrievalEngine:
+    """Retrieve many feeds at the same time, in pool of max_connections
+    threads scheduled by asyncio event loop, limiting number of
+    connections to each host.
+
+    reader retrieves feed only when its parser enters retrieval context,
+    so retrieval and parsing of all feeds happen one after another in
+    a single thread. Here retrieval context is entered and response body
+    is read in advance, and parser gets feeds as soon as they are ready.
+    Requests are still blocking; event loop only decides which of them
+    are sent next.
+    """
+
+    def __init__(self, max_connections: int, max_host_connections: int):
+        self._max_connections = max_connections
+        self._max_host_connections = max_host_connections
+
+    def _retrieve(self, retrieve_fn, feed):
+        result = retrieve_fn(feed)
+        if isinstance(result.value, Exception):
+            return result
+
+        try:
+            with result.value as retrieved:
+                resource = tempfile.SpooledTemporaryFile(SPOOLED_BODY_MAX_SIZE)
+                shutil.copyfileobj(retrieved.resource, resource)
+                resource.seek(0)
+        except Exception as e:
+            # exceptions are passed to parser, same as reader does
+            return RetrieveResult(feed, e)
+
+        retrieved = retrieved._replace(resource=resource)
+        return RetrieveResult(feed, _prefetched_feed(retrieved, resource))
+
+    async def _retrieve_all(self, retrieve_fn, feeds, results):
+        try:
+            await self._retrieve_each(retrieve_fn, feeds, results)
+        except BaseException as e:
+            # map() waits for results that will never come otherwise;
+            # exception is raised there, in thread of its caller
+            results.put(_RetrievalFailed(e))
+
+    async def _retrieve_each(self, retrieve_fn, feeds, results):
+        loop = asyncio.get_running_loop()
+        # host politeness scheduler limits connections as well, but feeds
+        # waiting for their host here don't take threads of executor
+        host_semaphores = defaultdict(
+            lambda: (
+                asyncio.Semaphore(self._max_host_connections)
+                if self._max_host_connections
+                else nullcontext()
+            )
+        )
+
+        with ThreadPoolExecutor(self._max_connections) as executor:
+
+            async def retrieve(feed):
+                async with host_semaphores[get_url_host(feed.url)]:
+                    result = await loop.run_in_executor(
+                        executor, self._retrieve, retrieve_fn, feed
+                    )
+                results.put(result)
+
+            await asyncio.gather(*(retrieve(feed) for feed in feeds))
+
+    def map(self, retrieve_fn, feeds):
+        # feeds come from reader database, which must be used only by thread
+        # that created it; that's why they are all consumed here
+        feeds = list(feeds)
+        results = queue.Queue()
+        retrieval_thread = threading.Thread(
+            target=asyncio.run,
+            args=(self._retrieve_all(retrieve_fn, feeds, results),),
+            daemon=True,
+        )
+        retrieval_thread.start()
+        for _ in feeds:
+            result = results.get()
+            if isinstance(result, _RetrievalFailed):
+                retrieval_thread.join()
+                raise result.exception
+            yield result
+        retrieval_thread.join()
+
+
+def asyncio_engine_plugin(reader):
+    engine = AsyncioRetrievalEngine(
+        max_connections=settings.KUSTOSZ_FEED_FETCHER_MAX_CONNECTIONS,
+        max_host_connections=settings.KUSTOSZ_HOST_MAX_CONNECTIONS,
+    )
+    parallel = reader._parser.parallel
+
+    def asyncio_parallel(feeds, map=map):
+        return parallel(feeds, engine.map)
+
+    reader._parser.parallel = asyncio_parallel
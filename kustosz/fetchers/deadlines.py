@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Optional
+
+from reader import ParseError
+
+
+# how much of response body is read between deadline checks, in bytes
+DEADLINE_READ_SIZE = 64 * 1024
+
+ABANDONED_MESSAGE = "abandoned after chunk deadline passed"
+
+
+class FetchDeadlines:
+    """Keeps track of time feeds of one chunk are allowed to take.
+
+    Each feed must be downloaded within feed_timeout seconds since its
+    request was sent. Feeds not downloaded within chunk_timeout seconds
+    since chunk was started are abandoned. Timeout of 0 means no limit.
+    """
+
+    def __init__(self, feed_timeout: float, chunk_timeout: float):
+        self._lock = threading.Lock()
+        self._feed_timeout = feed_timeout
+        self._chunk_timeout = chunk_timeout
+        self._chunk_deadline = None
+        self._feed_deadlines = {}
+        self._abandoned_urls = set()
+
+    def start_chunk(self):
+        with self._lock:
+            self._chunk_deadline = None
+            if self._chunk_timeout:
+                self._chunk_deadline = time.monotonic() + self._chunk_timeout
+            self._feed_deadlines.clear()
+            self._abandoned_urls.clear()
+
+    def start_feed(self, url: str):
+        if not self._feed_timeout:
+            return
+        with self._lock:
+            self._feed_deadlines[url] = time.monotonic() + self._feed_timeout
+
+    def check(self, url: str):
+        """Raise ParseError if url is past any of its deadlines."""
+        now = time.monotonic()
+        if self._chunk_deadline and now > self._chunk_deadline:
+            with self._lock:
+                self._abandoned_urls.add(url)
+            raise ParseError(url, message=ABANDONED_MESSAGE)
+        feed_deadline = self._feed_deadlines.get(url)
+        if feed_deadline and now > feed_deadline:
+            raise ParseError(
+                url, message=f"not downloaded within {self._feed_timeout} seconds"
+            )
+
+    def is_abandoned(self, url: str) -> bool:
+        return url in self._abandoned_urls
+
+    def get_read_timeout(self, read_timeout: Optional[float]) -> Optional[float]:
+        # single read that blocks for long is not interrupted by deadline
+        # checks, so it must not take longer than feed is allowed to
+        if not self._feed_timeout:
+            return read_timeout
+        if read_timeout is None:
+            return self._feed_timeout
+        return min(read_timeout, self._feed_timeout)
+
+
+class DeadlineStream:
+    """File-like wrapper around response body that checks deadlines of
+    url before each read. Body is read in small pieces, so server that
+    trickles bytes can't hold reader past deadline."""
+
+    def __init__(self, stream, url: str, deadlines: FetchDeadlines):
+        object.__setattr__(self, "_stream", stream)
+        object.__setattr__(self, "_url", url)
+        object.__setattr__(self, "_deadlines", deadlines)
+
+    def read(self, amt=None, *args, **kwargs):
+        if amt is not None and amt >= 0:
+            self._deadlines.check(self._url)
+            return self._stream.read(amt, *args, **kwargs)
+
+        chunks = []
+        while True:
+            self._deadlines.check(self._url)
+            chunk = self._stream.read(DEADLINE_READ_SIZE, *args, **kwargs)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def __setattr__(self, name, value):
+        # reader configures response body after response hooks are run
+        setattr(self._stream, name, value)
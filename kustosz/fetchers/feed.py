@@ -1,25 +1,77 @@
 import enum
+import hashlib
+import io
+import sqlite3
 import tempfile
+import threading
+import time
+from collections import Counter
+from collections import defaultdict
+from contextlib import closing
+from contextlib import contextmanager
+from contextlib import ExitStack
+from dataclasses import replace
+from datetime import datetime
 from pathlib import Path
+from typing import Callable
 from typing import Iterable
+from typing import Iterator
+from typing import Mapping
 from typing import Optional
+from typing import Sequence
 
 from django.conf import settings
-from reader import Entry
 from reader import EntryUpdateStatus
+from reader import Feed
 from reader import FeedExistsError
 from reader import make_reader
+from reader import ParseError
+from reader._parser import default_parser
+from reader._parser import NotModified
+from reader._parser import RetrievedFeed
+from reader._parser.feedparser import FeedparserParser
+from reader._types import EntryData
 from reader.plugins import DEFAULT_PLUGINS as READER_DEFAULT_PLUGINS
 
 from kustosz.constants import FEED_FETCHER_LOCAL_FEEDS_DIR
 from kustosz.constants import FETCHERS_CACHE_DIR
 from kustosz.enums import EntryContentSourceTypesEnum
+from kustosz.enums import FeedFetcherEnginesEnum
+from kustosz.enums import SerialQueuesNamesEnum
+from kustosz.exceptions import HostRateLimitedError
+from kustosz.exceptions import PermanentFetcherError
+from kustosz.fetchers.asyncio_engine import asyncio_engine_plugin
+from kustosz.fetchers.deadlines import ABANDONED_MESSAGE
+from kustosz.fetchers.deadlines import DeadlineStream
+from kustosz.fetchers.deadlines import FetchDeadlines
+from kustosz.fetchers.parse_pool import can_use_parse_pool
+from kustosz.fetchers.parse_pool import process_pool_parsing_plugin
+from kustosz.fetchers.parse_pool import ProcessPoolFeedparserParser
+from kustosz.fetchers.pipeline import iterate_in_background
+from kustosz.fetchers.politeness import get_host_politeness_scheduler
+from kustosz.fetchers.politeness import HostPolitenessRetriever
+from kustosz.fetchers.update_hints import FeedHintsFeedparserParser
+from kustosz.fetchers.update_hints import get_http_update_hint
+from kustosz.fetchers.websub import get_http_websub_links
+from kustosz.types import FeedCachingInfo
+from kustosz.types import FeedFetchStats
 from kustosz.types import FeedFetcherResult
 from kustosz.types import FetchedFeed
 from kustosz.types import FetchedFeedEntry
 from kustosz.types import FetchedFeedEntryContent
 
 
+# ids of entries passed at once to filter deciding which can be removed
+PRUNE_ENTRIES_BATCH_SIZE = 500
+
+# reader feed tag with ids of entries in feed, as plugin name and key
+CURRENT_ENTRIES_TAG = ("kustosz", "current-entries")
+
+# fetchers kept between fetches, see KUSTOSZ_FEED_FETCHER_KEEP_WARM
+_warm_fetchers = {}
+_warm_fetchers_lock = threading.Lock()
+
+
 def normalize_paths_for_reader(paths):
     new_paths = []
     for path in paths:
@@ -45,6 +97,20 @@ def reader_feed_url_to_local_url(path):
     return f"file://{without_prefix}"
 
 
+def get_feed_fetcher_shard(channel_id: int) -> int:
+    return channel_id % settings.KUSTOSZ_FEED_FETCHER_SHARDS
+
+
+def get_feed_fetcher_shards() -> range:
+    return range(settings.KUSTOSZ_FEED_FETCHER_SHARDS)
+
+
+def get_feed_fetcher_lock_id(shard: int) -> str:
+    # each shard has separate reader database, so tasks working on
+    # different shards may run at the same time
+    return f"{SerialQueuesNamesEnum.FEED_FETCHER.value}.{shard}"
+
+
 def aggressive_ua_fallback_plugin(reader):
     # this is almost verbatim copy of reader.plugins.ua_fallback, except
     # that it uses User-Agent set in Kustosz settings. If this User-Agent
@@ -65,49 +131,475 @@ def aggressive_ua_fallback_plugin(reader):
     reader._parser.session_factory.response_hooks.append(aggressive_ua_fallback_hook)
 
 
+def get_resource_size(resource) -> Optional[int]:
+    try:
+        position = resource.tell()
+        size = resource.seek(0, io.SEEK_END)
+        resource.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return size
+
+
+def get_fetched_feed_entry(entry: EntryData) -> FetchedFeedEntry:
+    data_mapping = (
+        # DTO key, reader key
+        ("feed_url", "feed_url"),
+        ("gid", "id"),
+        ("link", "link"),
+        ("title", "title"),
+        ("author", "author"),
+        ("published_time", "published"),
+        ("updated_time", "updated"),
+    )
+    obj_data = {}
+    for key, reader_key in data_mapping:
+        value = getattr(entry, reader_key, None)
+        if value:
+            if key == "feed_url":
+                value = normalize_path_for_kustosz(value)
+            obj_data[key] = value
+
+    contents = []
+    if entry.summary:
+        content_obj = FetchedFeedEntryContent(
+            source=EntryContentSourceTypesEnum.FEED_SUMMARY,
+            content=entry.summary,
+        )
+        contents.append(content_obj)
+    for entry_content in entry.content:
+        content_data = {
+            "source": EntryContentSourceTypesEnum.FEED_CONTENT,
+            "content": entry_content.value,
+        }
+        if entry_content.type:
+            content_data["mimetype"] = entry_content.type
+        if entry_content.language:
+            content_data["language"] = entry_content.language
+
+        content_obj = FetchedFeedEntryContent(**content_data)
+        contents.append(content_obj)
+    if contents:
+        obj_data["content"] = tuple(contents)
+
+    return FetchedFeedEntry(**obj_data)
+
+
 class FeedFetcherPurpose(enum.Enum):
     MAIN = enum.auto()
     FEED_DISCOVERY = enum.auto()
+    PRIORITY = enum.auto()
+
+
+# purposes that get throwaway reader database, so they never wait for
+# fetches working on persistent ones
+EPHEMERAL_DB_PURPOSES = (
+    FeedFetcherPurpose.FEED_DISCOVERY,
+    FeedFetcherPurpose.PRIORITY,
+)
 
 
 class FeedChannelsFetcher:
-    def __init__(self, purpose: FeedFetcherPurpose):
+    def __init__(
+        self,
+        purpose: FeedFetcherPurpose,
+        caching_info: Optional[Mapping[str, FeedCachingInfo]] = None,
+        shard: Optional[int] = 0,
+    ):
         self._purpose = purpose
+        self._shard = shard
         self._prepare_directories()
         self._db_file = self._get_db_file()
         self._fetched_entries = []
+        self._known_caching_info = dict(caching_info or {})
+        self._received_caching_info = {}
+        self._not_modified_urls = set()
+        self._unchanged_urls = set()
+        self._http_update_hints = {}
+        self._feed_update_hints = {}
+        self._websub_links = {}
+        self._politeness_delays = defaultdict(float)
+        self._fetch_durations = {}
+        self._parse_durations = {}
+        self._response_sizes = {}
+        self._http_statuses = {}
+        self._entries_update_statuses = defaultdict(Counter)
+        self._current_entries_ids = {}
+        self._host_scheduler = get_host_politeness_scheduler()
+        self._deadlines = FetchDeadlines(
+            feed_timeout=settings.KUSTOSZ_FEED_FETCH_DEADLINE,
+            chunk_timeout=settings.KUSTOSZ_FEED_FETCHER_CHUNK_DEADLINE,
+        )
+        self._exit_stack = ExitStack()
 
         feed_root = FEED_FETCHER_LOCAL_FEEDS_DIR
         if self._purpose == FeedFetcherPurpose.FEED_DISCOVERY:
             feed_root = FETCHERS_CACHE_DIR
 
+        plugins = READER_DEFAULT_PLUGINS + [
+            aggressive_ua_fallback_plugin,
+            self._caching_info_plugin(),
+            self._host_politeness_plugin(),
+            self._update_hints_plugin(),
+            self._body_hash_plugin(),
+            self._fetch_stats_plugin(),
+        ]
+        if self._purpose == FeedFetcherPurpose.MAIN:
+            plugins.append(self._current_entries_plugin())
+        if can_use_parse_pool():
+            plugins.append(process_pool_parsing_plugin)
+        if settings.KUSTOSZ_FEED_FETCHER_ENGINE == FeedFetcherEnginesEnum.ASYNCIO:
+            plugins.append(asyncio_engine_plugin)
+        # wraps whatever retrieves and parses feeds, so must come last
+        plugins.append(self._deadlines_plugin())
+
         self._reader = make_reader(
             url=str(self._db_file),
             feed_root=str(feed_root),
-            plugins=READER_DEFAULT_PLUGINS + [aggressive_ua_fallback_plugin],
+            plugins=plugins,
         )
         self._reader.after_entry_update_hooks.append(self._reader_plugin())
 
+    def _reset(self, caching_info: Optional[Mapping[str, FeedCachingInfo]] = None):
+        # plugins keep references to these objects, so they are emptied
+        # instead of being replaced
+        self._fetched_entries.clear()
+        self._known_caching_info.clear()
+        self._known_caching_info.update(caching_info or {})
+        for state in (
+            self._received_caching_info,
+            self._not_modified_urls,
+            self._unchanged_urls,
+            self._http_update_hints,
+            self._feed_update_hints,
+            self._websub_links,
+            self._politeness_delays,
+            self._fetch_durations,
+            self._parse_durations,
+            self._response_sizes,
+            self._http_statuses,
+            self._entries_update_statuses,
+            self._current_entries_ids,
+        ):
+            state.clear()
+
+    def _keep_warm(self):
+        # reader uses persistent session of its factory when there is one,
+        # so connections to hosts are reused by subsequent fetches
+        session_factory = self._reader._parser.session_factory
+        self._exit_stack.enter_context(session_factory.persistent())
+
+    def close(self):
+        self._exit_stack.close()
+        self._reader.close()
+
     def _reader_plugin(self):
+        # hook receives complete entry data, exactly as it is stored by
+        # reader; keeping it saves querying reader database for each entry
         fetched_entries = self._fetched_entries
+        entries_update_statuses = self._entries_update_statuses
+
+        def inner(reader, entry: EntryData, status: EntryUpdateStatus):
+            fetched_entries.append(entry)
+            entries_update_statuses[entry.feed_url][status] += 1
+
+        return inner
+
+    def _current_entries_plugin(self):
+        # entries still in feed must survive pruning of reader database,
+        # or they are reported as new next time feed changes. Ids of feed
+        # entries are stored when new entry appears; until then, stored
+        # ids may include entries that are gone from feed, but never miss
+        # entries that are in it
+        current_entries_ids = self._current_entries_ids
+
+        def inner(reader):
+            parser = reader._parser
+            process_entry_pairs = parser.process_entry_pairs
+            tag_key = reader.make_plugin_reserved_name(*CURRENT_ENTRIES_TAG)
+
+            def current_entries_process_entry_pairs(url, mime_type, pairs):
+                pairs = list(process_entry_pairs(url, mime_type, pairs))
+                if any(old is None for _, old in pairs):
+                    current_entries_ids[url] = [new.id for new, _ in pairs]
+                return pairs
+
+            def current_entries_hook(reader, url):
+                entries_ids = current_entries_ids.pop(url, None)
+                if entries_ids is not None:
+                    reader.set_tag(url, tag_key, entries_ids)
+
+            parser.process_entry_pairs = current_entries_process_entry_pairs
+            reader.after_feed_update_hooks.append(current_entries_hook)
+
+        return inner
 
-        def inner(reader, entry: Entry, status: EntryUpdateStatus):
-            fetched_entries.append((entry.feed_url, entry.id))
+    def _caching_info_plugin(self):
+        # reader keeps ETag and Last-Modified in its own database, which
+        # might be removed at any time. Validators stored by Kustosz are
+        # sent when reader does not have its own, so server can still
+        # respond with cheap 304 Not Modified
+        known_caching_info = self._known_caching_info
+        received_caching_info = self._received_caching_info
+        not_modified_urls = self._not_modified_urls
+
+        def caching_info_request_hook(session, request, **kwargs):
+            caching_info = known_caching_info.get(request.url)
+            if not caching_info:
+                return None
+
+            if caching_info.etag:
+                request.headers.setdefault("If-None-Match", caching_info.etag)
+            if caching_info.last_modified:
+                request.headers.setdefault(
+                    "If-Modified-Since", caching_info.last_modified
+                )
+
+            return request
+
+        def caching_info_response_hook(session, response, request, **kwargs):
+            if response.status_code == 304:
+                not_modified_urls.add(request.url)
+                return None
+
+            if not response.ok:
+                return None
+
+            received_caching_info[request.url] = FeedCachingInfo(
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+            )
+            return None
+
+        def inner(reader):
+            session_factory = reader._parser.session_factory
+            session_factory.request_hooks.append(caching_info_request_hook)
+            session_factory.response_hooks.append(caching_info_response_hook)
+
+        return inner
+
+    def _host_politeness_plugin(self):
+        host_scheduler = self._host_scheduler
+        politeness_delays = self._politeness_delays
+
+        def host_politeness_request_hook(session, request, **kwargs):
+            try:
+                delay = host_scheduler.reserve(request.url)
+            except HostRateLimitedError as e:
+                raise ParseError(request.url, message=str(e)) from e
+            if delay > 0:
+                politeness_delays[request.url] += delay
+                time.sleep(delay)
+            return None
+
+        def host_politeness_response_hook(session, response, request, **kwargs):
+            host_scheduler.record_response(request.url, response)
+            return None
+
+        def inner(reader):
+            parser = reader._parser
+            session_factory = parser.session_factory
+            session_factory.request_hooks.append(host_politeness_request_hook)
+            session_factory.response_hooks.append(host_politeness_response_hook)
+            for prefix, retriever in list(parser.retrievers.items()):
+                if prefix.startswith(("http://", "https://")):
+                    parser.retrievers[prefix] = HostPolitenessRetriever(
+                        retriever, host_scheduler
+                    )
 
         return inner
 
+    def _deadlines_plugin(self):
+        # one slow feed should not hold up its chunk, and chunks waiting
+        # for lock after it. Feed not downloaded in time fails; feeds not
+        # downloaded when chunk deadline passes are abandoned, and reader
+        # is not told about them, so they are still due when requested again
+        deadlines = self._deadlines
+
+        def deadlines_request_hook(session, request, **kwargs):
+            deadlines.check(request.url)
+            deadlines.start_feed(request.url)
+            return None
+
+        def deadlines_response_hook(session, response, request, **kwargs):
+            response.raw = DeadlineStream(response.raw, request.url, deadlines)
+            return None
+
+        def inner(reader):
+            parser = reader._parser
+            session_factory = parser.session_factory
+            connect_timeout, read_timeout = session_factory.timeout
+            session_factory.timeout = (
+                connect_timeout,
+                deadlines.get_read_timeout(read_timeout),
+            )
+            session_factory.request_hooks.append(deadlines_request_hook)
+            session_factory.response_hooks.append(deadlines_response_hook)
+            parallel = parser.parallel
+
+            def deadlines_parallel(feeds, map=map):
+                for result in parallel(feeds, map):
+                    if not deadlines.is_abandoned(result.feed.url):
+                        yield result
+
+            parser.parallel = deadlines_parallel
+
+        return inner
+
+    def _update_hints_plugin(self):
+        # feeds and servers may tell how long feed won't change for, and
+        # which WebSub hub pushes its updates; these hints are used to
+        # delay next check of channel
+        http_update_hints = self._http_update_hints
+        feed_update_hints = self._feed_update_hints
+        websub_links = self._websub_links
+
+        def update_hints_response_hook(session, response, request, **kwargs):
+            update_hint = get_http_update_hint(response.status_code, response.headers)
+            if update_hint:
+                http_update_hints[request.url] = update_hint
+            hub, topic = get_http_websub_links(response.links)
+            if hub:
+                websub_links[request.url] = (hub, topic)
+            return None
+
+        def inner(reader):
+            reader._parser.session_factory.response_hooks.append(
+                update_hints_response_hook
+            )
+            parser_class = FeedHintsFeedparserParser
+            if can_use_parse_pool():
+                parser_class = ProcessPoolFeedparserParser
+            feedparser_parser = parser_class(feed_update_hints, websub_links)
+            for parsers in reader._parser.parsers_by_mime_type.values():
+                for i, (quality, parser) in enumerate(parsers):
+                    if isinstance(parser, FeedparserParser):
+                        parsers[i] = (quality, feedparser_parser)
+
+        return inner
+
+    def _body_hash_plugin(self):
+        # many servers don't support conditional requests and send the same
+        # feed every time; its body is compared with one received last time,
+        # and when they match, feed is not parsed again
+        known_caching_info = self._known_caching_info
+        received_caching_info = self._received_caching_info
+        unchanged_urls = self._unchanged_urls
+
+        def inner(reader):
+            parser = reader._parser
+            parse = parser.parse
+
+            def body_hash_parse(url, retrieved):
+                body = retrieved.resource.read()
+                body_hash = hashlib.sha256(body).hexdigest()
+                received = received_caching_info.get(url, FeedCachingInfo())
+                received_caching_info[url] = replace(received, body_hash=body_hash)
+
+                caching_info = known_caching_info.get(normalize_path_for_kustosz(url))
+                if caching_info and caching_info.body_hash == body_hash:
+                    unchanged_urls.add(url)
+                    raise NotModified(url, http_info=retrieved.http_info)
+
+                return parse(url, retrieved._replace(resource=io.BytesIO(body)))
+
+            parser.parse = body_hash_parse
+
+        return inner
+
+    def _fetch_stats_plugin(self):
+        # reader downloads feed when retrieval context is entered, which
+        # happens in retrieval engine or right before parsing; context is
+        # wrapped, so download is timed no matter where it happens
+        fetch_durations = self._fetch_durations
+        parse_durations = self._parse_durations
+        response_sizes = self._response_sizes
+        http_statuses = self._http_statuses
+
+        @contextmanager
+        def timed_retrieval(url, context):
+            start = time.perf_counter()
+            with ExitStack() as stack:
+                try:
+                    retrieved = stack.enter_context(context)
+                finally:
+                    fetch_durations[url] = time.perf_counter() - start
+                yield retrieved
+
+        def inner(reader):
+            parser = reader._parser
+            retrieve_fn = parser.retrieve_fn
+            parse_fn = parser.parse_fn
+            parse = parser.parse
+
+            def timed_retrieve_fn(feed):
+                result = retrieve_fn(feed)
+                if isinstance(result.value, Exception):
+                    return result
+                return result._replace(value=timed_retrieval(feed.url, result.value))
+
+            def timed_parse(url, retrieved):
+                response_sizes[url] = get_resource_size(retrieved.resource)
+                start = time.perf_counter()
+                try:
+                    return parse(url, retrieved)
+                finally:
+                    parse_durations[url] = time.perf_counter() - start
+
+            def http_status_parse_fn(result):
+                parse_result = parse_fn(result)
+                if parse_result.http_info:
+                    http_statuses[result.feed.url] = parse_result.http_info.status
+                return parse_result
+
+            parser.retrieve_fn = timed_retrieve_fn
+            parser.parse_fn = http_status_parse_fn
+            parser.parse = timed_parse
+
+        return inner
+
+    def _get_fetch_stats(self, url: str) -> Optional[FeedFetchStats]:
+        if url not in self._fetch_durations:
+            return None
+        # waiting for our turn to query host says nothing about feed
+        fetch_duration = self._fetch_durations[url] - self._politeness_delays[url]
+        entries_update_statuses = self._entries_update_statuses[url]
+        return FeedFetchStats(
+            fetch_duration=max(fetch_duration, 0),
+            parse_duration=self._parse_durations.get(url),
+            response_size=self._response_sizes.get(url),
+            http_status=self._http_statuses.get(url),
+            new_entries=entries_update_statuses[EntryUpdateStatus.NEW],
+            updated_entries=entries_update_statuses[EntryUpdateStatus.MODIFIED],
+        )
+
+    def _get_update_hint(self, url: str) -> Optional[int]:
+        update_hints = [
+            update_hint
+            for update_hint in (
+                self._http_update_hints.get(url),
+                self._feed_update_hints.get(url),
+            )
+            if update_hint
+        ]
+        if not update_hints:
+            return None
+        return min(max(update_hints), settings.KUSTOSZ_FEED_UPDATE_HINT_MAX)
+
     def _prepare_directories(self):
         for d in (FETCHERS_CACHE_DIR, FEED_FETCHER_LOCAL_FEEDS_DIR):
             d.mkdir(mode=0o700, exist_ok=True)
 
     def _get_db_file(self):
-        if self._purpose == FeedFetcherPurpose.FEED_DISCOVERY:
+        if self._purpose in EPHEMERAL_DB_PURPOSES:
             if not settings.DEBUG:
                 return ":memory:"
             _, db_path = tempfile.mkstemp(".sqlite", dir=FETCHERS_CACHE_DIR)
             return Path(db_path)
 
         db_name = f"readerdb.{self._purpose.name}.sqlite"
+        if self._shard:
+            db_name = f"readerdb.{self._purpose.name}.{self._shard}.sqlite"
         return FETCHERS_CACHE_DIR / db_name
 
     def _remove_db_from_cache(self):
@@ -116,11 +608,59 @@ class FeedChannelsFetcher:
             if path.is_file() and db_name in path.name:
                 path.unlink(missing_ok=True)
 
+    def _get_old_entries_ids(self, added_before: datetime) -> dict[str, list[str]]:
+        old_entries = defaultdict(list)
+        for entry in self._reader.get_entries():
+            if entry.added_by == "feed" and entry.added < added_before:
+                old_entries[entry.feed_url].append(entry.id)
+        return old_entries
+
+    def _remove_old_entries(self, added_before, entries_filter):
+        tag_key = self._reader.make_plugin_reserved_name(*CURRENT_ENTRIES_TAG)
+        removed_count = 0
+        for feed_url, entries_ids in self._get_old_entries_ids(added_before).items():
+            # entries of feed that were not recorded might all be in it
+            current_entries_ids = self._reader.get_tag(feed_url, tag_key, None)
+            if current_entries_ids is None:
+                continue
+            current_entries_ids = set(current_entries_ids)
+            entries_ids = [i for i in entries_ids if i not in current_entries_ids]
+            for i in range(0, len(entries_ids), PRUNE_ENTRIES_BATCH_SIZE):
+                batch = entries_ids[i : i + PRUNE_ENTRIES_BATCH_SIZE]
+                removable_ids = entries_filter(
+                    normalize_path_for_kustosz(feed_url), batch
+                )
+                removable_entries = [(feed_url, entry_id) for entry_id in removable_ids]
+                # Reader.delete_entry() removes only entries added by user;
+                # storage method is the one reader's own plugins use, so
+                # reader is pinned to tested minor version
+                self._reader._storage.delete_entries(removable_entries, added_by="feed")
+                removed_count += len(removable_entries)
+        return removed_count
+
+    def _vacuum_db(self):
+        self._reader.close()
+        with closing(sqlite3.connect(self._db_file)) as db:
+            db.execute("VACUUM")
+
     def _disable_updates_for_existing_feeds(self):
         feeds = self._reader.get_feeds(updates_enabled=True)
         for feed in feeds:
             self._reader.disable_feed_updates(feed)
 
+    def _remove_feeds(self, feed_urls: Iterable[str]):
+        for feed in feed_urls:
+            self._reader.delete_feed(feed, missing_ok=True)
+
+    def _prepare_feeds(self, feed_urls: Iterable[str], force_fetch: bool = False):
+        feed_urls = normalize_paths_for_reader(feed_urls)
+        self._disable_updates_for_existing_feeds()
+        if force_fetch:
+            # feed that reader does not know is downloaded unconditionally,
+            # and all of its entries are reported again
+            self._remove_feeds(feed_urls)
+        self._add_feeds(feed_urls)
+
     def _add_feeds(self, feed_urls: Iterable[str]):
         for feed in feed_urls:
             try:
@@ -128,93 +668,240 @@ class FeedChannelsFetcher:
             except FeedExistsError:
                 self._reader.enable_feed_updates(feed)
 
-    def _get_new_feeds_data(self):
+    def _get_new_feeds_data(self, feeds: Optional[Iterable[Feed]] = None):
+        if feeds is None:
+            feeds = self._reader.get_feeds(updates_enabled=True)
         fetched_feeds: tuple[FetchedFeed, ...] = []
-        for feed in self._reader.get_feeds(updates_enabled=True):
+        for feed in feeds:
             obj_data = {
                 "url": normalize_path_for_kustosz(feed.url),
                 "fetch_failed": bool(feed.last_exception),
             }
+            if self._deadlines.is_abandoned(feed.url):
+                obj_data["fetch_failed"] = True
+                obj_data["abandoned"] = True
+                obj_data["failure_reason"] = ABANDONED_MESSAGE
+            elif feed.last_exception:
+                obj_data["failure_reason"] = feed.last_exception.value_str
             if feed.title:
                 obj_data["title"] = feed.title
             if feed.link:
                 obj_data["link"] = feed.link
+            if feed.url in self._not_modified_urls:
+                obj_data["not_modified"] = True
+            if feed.url in self._unchanged_urls:
+                obj_data["content_unchanged"] = True
+            if caching_info := self._received_caching_info.get(feed.url):
+                obj_data["caching_info"] = caching_info
+            if update_hint := self._get_update_hint(feed.url):
+                obj_data["update_hint"] = update_hint
+            if fetch_stats := self._get_fetch_stats(feed.url):
+                obj_data["fetch_stats"] = fetch_stats
+            if websub_links := self._websub_links.get(feed.url):
+                obj_data["websub_hub"], obj_data["websub_topic"] = websub_links
 
             obj = FetchedFeed(**obj_data)
             fetched_feeds.append(obj)
         return fetched_feeds
 
     def _get_new_entries_data(self):
-        fetched_entries: tuple[FetchedFeedEntry, ...] = []
-        data_mapping = (
-            # DTO key, reader key
-            ("feed_url", "feed_url"),
-            ("gid", "id"),
-            ("link", "link"),
-            ("title", "title"),
-            ("author", "author"),
-            ("published_time", "published"),
-            ("updated_time", "updated"),
-        )
-        for entry_definition in self._fetched_entries:
-            entry = self._reader.get_entry(entry_definition)
-            obj_data = {}
-            for key, reader_key in data_mapping:
-                value = getattr(entry, reader_key, None)
-                if value:
-                    if key == "feed_url":
-                        value = normalize_path_for_kustosz(value)
-                    obj_data[key] = value
-
-            contents = []
-            if entry.summary:
-                content_obj = FetchedFeedEntryContent(
-                    source=EntryContentSourceTypesEnum.FEED_SUMMARY,
-                    content=entry.summary,
-                )
-                contents.append(content_obj)
-            for entry_content in entry.content:
-                content_data = {
-                    "source": EntryContentSourceTypesEnum.FEED_CONTENT,
-                    "content": entry_content.value,
-                }
-                if entry_content.type:
-                    content_data["mimetype"] = entry_content.type
-                if entry_content.language:
-                    content_data["language"] = entry_content.language
-
-                content_obj = FetchedFeedEntryContent(**content_data)
-                contents.append(content_obj)
-            if contents:
-                obj_data["content"] = tuple(contents)
-
-            obj = FetchedFeedEntry(**obj_data)
-            fetched_entries.append(obj)
+        fetched_entries: tuple[FetchedFeedEntry, ...] = [
+            get_fetched_feed_entry(entry) for entry in self._fetched_entries
+        ]
+        # data is given away only once, so memory can be reclaimed
+        self._fetched_entries.clear()
         return fetched_entries
 
-    def update(self, feed_urls: Iterable[str]):
-        self._disable_updates_for_existing_feeds()
-        self._add_feeds(normalize_paths_for_reader(feed_urls))
-        self._reader.update_feeds(workers=settings.KUSTOSZ_FEED_READER_WORKERS)
-
-    def get_new_data(self):
-        feeds_data = self._get_new_feeds_data()
+    def update(self, feed_urls: Iterable[str], force_fetch: bool = False):
+        self._prepare_feeds(feed_urls, force_fetch)
+        self._deadlines.start_chunk()
+        self._host_scheduler.load()
+        try:
+            self._reader.update_feeds(workers=settings.KUSTOSZ_FEED_READER_WORKERS)
+        finally:
+            self._host_scheduler.save()
+
+    def update_iter(
+        self, feed_urls: Iterable[str], force_fetch: bool = False
+    ) -> Iterator[FeedFetcherResult]:
+        self._prepare_feeds(feed_urls, force_fetch)
+        self._deadlines.start_chunk()
+        # host politeness scheduler is loaded and saved by caller, as
+        # this might run in thread that should not touch Django cache
+        updated_feed_urls = set()
+        update_results = self._reader.update_feeds_iter(
+            workers=settings.KUSTOSZ_FEED_READER_WORKERS
+        )
+        for feed_url, value in update_results:
+            # same as update_feeds(), problems with feed are recorded
+            # in its last_exception and everything else is raised
+            if isinstance(value, Exception) and not isinstance(value, ParseError):
+                raise value
+            updated_feed_urls.add(feed_url)
+            yield self.get_new_data(feeds=[self._reader.get_feed(feed_url)])
+
+        # reader does not update feeds it considers not due yet
+        remaining_feeds = [
+            feed
+            for feed in self._reader.get_feeds(updates_enabled=True)
+            if feed.url not in updated_feed_urls
+        ]
+        if remaining_feeds:
+            yield self.get_new_data(feeds=remaining_feeds)
+
+    def get_new_data(self, feeds: Optional[Iterable[Feed]] = None):
+        feeds_data = self._get_new_feeds_data(feeds)
         entries_data = self._get_new_entries_data()
         rv = FeedFetcherResult(feeds=feeds_data, entries=entries_data)
         return rv
 
+    @classmethod
+    def _get_fetcher(
+        cls,
+        purpose: FeedFetcherPurpose,
+        caching_info: Optional[Mapping[str, FeedCachingInfo]],
+        shard: Optional[int],
+    ) -> "FeedChannelsFetcher":
+        """New fetcher, or one that was kept since previous fetch in this
+        process, when KUSTOSZ_FEED_FETCHER_KEEP_WARM is enabled.
+
+        Kept fetcher does not open and migrate reader database, and reuses
+        HTTP connections it made before. It must not be used by two fetches
+        at the same time, which is what feed fetcher queue ensures."""
+        if (
+            not settings.KUSTOSZ_FEED_FETCHER_KEEP_WARM
+            or purpose in EPHEMERAL_DB_PURPOSES
+        ):
+            return cls(purpose=purpose, caching_info=caching_info, shard=shard)
+
+        key = (purpose, shard, FETCHERS_CACHE_DIR)
+        with _warm_fetchers_lock:
+            fetcher = _warm_fetchers.get(key)
+            if fetcher:
+                fetcher._reset(caching_info)
+                return fetcher
+            fetcher = cls(purpose=purpose, caching_info=caching_info, shard=shard)
+            fetcher._keep_warm()
+            _warm_fetchers[key] = fetcher
+            return fetcher
+
+    @classmethod
+    def _close_warm_fetcher(cls, purpose: FeedFetcherPurpose, shard: Optional[int]):
+        with _warm_fetchers_lock:
+            fetcher = _warm_fetchers.pop((purpose, shard, FETCHERS_CACHE_DIR), None)
+        if fetcher:
+            fetcher.close()
+
     @classmethod
     def fetch(
         cls,
         feed_urls: Iterable[str],
         purpose: Optional[FeedFetcherPurpose] = FeedFetcherPurpose.MAIN,
+        caching_info: Optional[Mapping[str, FeedCachingInfo]] = None,
+        shard: Optional[int] = 0,
+        force_fetch: Optional[bool] = False,
     ) -> FeedFetcherResult:
-        fetcher = cls(purpose=purpose)
-        fetcher.update(feed_urls)
+        fetcher = cls._get_fetcher(purpose, caching_info, shard)
+        fetcher.update(feed_urls, force_fetch)
         rv = fetcher.get_new_data()
         return rv
 
     @classmethod
-    def clean_cached_files(cls):
-        fetcher = cls(purpose=FeedFetcherPurpose.MAIN)
-        fetcher._remove_db_from_cache()
+    def fetch_iter(
+        cls,
+        feed_urls: Iterable[str],
+        purpose: Optional[FeedFetcherPurpose] = FeedFetcherPurpose.MAIN,
+        caching_info: Optional[Mapping[str, FeedCachingInfo]] = None,
+        shard: Optional[int] = 0,
+        force_fetch: Optional[bool] = False,
+    ) -> Iterator[FeedFetcherResult]:
+        """Same as fetch, but data of each feed is yielded as soon as
+        feed is updated, so only one feed worth of entries is kept in memory.
+
+        With KUSTOSZ_FEED_FETCHER_PIPELINE_SIZE set, feeds are fetched in
+        background thread while caller processes data of previous ones.
+        """
+
+        def update_iter():
+            fetcher = cls._get_fetcher(purpose, caching_info, shard)
+            return fetcher.update_iter(feed_urls, force_fetch)
+
+        host_scheduler = get_host_politeness_scheduler()
+        host_scheduler.load()
+        try:
+            pipeline_size = settings.KUSTOSZ_FEED_FETCHER_PIPELINE_SIZE
+            if pipeline_size:
+                yield from iterate_in_background(update_iter, max_size=pipeline_size)
+            else:
+                yield from update_iter()
+        finally:
+            host_scheduler.save()
+
+    @classmethod
+    def parse_content(
+        cls,
+        feed_url: str,
+        content: bytes,
+        mime_type: Optional[str] = None,
+    ) -> FeedFetcherResult:
+        """Parse feed document that was not fetched by reader, like content
+        pushed by WebSub hub. Nothing is stored in reader database."""
+        parser = default_parser()
+        retrieved = RetrievedFeed(io.BytesIO(content), mime_type=mime_type)
+        try:
+            parsed_feed = parser.parse(feed_url, retrieved)
+        except ParseError as e:
+            raise PermanentFetcherError(str(e)) from e
+
+        feed_data = FetchedFeed(
+            url=normalize_path_for_kustosz(feed_url),
+            fetch_failed=False,
+            title=parsed_feed.feed.title or "",
+            link=parsed_feed.feed.link or "",
+        )
+        entries_data = [get_fetched_feed_entry(entry) for entry in parsed_feed.entries]
+        return FeedFetcherResult(feeds=(feed_data,), entries=entries_data)
+
+    @classmethod
+    def prune_cached_entries(
+        cls,
+        added_before: datetime,
+        entries_filter: Callable[[str, Sequence[str]], Iterable[str]],
+        shard: Optional[int] = 0,
+    ) -> int:
+        """Remove entries that reader received before added_before and
+        compact its database. entries_filter gets feed URL with ids of
+        its old entries, and returns ids of these that can be removed.
+
+        Feeds are kept, together with caching metadata used for
+        conditional requests."""
+        # database is compacted after reader is closed
+        cls._close_warm_fetcher(FeedFetcherPurpose.MAIN, shard)
+        fetcher = cls(purpose=FeedFetcherPurpose.MAIN, shard=shard)
+        removed_count = fetcher._remove_old_entries(added_before, entries_filter)
+        fetcher._vacuum_db()
+        return removed_count
+
+    @classmethod
+    def clean_cached_files(
+        cls,
+        shard: Optional[int] = 0,
+        feed_urls: Optional[Iterable[str]] = None,
+    ):
+        """Remove feeds from reader database, or whole database file
+        when feed_urls are not given."""
+        if feed_urls is None:
+            cls._close_warm_fetcher(FeedFetcherPurpose.MAIN, shard)
+            fetcher = cls(purpose=FeedFetcherPurpose.MAIN, shard=shard)
+            fetcher._remove_db_from_cache()
+            return
+        fetcher = cls(purpose=FeedFetcherPurpose.MAIN, shard=shard)
+        fetcher._remove_feeds(normalize_paths_for_reader(feed_urls))
+
+
+def close_warm_feed_fetchers():
+    with _warm_fetchers_lock:
+        fetchers = list(_warm_fetchers.values())
+        _warm_fetchers.clear()
+    for fetcher in fetchers:
+        fetcher.close()
@@ -0,0 +1,123 @@
+import io
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from reader._parser import ParseResult
+
+from kustosz.fetchers.update_hints import FeedHintsFeedparserParser
+
+log = logging.getLogger(__name__)
+
+# pools of feed parsing processes, by number of processes
+_parse_pools = {}
+_parse_pools_lock = threading.Lock()
+_daemonic_warning_logged = False
+
+
+def parse_feed_body(url, body, headers):
+    """Parse feed body with feedparser. Runs in pool process, so hints
+    declared by feed are returned together with parsed data."""
+    update_hints = {}
+    websub_links = {}
+    parser = FeedHintsFeedparserParser(update_hints, websub_links)
+    feed, entries = parser(url, io.BytesIO(body), headers)
+    return feed, list(entries), update_hints.get(url), websub_links.get(url)
+
+
+def can_use_parse_pool() -> bool:
+    global _daemonic_warning_logged
+    if not settings.KUSTOSZ_FEED_PARSER_PROCESSES:
+        return False
+    # daemonic processes, like workers of Celery prefork pool, are not
+    # allowed to have children; their feeds are parsed in-process
+    if multiprocessing.current_process().daemon:
+        if not _daemonic_warning_logged:
+            _daemonic_warning_logged = True
+            log.warning(
+                "KUSTOSZ_FEED_PARSER_PROCESSES is set, but feeds are parsed "
+                "in fetching process, as it is daemonic and can't start "
+                "pool processes; run feed_fetcher worker with --pool threads "
+                "or --pool solo to parse feeds in pool"
+            )
+        return False
+    return True
+
+
+def get_parse_pool(max_workers: int) -> ProcessPoolExecutor:
+    with _parse_pools_lock:
+        if max_workers not in _parse_pools:
+            # processes are spawned, not forked, as fetching process already
+            # runs threads and holds database connections
+            _parse_pools[max_workers] = ProcessPoolExecutor(
+                max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pools[max_workers]
+
+
+def shutdown_parse_pools():
+    with _parse_pools_lock:
+        pools = list(_parse_pools.values())
+        _parse_pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+class ProcessPoolFeedparserParser(FeedHintsFeedparserParser):
+    """Same as FeedHintsFeedparserParser, but feed is parsed in pool of
+    processes, so parsing is not limited by GIL of fetching process."""
+
+    def __call__(self, url, resource, headers=None):
+        if not can_use_parse_pool():
+            return super().__call__(url, resource, headers)
+        pool = get_parse_pool(settings.KUSTOSZ_FEED_PARSER_PROCESSES)
+        future = pool.submit(parse_feed_body, url, resource.read(), headers)
+        feed, entries, update_hint, websub_links = future.result()
+        if update_hint:
+            self._update_hints[url] = update_hint
+        if websub_links:
+            self._websub_links.setdefault(url, websub_links)
+        return feed, entries
+
+
+def _map_ahead(executor, fn, iterable, size):
+    # like executor.map, but iterable is not consumed all at once
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= size:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def process_pool_parsing_plugin(reader):
+    """reader parses retrieved feeds one after another; here they are
+    parsed ahead by multiple threads, each waiting for its pool process,
+    and reader only passes parsed results on."""
+    processes = settings.KUSTOSZ_FEED_PARSER_PROCESSES
+    parser = reader._parser
+    parallel = parser.parallel
+    parse_fn = parser.parse_fn
+
+    def parsed_ahead_parse_fn(result):
+        if isinstance(result, ParseResult):
+            return result
+        return parse_fn(result)
+
+    def process_pool_parallel(feeds, map=map):
+        def parse_ahead_map(retrieve_fn, feeds):
+            retrieve_results = map(retrieve_fn, feeds)
+            with ThreadPoolExecutor(processes) as executor:
+                yield from _map_ahead(
+                    executor, parse_fn, retrieve_results, processes * 2
+                )
+
+        return parallel(feeds, parse_ahead_map)
+
+    parser.parse_fn = parsed_ahead_parse_fn
+    parser.parallel = process_pool_parallel
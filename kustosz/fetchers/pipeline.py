@@ -0,0 +1,71 @@
+import queue
+import threading
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import TypeVar
+
+
+T = TypeVar("T")
+
+# how often producer checks if consumer is still interested, in seconds
+PRODUCER_POLL_INTERVAL = 0.1
+
+
+class _ProducerFinished:
+    def __init__(self, exception=None):
+        self.exception = exception
+
+
+def iterate_in_background(
+    make_iterable: Callable[[], Iterable[T]], max_size: int
+) -> Iterator[T]:
+    """Consume iterable in background thread, so producing next items
+    overlaps with processing of current ones.
+
+    Iterable is created by background thread, as some objects (like
+    SQLite connections) must be used only by thread that created them.
+    At most max_size items are waiting to be processed; background
+    thread is paused when that limit is reached.
+    """
+    items = queue.Queue(maxsize=max_size)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=PRODUCER_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce():
+        iterable = None
+        try:
+            iterable = make_iterable()
+            for item in iterable:
+                if not put(item):
+                    break
+        except Exception as e:
+            put(_ProducerFinished(e))
+        else:
+            put(_ProducerFinished())
+        finally:
+            # generators must be closed by thread that runs them
+            if close := getattr(iterable, "close", None):
+                close()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if isinstance(item, _ProducerFinished):
+                if item.exception:
+                    raise item.exception
+                return
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
@@ -0,0 +1,187 @@
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from kustosz.constants import HOSTS_RETRY_AFTER_CACHE_KEY
+from kustosz.exceptions import HostRateLimitedError
+
+
+log = logging.getLogger(__name__)
+
+
+def get_url_host(url: str) -> str:
+    # local files have no host; they are grouped together
+    return urlsplit(url).hostname or ""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_time = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_time.timestamp() - time.time(), 0)
+
+
+class HostPolitenessScheduler:
+    """Spaces out requests sent to the same host, limits number of
+    connections to it and keeps track of hosts that asked us to come back
+    later.
+
+    Spacing and connections limit are enforced within a process. Hosts
+    that responded with Retry-After are stored in cache, so they are known
+    to feed fetcher and page fetcher workers alike.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._host_connections = {}
+        self._next_request_times = {}
+        self._retry_after_times = {}
+        self._new_retry_after_times = {}
+
+    def load(self):
+        shared_retry_after_times = cache.get(HOSTS_RETRY_AFTER_CACHE_KEY, {})
+        with self._lock:
+            for host, retry_after_time in shared_retry_after_times.items():
+                self._retry_after_times[host] = max(
+                    retry_after_time, self._retry_after_times.get(host, 0)
+                )
+
+    def save(self):
+        with self._lock:
+            new_retry_after_times = self._new_retry_after_times
+            self._new_retry_after_times = {}
+        if not new_retry_after_times:
+            return
+
+        now = time.time()
+        retry_after_times = cache.get(HOSTS_RETRY_AFTER_CACHE_KEY, {})
+        retry_after_times.update(new_retry_after_times)
+        retry_after_times = {
+            host: retry_after_time
+            for host, retry_after_time in retry_after_times.items()
+            if retry_after_time > now
+        }
+        if not retry_after_times:
+            return
+        timeout = math.ceil(max(retry_after_times.values()) - now)
+        cache.set(HOSTS_RETRY_AFTER_CACHE_KEY, retry_after_times, timeout=timeout)
+
+    @contextmanager
+    def connection(self, url: str):
+        """Hold one of connections to host of url; blocks while all of
+        them are taken."""
+        max_connections = settings.KUSTOSZ_HOST_MAX_CONNECTIONS
+        if not max_connections:
+            yield
+            return
+        host = get_url_host(url)
+        with self._lock:
+            if host not in self._host_connections:
+                self._host_connections[host] = threading.BoundedSemaphore(
+                    max_connections
+                )
+            semaphore = self._host_connections[host]
+        with semaphore:
+            yield
+
+    def reserve(self, url: str) -> float:
+        """Reserve time slot for request to url. Returns number of seconds
+        caller should wait before sending request."""
+        host = get_url_host(url)
+        now = time.time()
+        with self._lock:
+            retry_after_time = self._retry_after_times.get(host, 0)
+            if retry_after_time - now > settings.KUSTOSZ_HOST_MAX_RETRY_AFTER_WAIT:
+                msg = (
+                    f"{host} asked to retry after "
+                    f"{math.ceil(retry_after_time - now)} seconds"
+                )
+                raise HostRateLimitedError(msg)
+
+            request_time = max(
+                now, retry_after_time, self._next_request_times.get(host, 0)
+            )
+            self._next_request_times[host] = (
+                request_time + settings.KUSTOSZ_HOST_REQUEST_INTERVAL
+            )
+        return request_time - now
+
+    def wait(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            log.debug("waiting %.2f seconds before requesting %s", delay, url)
+            time.sleep(delay)
+
+    def record_response(self, url: str, response):
+        if response.status_code not in (429, 503):
+            return
+
+        delay = parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            if response.status_code != 429:
+                return
+            delay = settings.KUSTOSZ_HOST_DEFAULT_RETRY_AFTER
+
+        host = get_url_host(url)
+        log.info("%s asked to retry after %s seconds", host, delay)
+        retry_after_time = time.time() + delay
+        with self._lock:
+            self._retry_after_times[host] = retry_after_time
+            self._new_retry_after_times[host] = retry_after_time
+
+
+@lru_cache
+def get_host_politeness_scheduler() -> HostPolitenessScheduler:
+    return HostPolitenessScheduler()
+
+
+class HostPolitenessAdapter(HTTPAdapter):
+    # requests served from cache never reach transport adapter,
+    # so they are not delayed
+    def __init__(self, scheduler: HostPolitenessScheduler, *args, **kwargs):
+        self._scheduler = scheduler
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, stream=False, *args, **kwargs):
+        with self._scheduler.connection(request.url):
+            self._scheduler.wait(request.url)
+            response = super().send(request, stream, *args, **kwargs)
+            if not stream:
+                # body is downloaded while connection is held
+                response.content
+        self._scheduler.record_response(request.url, response)
+        return response
+
+
+class HostPolitenessRetriever:
+    """Wraps reader retriever, so connection to host is held while feed
+    is retrieved."""
+
+    def __init__(self, retriever, scheduler: HostPolitenessScheduler):
+        self._retriever = retriever
+        self._scheduler = scheduler
+
+    @contextmanager
+    def __call__(self, url, *args, **kwargs):
+        with self._scheduler.connection(url):
+            with self._retriever(url, *args, **kwargs) as retrieved:
+                yield retrieved
+
+    def __getattr__(self, name):
+        return getattr(self._retriever, name)
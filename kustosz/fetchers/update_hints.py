@@ -0,0 +1,142 @@
+import io
+from datetime import datetime
+from datetime import timezone
+from html.parser import HTMLParser
+from typing import Any
+from typing import Mapping
+from typing import Optional
+
+from reader._parser import HTTPInfo
+from reader._parser.feedparser import FeedparserParser
+from requests.structures import CaseInsensitiveDict
+
+from kustosz.fetchers.websub import get_feed_websub_links
+
+
+# feed document is read in pieces of this size while looking for hints
+FEED_HEAD_READ_SIZE = 16 * 1024
+
+# elements declaring hints by local name, and their keys in feedparser
+FEED_HINT_ELEMENTS = {
+    "ttl": "ttl",
+    "updateperiod": "sy_updateperiod",
+    "updatefrequency": "sy_updatefrequency",
+}
+
+SYNDICATION_UPDATE_PERIODS = {
+    "hourly": 60 * 60,
+    "daily": 24 * 60 * 60,
+    "weekly": 7 * 24 * 60 * 60,
+    "monthly": 30 * 24 * 60 * 60,
+    "yearly": 365 * 24 * 60 * 60,
+}
+
+
+def _parse_positive_int(value: Any) -> Optional[int]:
+    try:
+        value = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    if value <= 0:
+        return None
+    return value
+
+
+def get_feed_update_hint(feed: Mapping[str, Any]) -> Optional[int]:
+    """Number of seconds feed claims it won't change for, based on RSS <ttl>
+    and syndication module elements."""
+    hints = []
+
+    # RSS 2.0 <ttl> is expressed in minutes
+    if ttl := _parse_positive_int(feed.get("ttl")):
+        hints.append(ttl * 60)
+
+    update_period = str(feed.get("sy_updateperiod", "")).strip().lower()
+    if period := SYNDICATION_UPDATE_PERIODS.get(update_period):
+        update_frequency = _parse_positive_int(feed.get("sy_updatefrequency")) or 1
+        hints.append(period // update_frequency)
+
+    return max(hints, default=None)
+
+
+def get_http_update_hint(status: int, headers: Mapping[str, str]) -> Optional[int]:
+    """Number of seconds response stays fresh, based on Cache-Control max-age
+    and Expires headers."""
+    # errors are handled by host politeness scheduler
+    if status >= 400:
+        return None
+
+    now = datetime.now(timezone.utc)
+    update_after = HTTPInfo(status, CaseInsensitiveDict(headers)).get_update_after(now)
+    if not update_after:
+        return None
+    return _parse_positive_int(int((update_after - now).total_seconds()))
+
+
+class FeedHeadParser(HTMLParser):
+    """Picks up update hints and links of feed document, up to its first
+    entry. Like feedparser's loose parser, it does not require well-formed
+    XML, and elements are matched by local name, whatever their prefix."""
+
+    def reset(self):
+        super().reset()
+        self.feed_head = {"links": []}
+        self.done = False
+        self._hint_key = None
+
+    def handle_starttag(self, tag, attrs):
+        local_name = tag.rpartition(":")[2]
+        if self.done or local_name in ("item", "entry"):
+            self.done = True
+            return
+        self._hint_key = FEED_HINT_ELEMENTS.get(local_name)
+        if self._hint_key:
+            self.feed_head[self._hint_key] = ""
+        attrs_dict = {key: value for key, value in attrs}
+        if local_name == "link" and attrs_dict.get("href"):
+            self.feed_head["links"].append(attrs_dict)
+
+    def handle_endtag(self, tag):
+        self._hint_key = None
+
+    def handle_data(self, data):
+        if self._hint_key and not self.done:
+            self.feed_head[self._hint_key] += data
+
+
+def get_feed_head(body: bytes) -> dict[str, Any]:
+    """Update hints and links of feed document, with the same keys as feed
+    parsed by feedparser."""
+    parser = FeedHeadParser()
+    for i in range(0, len(body), FEED_HEAD_READ_SIZE):
+        if parser.done:
+            break
+        chunk = body[i : i + FEED_HEAD_READ_SIZE]
+        parser.feed(chunk.decode("utf-8", errors="replace"))
+    return parser.feed_head
+
+
+class FeedHintsFeedparserParser:
+    """Wraps reader's feedparser parser, recording update hints and WebSub
+    hubs declared by feeds.
+
+    reader discards everything it does not store, so hints are read from
+    beginning of feed document, where they are declared.
+    """
+
+    accept = FeedparserParser.accept
+
+    def __init__(self, update_hints: dict, websub_links: dict):
+        self._parser = FeedparserParser()
+        self._update_hints = update_hints
+        self._websub_links = websub_links
+
+    def __call__(self, url, resource, headers=None):
+        body = resource.read()
+        feed_head = get_feed_head(body)
+        if update_hint := get_feed_update_hint(feed_head):
+            self._update_hints[url] = update_hint
+        hub, topic = get_feed_websub_links(feed_head)
+        if hub:
+            self._websub_links.setdefault(url, (hub, topic))
+        return self._parser(url, io.BytesIO(body), headers)
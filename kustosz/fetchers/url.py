@@ -8,8 +8,11 @@ from requests_cache import CachedSession
 
 from kustosz.constants import FETCHERS_CACHE_DIR
 from kustosz.constants import SINGLE_URL_FETCHER_REQUEST_TIMEOUT
+from kustosz.exceptions import HostRateLimitedError
 from kustosz.exceptions import PermanentFetcherError
 from kustosz.exceptions import TransientFetcherError
+from kustosz.fetchers.politeness import get_host_politeness_scheduler
+from kustosz.fetchers.politeness import HostPolitenessAdapter
 
 
 log = logging.getLogger(__name__)
@@ -49,6 +52,10 @@ class SingleURLFetcher:
         )
         for header, value in settings.KUSTOSZ_URL_FETCHER_EXTRA_HEADERS.items():
             self._session.headers[header] = value
+        self._host_scheduler = get_host_politeness_scheduler()
+        host_politeness_adapter = HostPolitenessAdapter(self._host_scheduler)
+        self._session.mount("http://", host_politeness_adapter)
+        self._session.mount("https://", host_politeness_adapter)
         self._parser = EncodingSeekingParser()
 
     def _get_content_encoding(self, response):
@@ -84,6 +91,7 @@ class SingleURLFetcher:
         return final_encoding
 
     def _fetch(self, url):
+        self._host_scheduler.load()
         try:
             response = self._session.get(
                 url, timeout=SINGLE_URL_FETCHER_REQUEST_TIMEOUT
@@ -106,11 +114,15 @@ class SingleURLFetcher:
         ) as e:
             log.debug("url %s raised %s:", url, e.__class__.__name__, exc_info=True)
             raise PermanentFetcherError().with_traceback(e.__traceback__) from e
+        finally:
+            self._host_scheduler.save()
 
         log.debug("url %s returned HTTP code %s", url, response.status_code)
 
         if not response.ok:
             msg = f"Error code {response.status_code}"
+            if response.status_code == 429:
+                raise HostRateLimitedError(msg)
             if 400 <= response.status_code <= 499:
                 raise PermanentFetcherError(msg)
             if 500 <= response.status_code <= 599:
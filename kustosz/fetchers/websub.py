@@ -0,0 +1,100 @@
+import hashlib
+import hmac
+import logging
+import secrets
+from typing import Any
+from typing import Mapping
+
+import requests
+from django.conf import settings
+from requests import exceptions as requests_exceptions
+
+from kustosz.constants import WEBSUB_REQUEST_TIMEOUT
+from kustosz.exceptions import PermanentFetcherError
+from kustosz.exceptions import TransientFetcherError
+
+
+log = logging.getLogger(__name__)
+
+# hash functions hubs may use to sign distributed content
+SIGNATURE_METHODS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+
+def get_feed_websub_links(feed: Mapping[str, Any]) -> tuple[str, str]:
+    """Hub and topic URLs advertised by feed in its <link> elements."""
+    hub = topic = ""
+    for link in feed.get("links", ()):
+        rel = link.get("rel")
+        href = link.get("href", "")
+        if rel == "hub" and not hub:
+            hub = href
+        elif rel == "self" and not topic:
+            topic = href
+    return hub, topic
+
+
+def get_http_websub_links(links: Mapping[str, Mapping[str, str]]) -> tuple[str, str]:
+    """Hub and topic URLs advertised by server in Link header, as parsed
+    by requests."""
+    hub = links.get("hub", {}).get("url", "")
+    topic = links.get("self", {}).get("url", "")
+    return hub, topic
+
+
+def generate_websub_secret() -> str:
+    return secrets.token_hex(32)
+
+
+def is_valid_websub_signature(secret: str, content: bytes, signature: str) -> bool:
+    method, _, hexdigest = signature.partition("=")
+    digestmod = SIGNATURE_METHODS.get(method.lower())
+    if not digestmod or not hexdigest:
+        return False
+    expected = hmac.new(secret.encode("utf-8"), content, digestmod).hexdigest()
+    return hmac.compare_digest(expected, hexdigest.lower())
+
+
+def request_websub_subscription(hub: str, topic: str, callback: str, secret: str):
+    """Ask hub to start sending updates of topic to callback. Hub confirms
+    by sending verification request to callback, usually some time later."""
+    data = {
+        "hub.mode": "subscribe",
+        "hub.topic": topic,
+        "hub.callback": callback,
+        "hub.secret": secret,
+        "hub.lease_seconds": settings.KUSTOSZ_WEBSUB_LEASE_SECONDS,
+    }
+    try:
+        response = requests.post(
+            hub,
+            data=data,
+            headers=settings.KUSTOSZ_URL_FETCHER_EXTRA_HEADERS,
+            timeout=WEBSUB_REQUEST_TIMEOUT,
+        )
+    except (
+        requests_exceptions.Timeout,
+        requests_exceptions.ConnectionError,
+        requests_exceptions.TooManyRedirects,
+    ) as e:
+        log.debug("hub %s raised %s:", hub, e.__class__.__name__, exc_info=True)
+        raise TransientFetcherError().with_traceback(e.__traceback__) from e
+    except (
+        requests_exceptions.MissingSchema,
+        requests_exceptions.InvalidSchema,
+        requests_exceptions.InvalidURL,
+    ) as e:
+        log.debug("hub %s raised %s:", hub, e.__class__.__name__, exc_info=True)
+        raise PermanentFetcherError().with_traceback(e.__traceback__) from e
+
+    log.debug("hub %s returned HTTP code %s", hub, response.status_code)
+
+    if not response.ok:
+        msg = f"Error code {response.status_code}"
+        if 400 <= response.status_code <= 499:
+            raise PermanentFetcherError(msg)
+        raise TransientFetcherError(msg)
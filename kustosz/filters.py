@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.core.validators import EMPTY_VALUES
+from django.db.models import Q
 from django_filters import rest_framework as drf_filters
 from taggit.forms import TagField
 
@@ -90,6 +92,9 @@ class ChannelFilter(drf_filters.FilterSet):
     is_stale = drf_filters.BooleanFilter(
         field_name="is_stale", method="get_stale_channels"
     )
+    is_quarantined = drf_filters.BooleanFilter(
+        field_name="is_quarantined", method="get_quarantined_channels"
+    )
 
     order = drf_filters.OrderingFilter(
         fields=(
@@ -99,6 +104,7 @@ class ChannelFilter(drf_filters.FilterSet):
             "link",
             "last_check_time",
             "last_successful_check_time",
+            "next_check_time",
             "added_time",
         )
     )
@@ -148,9 +154,11 @@ class ChannelFilter(drf_filters.FilterSet):
             ],
             "last_check_time": ["exact", "lt", "gt", "lte", "gte"],
             "last_successful_check_time": ["exact", "lt", "gt", "lte", "gte"],
+            "next_check_time": ["exact", "lt", "gt", "lte", "gte", "isnull"],
             "added_time": ["exact", "lt", "gt", "lte", "gte"],
             "active": ["exact"],
             "update_frequency": ["exact", "lt", "gt", "lte", "gte"],
+            "consecutive_failures": ["exact", "lt", "gt", "lte", "gte"],
         }
 
     def get_stale_channels(self, queryset, field_name, value):
@@ -160,6 +168,50 @@ class ChannelFilter(drf_filters.FilterSet):
                 selected_channels.append(channel.pk)
         return queryset.filter(pk__in=selected_channels)
 
+    def get_quarantined_channels(self, queryset, field_name, value):
+        threshold = settings.KUSTOSZ_FAILING_CHANNEL_QUARANTINE_THRESHOLD
+        quarantined = Q(consecutive_failures__gte=threshold)
+        if value:
+            return queryset.filter(quarantined)
+        return queryset.exclude(quarantined)
+
+
+class ChannelFetchStatsFilter(drf_filters.FilterSet):
+    channel = NumberInFilter(field_name="channel", lookup_expr="in")
+    fetch_time__lt = drf_filters.IsoDateTimeFilter(
+        field_name="fetch_time", lookup_expr="lt"
+    )
+    fetch_time__gt = drf_filters.IsoDateTimeFilter(
+        field_name="fetch_time", lookup_expr="gt"
+    )
+    fetch_time__lte = drf_filters.IsoDateTimeFilter(
+        field_name="fetch_time", lookup_expr="lte"
+    )
+    fetch_time__gte = drf_filters.IsoDateTimeFilter(
+        field_name="fetch_time", lookup_expr="gte"
+    )
+
+    order = drf_filters.OrderingFilter(
+        fields=(
+            "channel",
+            "fetch_count",
+            "failed_count",
+            "not_modified_count",
+            "content_unchanged_count",
+            "avg_duration",
+            "max_duration",
+            "avg_parse_duration",
+            "avg_response_size",
+            "max_response_size",
+            "total_new_entries",
+            "total_updated_entries",
+        )
+    )
+
+    class Meta:
+        model = models.ChannelFetchLog
+        fields = []
+
 
 class EntryFilter(drf_filters.FilterSet):
     tags = TagFilter(field_name="tags__slug")
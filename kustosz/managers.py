@@ -1,44 +1,70 @@
 import logging
 from collections import defaultdict
 from dataclasses import asdict
+from datetime import datetime
 from datetime import timedelta
-from sys import maxsize as time_always_update
 from typing import Iterable
+from typing import Mapping
 from typing import Optional
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
+from django.db import connection
 from django.db import models
 from django.db import transaction
+from django.db.models import Avg
 from django.db.models import Case
 from django.db.models import Count
+from django.db.models import F
 from django.db.models import Max
+from django.db.models import Prefetch
 from django.db.models import Q
+from django.db.models import Sum
 from django.db.models import TextField
+from django.db.models import Value
 from django.db.models import When
+from django.db.models import Window
 from django.db.models.functions import Coalesce
+from django.db.models.functions import Mod
+from django.db.models.functions import RowNumber
 from django.db.models.query import QuerySet
 from django.http import QueryDict
+from django.urls import reverse
 from django.utils.timezone import now as django_now
 
+from .constants import ADAPTIVE_UPDATE_FREQUENCY_SAMPLE_SIZE
+from .constants import ENTRIES_BULK_CREATE_BATCH_SIZE
+from .constants import WEBSUB_LEASE_RENEWAL_MARGIN
+from .constants import WEBSUB_LEASE_SECONDS_MAX
+from .constants import WEBSUB_LEASE_SECONDS_MIN
 from .enums import ChannelTypesEnum
 from .enums import TaskNamesEnum
 from .exceptions import InvalidDataException
 from .exceptions import NoNewChannelsAddedException
 from .exceptions import PermanentFetcherError
+from .exceptions import TransientFetcherError
 from .fetchers.feed import FeedChannelsFetcher
+from .fetchers.feed import FeedFetcherPurpose
+from .fetchers.feed import get_feed_fetcher_shard
+from .fetchers.feed import get_feed_fetcher_shards
 from .fetchers.url import SingleURLFetcher
+from .fetchers.websub import generate_websub_secret
+from .fetchers.websub import is_valid_websub_signature
+from .fetchers.websub import request_websub_subscription
 from .types import AddChannelResult
 from .types import AddSingleChannelResult
 from .types import AsyncTaskResult
 from .types import ChannelDataInput
 from .types import EntryDataInput
+from .types import FeedCachingInfo
+from .types import FeedFetcherResult
 from .types import FetchedFeed
 from .types import FetchedFeedEntry
 from .types import ReadabilityContentList
 from .utils import dispatch_task_by_name
 from .utils import estimate_reading_time
+from .utils import get_content_hash
 from .utils import make_unique
 from .utils import optional_make_aware
 from .utils.duplicate_finder import DuplicateFinder
@@ -46,6 +72,11 @@ from .utils.extract_metadata import MetadataExtractor
 from .utils.extract_readability import ReadabilityContentExtractor
 from .utils.filter_actions import get_filter_action
 from .utils.opml_exporter import OPMLExporter
+from .utils.update_schedule import estimate_update_frequency
+from .utils.update_schedule import get_backoff_delay
+from .utils.upsert import can_upsert
+from .utils.upsert import update_or_insert_objects
+from .utils.upsert import upsert_objects
 
 
 log = logging.getLogger(__name__)
@@ -93,21 +124,24 @@ class ChannelManager(models.Manager):
     def delete_channels(self, queryset, keep_tagged_entries=True):
         EntryManager = self.model.entries.rel.related_model.objects
         manual_channel = self.get_queryset().get(channel_type=ChannelTypesEnum.MANUAL)
-        has_feeds = queryset.filter(channel_type=ChannelTypesEnum.FEED).exists()
+        feeds = list(
+            queryset.filter(channel_type=ChannelTypesEnum.FEED).values_list("pk", "url")
+        )
         with transaction.atomic():
             if keep_tagged_entries:
                 EntryManager.filter(
                     channel__in=queryset, tags__isnull=False
                 ).distinct().update(channel=manual_channel, updated_time=django_now())
             deleted_count = queryset.delete()
-        if has_feeds:
-            dispatch_task_by_name(
-                TaskNamesEnum.CLEAN_FEED_FETCHER_CACHE,
-            )
+        if feeds:
+            self._request_feed_fetcher_cache_clean(feeds)
         return deleted_count
 
     def add_channels(
-        self, channels_list: Iterable[ChannelDataInput], fetch_content: bool = True
+        self,
+        channels_list: Iterable[ChannelDataInput],
+        fetch_content: bool = True,
+        priority: bool = False,
     ) -> AddChannelResult:
         log.debug("number of requested channels: %s", len(channels_list))
         queryset = self.get_queryset()
@@ -153,7 +187,9 @@ class ChannelManager(models.Manager):
 
         fetch_content_tasks = []
         if fetch_content:
-            fetch_content_tasks = self.fetch_channels_content(inserted_channels)
+            fetch_content_tasks = self.fetch_channels_content(
+                inserted_channels, priority=priority
+            )
 
         channel_results = [
             AddSingleChannelResult(**channel_result)
@@ -164,7 +200,7 @@ class ChannelManager(models.Manager):
         return rv
 
     def fetch_channels_content(
-        self, channels: QuerySet, force_fetch: bool = False
+        self, channels: QuerySet, force_fetch: bool = False, priority: bool = False
     ) -> tuple[AsyncTaskResult, ...]:
         log.debug("number of channels in queryset: %s", channels.count())
 
@@ -176,26 +212,71 @@ class ChannelManager(models.Manager):
         log.debug("number of active channels in queryset: %s", active_channels.count())
 
         feed_channels = active_channels.filter(channel_type=ChannelTypesEnum.FEED)
-
-        if force_fetch and feed_channels:
-            dispatch_task_by_name(
-                TaskNamesEnum.CLEAN_FEED_FETCHER_CACHE,
+        if not force_fetch:
+            feed_channels = self.__filter_due_channels(feed_channels)
+
+        if not feed_channels.exists():
+            log.debug("no feed channels due for update")
+            return []
+
+        if priority:
+            # priority fetch takes no shard lock; channels are claimed by
+            # moving their next check forward, so regular fetch does not
+            # pick them up (new channels are due right away) in meantime
+            channel_ids = list(feed_channels.values_list("pk", flat=True))
+            feed_channels = self.get_queryset().filter(pk__in=channel_ids)
+            feed_channels.update(
+                next_check_time=django_now()
+                + timedelta(seconds=settings.KUSTOSZ_LOCK_EXPIRE)
             )
-
-        feed_channels_paged = Paginator(
-            feed_channels, settings.KUSTOSZ_FETCH_CHANNELS_CHUNK_SIZE
+            feed_channels = feed_channels.order_by("pk")
+            # priority fetches don't use shared reader databases, so
+            # they are not split by shard
+            paginator = Paginator(
+                feed_channels, settings.KUSTOSZ_FETCH_CHANNELS_CHUNK_SIZE
+            )
+            fetch_feeds_tasks = [
+                self._request_feed_channels_content_fetch(
+                    page, force_fetch, shard=0, priority=True
+                )
+                for page in paginator
+            ]
+            return [task for task in fetch_feeds_tasks if task]
+
+        # each shard has its own reader database; chunks are requested
+        # in round-robin fashion, so workers pick up tasks of different
+        # shards and don't wait for each other's locks
+        feed_channels = feed_channels.annotate(
+            fetcher_shard=Mod("pk", Value(settings.KUSTOSZ_FEED_FETCHER_SHARDS))
+        )
+        feed_channels_paged = {
+            shard: Paginator(
+                feed_channels.filter(fetcher_shard=shard),
+                settings.KUSTOSZ_FETCH_CHANNELS_CHUNK_SIZE,
+            )
+            for shard in get_feed_fetcher_shards()
+        }
+        max_chunk_number = max(
+            paginator.num_pages for paginator in feed_channels_paged.values()
         )
 
         fetch_feeds_tasks = []
-        for chunk_number in feed_channels_paged.page_range:
-            task = self._request_feed_channels_content_fetch(
-                feed_channels_paged.get_page(chunk_number), force_fetch
-            )
-            if task:
-                fetch_feeds_tasks.append(task)
+        for chunk_number in range(1, max_chunk_number + 1):
+            for shard, paginator in feed_channels_paged.items():
+                if chunk_number > paginator.num_pages:
+                    continue
+                task = self._request_feed_channels_content_fetch(
+                    paginator.get_page(chunk_number), force_fetch, shard
+                )
+                if task:
+                    fetch_feeds_tasks.append(task)
 
         return fetch_feeds_tasks
 
+    def reschedule_next_check(self, channel_model: models.Model):
+        channel_model.next_check_time = self.__get_next_check_time(channel_model)
+        channel_model.save(update_fields=["next_check_time"])
+
     def export_channels_opml(self) -> str:
         all_channels = (
             self.get_queryset()
@@ -206,30 +287,169 @@ class ChannelManager(models.Manager):
         opml_content = data_exporter.from_queryset(all_channels)
         return opml_content
 
+    def verify_websub_subscription(
+        self,
+        channel_model: models.Model,
+        mode: str,
+        topic: str,
+        lease_seconds: Optional[str] = None,
+    ) -> bool:
+        # callback is public, so requests about other topics are ignored
+        if not channel_model.websub_topic or topic != channel_model.websub_topic:
+            return False
+
+        if mode == "denied":
+            log.info(
+                "WebSub hub denied subscription of channel %s [channel url: %s]",
+                channel_model.pk,
+                channel_model.url,
+            )
+            channel_model.websub_secret = ""
+            channel_model.websub_lease_expires = None
+            channel_model.websub_pending = False
+            channel_model.save(
+                update_fields=[
+                    "websub_secret",
+                    "websub_lease_expires",
+                    "websub_pending",
+                ]
+            )
+            return True
+
+        # only subscriptions requested by Kustosz are confirmed, once
+        if (
+            mode != "subscribe"
+            or not channel_model.websub_secret
+            or not channel_model.websub_pending
+        ):
+            return False
+
+        try:
+            lease_seconds = int(lease_seconds)
+        except (TypeError, ValueError):
+            lease_seconds = settings.KUSTOSZ_WEBSUB_LEASE_SECONDS
+        lease_seconds = min(
+            max(lease_seconds, WEBSUB_LEASE_SECONDS_MIN), WEBSUB_LEASE_SECONDS_MAX
+        )
+        channel_model.websub_pending = False
+        right_now = django_now()
+        channel_model.websub_lease_expires = right_now + timedelta(
+            seconds=lease_seconds
+        )
+        # hub pushes updates, so channel does not have to be checked as often
+        channel_model.next_check_time = self.__get_next_check_time(channel_model)
+        channel_model.save(
+            update_fields=["websub_lease_expires", "websub_pending", "next_check_time"]
+        )
+        log.info(
+            "channel %s subscribed to WebSub hub %s until %s [channel url: %s]",
+            channel_model.pk,
+            channel_model.websub_hub,
+            channel_model.websub_lease_expires,
+            channel_model.url,
+        )
+        return True
+
+    def ingest_websub_content(
+        self,
+        channel_model: models.Model,
+        content: bytes,
+        content_type: str,
+        signature: str,
+    ) -> set[int]:
+        if not channel_model.websub_secret or not is_valid_websub_signature(
+            channel_model.websub_secret, content, signature
+        ):
+            log.warning(
+                "ignoring WebSub content with invalid signature "
+                "for channel %s [channel url: %s]",
+                channel_model.pk,
+                channel_model.url,
+            )
+            return set()
+
+        try:
+            fetched_data = FeedChannelsFetcher.parse_content(
+                feed_url=channel_model.url, content=content, mime_type=content_type
+            )
+        except PermanentFetcherError as e:
+            raise InvalidDataException(str(e)) from e
+        log.debug(
+            "received WebSub content of %s entries for channel %s",
+            len(fetched_data.entries),
+            channel_model.pk,
+        )
+
+        # pushed content is as good as a successful check
+        right_now = django_now()
+        channel_model.last_check_time = right_now
+        channel_model.last_successful_check_time = right_now
+        channel_model.consecutive_failures = 0
+        channel_model.save(
+            update_fields=[
+                "last_check_time",
+                "last_successful_check_time",
+                "consecutive_failures",
+            ]
+        )
+
+        entries_ids = self.__create_or_update_entries(
+            channels=[channel_model], entries_data=fetched_data.entries
+        )
+        if entries_ids:
+            dispatch_task_by_name(TaskNamesEnum.DEDUPLICATE_ENTRIES)
+        self.__run_filters_on_entries(entries_ids)
+        return entries_ids
+
     def _request_feed_channels_content_fetch(
-        self, channels: QuerySet, force_fetch: bool
+        self, channels: QuerySet, force_fetch: bool, shard: int, priority: bool = False
     ) -> Optional[AsyncTaskResult]:
         if not channels:
             return None
         channel_ids = [channel.id for channel in channels if channel.id]
+        if priority:
+            return dispatch_task_by_name(
+                TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT_PRIORITY,
+                kwargs={"channel_ids": channel_ids, "force_fetch": force_fetch},
+            )
         task = dispatch_task_by_name(
             TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
-            kwargs={"channel_ids": channel_ids, "force_fetch": force_fetch},
+            kwargs={
+                "channel_ids": channel_ids,
+                "force_fetch": force_fetch,
+                "shard": shard,
+            },
         )
         return task
 
+    def _request_feed_fetcher_cache_clean(self, channels: Iterable[tuple[int, str]]):
+        feed_urls_by_shard = defaultdict(list)
+        for channel_id, channel_url in channels:
+            feed_urls_by_shard[get_feed_fetcher_shard(channel_id)].append(channel_url)
+        for shard, feed_urls in sorted(feed_urls_by_shard.items()):
+            dispatch_task_by_name(
+                TaskNamesEnum.CLEAN_FEED_FETCHER_CACHE,
+                kwargs={"shard": shard, "feed_urls": feed_urls},
+            )
+
     def _fetch_feed_channels_content(
-        self, channel_ids: Iterable[int], force_fetch: bool
+        self,
+        channel_ids: Iterable[int],
+        force_fetch: bool,
+        shard: int = 0,
+        priority: bool = False,
     ):  # return ids of entries that were fetched?
         queryset = self.get_queryset().filter(pk__in=channel_ids)
 
-        if not force_fetch:
-            requested_feeds = self.__discard_channels_updated_recently(queryset)
-            requested_feed_urls = [feed.url for feed in requested_feeds]
-            queryset = queryset.filter(url__in=requested_feed_urls)
-        else:
-            requested_feed_urls = queryset.values_list("url", flat=True)
-            requested_feed_urls = list(requested_feed_urls)
+        # channels of priority fetch were claimed when it was requested,
+        # so they are not due anymore
+        if not force_fetch and not priority:
+            queryset = self.__filter_due_channels(queryset)
+            # updating feeds moves next_check_time forward, so due channels
+            # must be pinned down before that happens
+            due_channel_ids = list(queryset.values_list("pk", flat=True))
+            queryset = self.get_queryset().filter(pk__in=due_channel_ids)
+        requested_feed_urls = list(queryset.values_list("url", flat=True))
 
         log.info("will update %s feeds", len(requested_feed_urls))
         log.debug("feeds urls: %s", requested_feed_urls)
@@ -237,43 +457,289 @@ class ChannelManager(models.Manager):
         if not requested_feed_urls:
             return
 
-        fetched_data = FeedChannelsFetcher.fetch(feed_urls=requested_feed_urls)
-        log.debug("fetched data of %s feeds", len(fetched_data.feeds))
-        log.debug("fetched data of %s entries in total", len(fetched_data.entries))
-        fetch_failed_urls = [i.url for i in fetched_data.feeds if i.fetch_failed]
+        # forced fetch is expected to download everything again, and so is
+        # priority fetch, as its reader database starts empty
+        caching_info = {}
+        if not force_fetch and not priority:
+            caching_info = self.__get_feeds_caching_info(queryset)
+
+        fetch_kwargs = {
+            "feed_urls": requested_feed_urls,
+            "caching_info": caching_info,
+            "shard": shard,
+            "force_fetch": force_fetch,
+        }
+        if priority:
+            fetch_kwargs["purpose"] = FeedFetcherPurpose.PRIORITY
+        if settings.KUSTOSZ_FEED_FETCHER_STREAMING:
+            feeds_data, any_entries = self.__ingest_fetched_data_stream(
+                feeds_queryset=queryset,
+                fetched_data_stream=FeedChannelsFetcher.fetch_iter(**fetch_kwargs),
+            )
+        else:
+            fetched_data = FeedChannelsFetcher.fetch(**fetch_kwargs)
+            feeds_data = fetched_data.feeds
+            any_entries = bool(fetched_data.entries)
+            log.debug("fetched data of %s entries in total", len(fetched_data.entries))
+        log.debug("fetched data of %s feeds", len(feeds_data))
+        fetch_failed_urls = [i.url for i in feeds_data if i.fetch_failed]
         if fetch_failed_urls:
             log.info("failed to fetch %s feeds", len(fetch_failed_urls))
             log.debug("failed to fetch feeds urls: %s", fetch_failed_urls)
 
         self.__update_feeds_with_fetched_data(
-            feeds_queryset=queryset, feeds_data=fetched_data.feeds
+            feeds_queryset=queryset, feeds_data=feeds_data
         )
-        if fetched_data.entries:
-            self.__update_entries_with_fetched_data(
-                feeds_queryset=queryset, entries_data=fetched_data.entries
+        self.model.fetch_logs.rel.related_model.objects.record_fetched_feeds(
+            channels=queryset, feeds_data=feeds_data
+        )
+        abandoned_urls = [i.url for i in feeds_data if i.abandoned]
+        if abandoned_urls:
+            # channels abandoned too many times were marked as failed
+            abandoned_channels = queryset.filter(
+                url__in=abandoned_urls, consecutive_abandonments__gt=0
+            )
+            log.info(
+                "%s feeds abandoned, requesting %s of them again",
+                len(abandoned_urls),
+                abandoned_channels.count(),
             )
+            log.debug("abandoned feeds urls: %s", abandoned_urls)
+            self._request_feed_channels_content_fetch(
+                abandoned_channels, force_fetch, shard, priority
+            )
+        if any_entries:
+            if not settings.KUSTOSZ_FEED_FETCHER_STREAMING:
+                self.__update_entries_with_fetched_data(
+                    feeds_queryset=queryset, entries_data=fetched_data.entries
+                )
             dispatch_task_by_name(TaskNamesEnum.DEDUPLICATE_ENTRIES)
+        if settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_ENABLED:
+            self.__update_adaptive_update_frequency(
+                feeds_queryset=queryset, feeds_data=feeds_data
+            )
+        if settings.KUSTOSZ_WEBSUB_ENABLED:
+            self.__request_websub_subscriptions(queryset)
         log.info("feeds update complete")
 
-    def __discard_channels_updated_recently(self, queryset: QuerySet):
-        now = django_now()
-        channels = []
-        for channel in queryset:
+    def _websub_subscribe(self, channel_ids: Iterable[int]):
+        callback_base_url = settings.KUSTOSZ_WEBSUB_CALLBACK_BASE_URL
+        if not callback_base_url:
+            log.warning(
+                "can't subscribe to WebSub hubs, "
+                "KUSTOSZ_WEBSUB_CALLBACK_BASE_URL is not set"
+            )
+            return
+
+        channels = (
+            self.get_queryset()
+            .filter(pk__in=channel_ids, active=True)
+            .exclude(websub_hub="")
+        )
+        for channel_model in channels:
+            callback_path = reverse("websub_callback", kwargs={"pk": channel_model.pk})
+            callback = f"{callback_base_url.rstrip('/')}{callback_path}"
+            # hub may verify subscription before it responds to request;
+            # secret is kept when subscription is renewed, so content pushed
+            # in the meantime is still accepted
+            if not channel_model.websub_secret:
+                channel_model.websub_secret = generate_websub_secret()
+            channel_model.websub_pending = True
+            channel_model.save(update_fields=["websub_secret", "websub_pending"])
             try:
-                time_since_last_update = (now - channel.last_check_time).total_seconds()
-            except TypeError:
-                time_since_last_update = time_always_update
+                request_websub_subscription(
+                    hub=channel_model.websub_hub,
+                    topic=channel_model.websub_topic,
+                    callback=callback,
+                    secret=channel_model.websub_secret,
+                )
+            except (PermanentFetcherError, TransientFetcherError) as e:
+                channel_model.websub_pending = False
+                channel_model.save(update_fields=["websub_pending"])
+                log.warning(
+                    "could not subscribe channel %s to WebSub hub %s: %s "
+                    "[channel url: %s]",
+                    channel_model.pk,
+                    channel_model.websub_hub,
+                    e,
+                    channel_model.url,
+                )
+                continue
+            log.debug(
+                "requested subscription of channel %s at WebSub hub %s",
+                channel_model.pk,
+                channel_model.websub_hub,
+            )
+
+    def __ingest_fetched_data_stream(
+        self,
+        feeds_queryset: QuerySet,
+        fetched_data_stream: Iterable[FeedFetcherResult],
+    ) -> tuple[list[FetchedFeed], bool]:
+        # entries are saved as soon as their feed is fetched, so only
+        # one feed worth of entries is kept in memory at a time
+        channels_by_url = {
+            channel_model.url: channel_model for channel_model in feeds_queryset
+        }
+        feeds_data = []
+        entries_ids = set()
+        entries_count = 0
+        for fetched_data in fetched_data_stream:
+            feeds_data.extend(fetched_data.feeds)
+            if not fetched_data.entries:
+                continue
+            entries_count += len(fetched_data.entries)
+            channels = [
+                channels_by_url[item.url]
+                for item in fetched_data.feeds
+                if item.url in channels_by_url
+            ]
+            entries_ids.update(
+                self.__create_or_update_entries(
+                    channels=channels, entries_data=fetched_data.entries
+                )
+            )
+        log.debug("fetched data of %s entries in total", entries_count)
+
+        self.__run_filters_on_entries(entries_ids)
+        return feeds_data, bool(entries_count)
+
+    def __request_websub_subscriptions(self, queryset: QuerySet):
+        # subscription is renewed when it would expire before next check,
+        # with time left for hub to verify it
+        renewal_margin = timedelta(seconds=WEBSUB_LEASE_RENEWAL_MARGIN)
+        channel_ids = list(
+            queryset.exclude(websub_hub="")
+            .filter(
+                Q(websub_lease_expires__isnull=True)
+                | Q(websub_lease_expires__lte=F("next_check_time") + renewal_margin)
+            )
+            .values_list("pk", flat=True)
+        )
+        if not channel_ids:
+            return
+        dispatch_task_by_name(
+            TaskNamesEnum.WEBSUB_SUBSCRIBE, kwargs={"channel_ids": channel_ids}
+        )
 
+    def __get_next_check_delay(
+        self,
+        channel_model: models.Model,
+        update_frequency: int,
+        update_hint: Optional[int] = None,
+    ) -> int:
+        # feed that told us it won't change is not checked earlier than that
+        next_check_delay = max(update_frequency, update_hint or 0)
+        if not channel_model.is_websub_subscribed:
+            return next_check_delay
+        # hub pushes updates, so polling is only a safety net; but
+        # subscription is renewed only when channel is checked, so it must
+        # be checked before lease expires
+        until_renewal = (
+            channel_model.websub_lease_expires
+            - timedelta(seconds=WEBSUB_LEASE_RENEWAL_MARGIN)
+            - channel_model.last_check_time
+        ).total_seconds()
+        if until_renewal <= 0:
+            return next_check_delay
+        next_check_delay = max(
+            next_check_delay, settings.KUSTOSZ_WEBSUB_UPDATE_FREQUENCY
+        )
+        return min(next_check_delay, int(until_renewal))
+
+    def __get_next_check_time(self, channel_model: models.Model) -> Optional[datetime]:
+        # mirrors scheduling done after fetch, from settings and state
+        # stored in channel; update hint of last fetch is not stored
+        if not channel_model.last_check_time:
+            return None
+        if channel_model.consecutive_failures:
+            next_check_delay = get_backoff_delay(
+                channel_model.update_frequency, channel_model.consecutive_failures
+            )
+        else:
+            update_frequency = channel_model.update_frequency
+            if (
+                settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_ENABLED
+                and channel_model.effective_update_frequency is not None
+            ):
+                update_frequency = channel_model.effective_update_frequency
+            next_check_delay = self.__get_next_check_delay(
+                channel_model, update_frequency
+            )
+        return channel_model.last_check_time + timedelta(seconds=next_check_delay)
+
+    def __filter_due_channels(self, queryset: QuerySet) -> QuerySet:
+        return queryset.filter(
+            Q(next_check_time__isnull=True) | Q(next_check_time__lte=django_now())
+        )
+
+    def __update_adaptive_update_frequency(
+        self, feeds_queryset: QuerySet, feeds_data: Iterable[FetchedFeed]
+    ):
+        # failed fetch tells nothing about how often channel publishes
+        update_hints = {
+            item.url: item.update_hint or 0
+            for item in feeds_data
+            if not item.fetch_failed
+        }
+        channels = list(feeds_queryset.filter(url__in=update_hints.keys()))
+        if not channels:
+            return
+
+        EntryManager = self.model.entries.rel.related_model.objects
+        recent_entries = (
+            EntryManager.get_annotated_queryset()
+            .filter(channel__in=channels)
+            .annotate(
+                recency=Window(
+                    RowNumber(),
+                    partition_by=["channel_id"],
+                    order_by=F("published_time").desc(),
+                )
+            )
+            .filter(recency__lte=ADAPTIVE_UPDATE_FREQUENCY_SAMPLE_SIZE)
+            .order_by("channel_id", "recency")
+            .values_list("channel_id", "published_time")
+        )
+        published_times = defaultdict(list)
+        for channel_id, published_time in recent_entries:
+            published_times[channel_id].append(published_time)
+
+        now = django_now()
+        for channel_model in channels:
+            effective_update_frequency = estimate_update_frequency(
+                published_times[channel_model.pk], now
+            )
             log.debug(
-                "channel %s seconds since last update: %s [channel url: %s]",
-                channel.pk,
-                time_since_last_update,
-                channel.url,
+                "channel %s effective update frequency: %s [channel url: %s]",
+                channel_model.pk,
+                effective_update_frequency,
+                channel_model.url,
             )
+            channel_model.effective_update_frequency = effective_update_frequency
+            next_check_delay = self.__get_next_check_delay(
+                channel_model,
+                effective_update_frequency,
+                update_hints[channel_model.url],
+            )
+            channel_model.next_check_time = channel_model.last_check_time + timedelta(
+                seconds=next_check_delay
+            )
+
+        feeds_queryset.bulk_update(
+            channels, ("effective_update_frequency", "next_check_time")
+        )
 
-            if time_since_last_update > channel.update_frequency:
-                channels.append(channel)
-        return channels
+    def __get_feeds_caching_info(self, queryset: QuerySet):
+        feeds_with_caching_info = queryset.exclude(
+            http_etag="", http_last_modified="", http_body_hash=""
+        ).values_list("url", "http_etag", "http_last_modified", "http_body_hash")
+        return {
+            url: FeedCachingInfo(
+                etag=etag, last_modified=last_modified, body_hash=body_hash
+            )
+            for url, etag, last_modified, body_hash in feeds_with_caching_info
+        }
 
     def __update_feeds_with_fetched_data(
         self, feeds_queryset: QuerySet, feeds_data: Iterable[FetchedFeed]
@@ -294,9 +760,62 @@ class ChannelManager(models.Manager):
                     channel_model.url,
                 )
                 continue
+            if received_data.abandoned:
+                channel_model.consecutive_abandonments += 1
+                if (
+                    channel_model.consecutive_abandonments
+                    < settings.KUSTOSZ_FEED_FETCHER_MAX_ABANDONMENTS
+                ):
+                    # channel is fetched again by separate task, as if this
+                    # attempt never happened
+                    updated_models.append(channel_model)
+                    continue
+                # channel that is abandoned every time fails, so it is not
+                # requested again and again
+                log.info(
+                    "channel %s abandoned %s times in a row, marking as failed "
+                    "[channel url: %s]",
+                    channel_model.pk,
+                    channel_model.consecutive_abandonments,
+                    channel_model.url,
+                )
+            channel_model.consecutive_abandonments = 0
             channel_model.last_check_time = right_now
+            next_check_delay = self.__get_next_check_delay(
+                channel_model, channel_model.update_frequency, received_data.update_hint
+            )
+            if received_data.fetch_failed:
+                # failing channels are checked less and less often, so they
+                # don't take workers away from channels that work
+                channel_model.consecutive_failures += 1
+                next_check_delay = get_backoff_delay(
+                    channel_model.update_frequency, channel_model.consecutive_failures
+                )
+                if channel_model.is_quarantined:
+                    log.info(
+                        "channel %s failed %s times in a row, quarantined "
+                        "[channel url: %s]",
+                        channel_model.pk,
+                        channel_model.consecutive_failures,
+                        channel_model.url,
+                    )
+            channel_model.next_check_time = right_now + timedelta(
+                seconds=next_check_delay
+            )
             if not received_data.fetch_failed:
+                channel_model.consecutive_failures = 0
                 channel_model.last_successful_check_time = right_now
+                if received_data.caching_info:
+                    channel_model.http_etag = received_data.caching_info.etag
+                    channel_model.http_last_modified = (
+                        received_data.caching_info.last_modified
+                    )
+                    channel_model.http_body_hash = received_data.caching_info.body_hash
+            if (
+                not received_data.fetch_failed
+                and not received_data.not_modified
+                and not received_data.content_unchanged
+            ):
                 if received_data.title != channel_model.title_upstream:
                     log.debug(
                         (
@@ -321,23 +840,70 @@ class ChannelManager(models.Manager):
                         received_data.link,
                     )
                     channel_model.link = received_data.link
+                websub_topic = ""
+                if received_data.websub_hub:
+                    websub_topic = received_data.websub_topic or channel_model.url
+                if (
+                    received_data.websub_hub != channel_model.websub_hub
+                    or websub_topic != channel_model.websub_topic
+                ):
+                    log.debug(
+                        (
+                            "channel %s WebSub hub changed "
+                            "[channel url: %s ; old value '%s' ; new value '%s']"
+                        ),
+                        channel_model.pk,
+                        channel_model.url,
+                        channel_model.websub_hub,
+                        received_data.websub_hub,
+                    )
+                    channel_model.websub_hub = received_data.websub_hub
+                    channel_model.websub_topic = websub_topic
+                    # subscription at previous hub is not renewed
+                    channel_model.websub_lease_expires = None
+                    channel_model.websub_pending = False
             updated_models.append(channel_model)
 
         log.debug("number of feeds updated: %s", len(updated_models))
         feeds_queryset.bulk_update(
             updated_models,
-            ("last_check_time", "last_successful_check_time", "title_upstream", "link"),
+            (
+                "last_check_time",
+                "last_successful_check_time",
+                "next_check_time",
+                "consecutive_failures",
+                "consecutive_abandonments",
+                "title_upstream",
+                "link",
+                "http_etag",
+                "http_last_modified",
+                "http_body_hash",
+                "websub_hub",
+                "websub_topic",
+                "websub_lease_expires",
+                "websub_pending",
+            ),
         )
 
     def __update_entries_with_fetched_data(
         self, feeds_queryset: QuerySet, entries_data: Iterable[FetchedFeedEntry]
     ):
+        entries_ids = self.__create_or_update_entries(
+            channels=feeds_queryset, entries_data=entries_data
+        )
+        self.__run_filters_on_entries(entries_ids)
+
+    def __create_or_update_entries(
+        self,
+        channels: Iterable[models.Model],
+        entries_data: Iterable[FetchedFeedEntry],
+    ) -> set[int]:
         grouped_by_feed = defaultdict(list)
         for item in entries_data:
             grouped_by_feed[item.feed_url].append(item)
 
-        entries_ids = set()
-        for channel_model in feeds_queryset:
+        channels_entries_data = {}
+        for channel_model in channels:
             channel_entries_data = grouped_by_feed.get(channel_model.url)
             if not channel_entries_data:
                 log.info(
@@ -346,13 +912,15 @@ class ChannelManager(models.Manager):
                     channel_model.url,
                 )
                 continue
-            new_or_updated_ids = channel_model.entries(
-                manager="objects"
-            )._create_or_update_with_fetched_data(
-                channel_model=channel_model, entries_data=channel_entries_data
-            )
-            entries_ids.update(new_or_updated_ids)
+            channels_entries_data[channel_model] = channel_entries_data
+        if not channels_entries_data:
+            return set()
+        entry_manager = self.model.entries.rel.related_model.objects
+        return entry_manager._create_or_update_channels_with_fetched_data(
+            channels_entries_data
+        )
 
+    def __run_filters_on_entries(self, entries_ids: Iterable[int]):
         if entries_ids:
             dispatch_task_by_name(
                 TaskNamesEnum.RUN_FILTERS_ON_ENTRIES,
@@ -360,6 +928,71 @@ class ChannelManager(models.Manager):
             )
 
 
+class ChannelFetchLogManager(models.Manager):
+    def get_channel_stats_queryset(self):
+        return (
+            self.get_queryset()
+            .values("channel", "channel__url")
+            .annotate(
+                fetch_count=Count("pk"),
+                failed_count=Count("pk", filter=Q(fetch_failed=True)),
+                not_modified_count=Count("pk", filter=Q(not_modified=True)),
+                content_unchanged_count=Count("pk", filter=Q(content_unchanged=True)),
+                avg_duration=Avg("duration"),
+                max_duration=Max("duration"),
+                avg_parse_duration=Avg("parse_duration"),
+                avg_response_size=Avg("response_size"),
+                max_response_size=Max("response_size"),
+                total_new_entries=Sum("new_entries"),
+                total_updated_entries=Sum("updated_entries"),
+            )
+        )
+
+    def record_fetched_feeds(
+        self, channels: Iterable[models.Model], feeds_data: Iterable[FetchedFeed]
+    ):
+        retention_days = settings.KUSTOSZ_FEED_FETCH_LOG_RETENTION_DAYS
+        if not retention_days:
+            return
+
+        def to_milliseconds(seconds):
+            if seconds is None:
+                return None
+            return round(seconds * 1000)
+
+        channels_by_url = {
+            channel_model.url: channel_model for channel_model in channels
+        }
+        right_now = django_now()
+        fetch_logs = []
+        for item in feeds_data:
+            channel_model = channels_by_url.get(item.url)
+            fetch_stats = item.fetch_stats
+            if not channel_model or not fetch_stats:
+                continue
+            fetch_log = self.model(
+                channel=channel_model,
+                fetch_time=right_now,
+                fetch_failed=item.fetch_failed,
+                not_modified=item.not_modified,
+                content_unchanged=item.content_unchanged,
+                failure_reason=item.failure_reason,
+                http_status=fetch_stats.http_status,
+                duration=to_milliseconds(fetch_stats.fetch_duration),
+                parse_duration=to_milliseconds(fetch_stats.parse_duration),
+                response_size=fetch_stats.response_size,
+                new_entries=fetch_stats.new_entries,
+                updated_entries=fetch_stats.updated_entries,
+            )
+            fetch_logs.append(fetch_log)
+        log.debug("recording %s fetch logs", len(fetch_logs))
+        self.bulk_create(fetch_logs)
+
+        # log is trimmed every time it grows, so it never gets large
+        threshold_time = right_now - timedelta(days=retention_days)
+        self.get_queryset().filter(fetch_time__lt=threshold_time).delete()
+
+
 class EntryManager(models.Manager):
     def get_annotated_queryset(self):
         return (
@@ -426,6 +1059,27 @@ class EntryManager(models.Manager):
         duplicates.update(archived=True, updated_time=django_now())
         return duplicate_ids
 
+    def prune_feed_fetcher_cache(self, days: int, shard: int = 0) -> int:
+        threshold_time = django_now() - timedelta(days=days)
+
+        def ingested_entries_filter(channel_url, gids):
+            # entries that did not make it to Kustosz database are kept
+            return (
+                self.get_queryset()
+                .filter(channel__url=channel_url, gid__in=gids)
+                .values_list("gid", flat=True)
+            )
+
+        removed_count = FeedChannelsFetcher.prune_cached_entries(
+            added_before=threshold_time,
+            entries_filter=ingested_entries_filter,
+            shard=shard,
+        )
+        log.info(
+            "Removed %s entries from feed fetcher cache shard %s", removed_count, shard
+        )
+        return removed_count
+
     def mark_as_archived(self, queryset):
         archived_count = queryset.update(archived=True, updated_time=django_now())
         return archived_count
@@ -466,46 +1120,73 @@ class EntryManager(models.Manager):
     def _create_or_update_with_fetched_data(
         self, channel_model, entries_data: Iterable[FetchedFeedEntry]
     ):
-        log.info(
-            "channel %s fetched entries: %s [channel url: %s]",
-            channel_model.pk,
-            len(entries_data),
-            channel_model.url,
+        return self._create_or_update_channels_with_fetched_data(
+            {channel_model: entries_data}
         )
-        queryset = self.get_queryset()
 
-        entries_data_map = {item.gid: item for item in entries_data}
-        existing_qs = queryset.filter(
-            channel=channel_model, gid__in=entries_data_map.keys()
-        )
-        log.debug("out of which already exist: %s", existing_qs.count())
-        if len(entries_data) != len(entries_data_map):
-            log.warning(
-                (
-                    "channel %s fetched entries with duplicated ids; "
-                    "channel source might be misbehaving and data might be missing"
-                    "[channel url: %s]"
-                ),
+    def _create_or_update_channels_with_fetched_data(
+        self, channels_entries_data: Mapping[models.Model, list[FetchedFeedEntry]]
+    ):
+        # entries of all channels are stored together, so number of queries
+        # does not depend on number of channels
+        channels = {}
+        entries_data_map = {}
+        for channel_model, entries_data in channels_entries_data.items():
+            log.info(
+                "channel %s fetched entries: %s [channel url: %s]",
                 channel_model.pk,
+                len(entries_data),
                 channel_model.url,
             )
+            channels[channel_model.pk] = channel_model
+            channel_entries_data_map = {
+                (channel_model.pk, item.gid): item for item in entries_data
+            }
+            if len(entries_data) != len(channel_entries_data_map):
+                log.warning(
+                    (
+                        "channel %s fetched entries with duplicated ids; "
+                        "channel source might be misbehaving and data might be missing"
+                        "[channel url: %s]"
+                    ),
+                    channel_model.pk,
+                    channel_model.url,
+                )
+            entries_data_map.update(channel_entries_data_map)
+
+        if not entries_data_map:
+            return set()
+
+        if settings.KUSTOSZ_FEED_ENTRIES_UPSERT and can_upsert():
+            new_entries_ids = self.__upsert_with_fetched_data(
+                channels=channels, entries_data_map=entries_data_map
+            )
+            self._request_readability_contents(new_entries_ids)
+            return set(new_entries_ids)
+
+        existing_qs = self.get_queryset().filter(
+            self.__get_fetched_entries_filter(entries_data_map.keys())
+        )
+        existing_entries = list(
+            existing_qs.prefetch_related(self.__get_content_set_prefetch())
+        )
+        log.debug("out of which already exist: %s", len(existing_entries))
 
         existing_entries_map = {}
-        for existing_entry in existing_qs:
-            entry_data = entries_data_map.pop(existing_entry.gid)
-            existing_entries_map[entry_data.gid] = entry_data
+        for existing_entry in existing_entries:
+            key = (existing_entry.channel_id, existing_entry.gid)
+            existing_entries_map[key] = entries_data_map.pop(key)
 
         new_or_updated_ids = set()
 
         if existing_entries_map:
             self.__update_existing_with_fetched_data(
-                channel_model=channel_model,
-                queryset=existing_qs,
+                existing_entries=existing_entries,
                 entries_data_map=existing_entries_map,
             )
         if entries_data_map:
             new_entries_ids = self.__create_new_from_fetched_data(
-                channel_model=channel_model, entries_data_map=entries_data_map
+                channels=channels, entries_data_map=entries_data_map
             )
             new_or_updated_ids.update(new_entries_ids)
             self._request_readability_contents(new_entries_ids)
@@ -591,47 +1272,221 @@ class EntryManager(models.Manager):
         filter_ = EntryFilter(filtering_data, queryset)
         return filter_.qs
 
-    def __update_existing_with_fetched_data(
-        self, channel_model, queryset, entries_data_map
-    ):
-        log.debug(
-            "channel %s number of entries considered for update: %s [channel url: %s]",
-            channel_model.pk,
-            len(entries_data_map),
-            channel_model.url,
-        )
+    def __get_content_set_prefetch(self) -> Prefetch:
+        # contents are compared by hash, so long texts are not loaded
+        EntryContent = self.model.content_set.rel.related_model
+        return Prefetch("content_set", queryset=EntryContent.objects.defer("content"))
+
+    def __get_fetched_entries_filter(self, keys: Iterable[tuple[int, str]]) -> Q:
+        gids_by_channel = defaultdict(list)
+        for channel_pk, gid in keys:
+            gids_by_channel[channel_pk].append(gid)
+        entries_filter = Q()
+        for channel_pk, gids in gids_by_channel.items():
+            entries_filter |= Q(channel_id=channel_pk, gid__in=gids)
+        return entries_filter
+
+    def __update_existing_with_fetched_data(self, existing_entries, entries_data_map):
+        log.debug("number of entries considered for update: %s", len(entries_data_map))
         # FIXME: support enclosures
         updated_entries = []
         updated_fields = set()
+        new_contents = []
+        updated_contents = []
 
         with transaction.atomic():
-            for entry_model in queryset.prefetch_related("content_set"):
-                fetched_data = entries_data_map.get(entry_model.gid)
+            for entry_model in existing_entries:
+                fetched_data = entries_data_map.get(
+                    (entry_model.channel_id, entry_model.gid)
+                )
                 (
                     updated_model,
                     model_updated_fields,
                 ) = self.__update_single_model_with_fetched_data(
-                    entry_model, fetched_data
+                    entry_model, fetched_data, new_contents, updated_contents
                 )
                 if model_updated_fields:
                     updated_entries.append(updated_model)
                     updated_fields.update(model_updated_fields)
 
-            log.debug(
-                "channel %s number of updated entries: %s [channel url: %s]",
-                channel_model.pk,
-                len(updated_entries),
-                channel_model.url,
-            )
+            self.__save_content_changes(new_contents, updated_contents)
+            log.debug("number of updated entries: %s", len(updated_entries))
             if not updated_entries:
                 return
 
-            queryset.bulk_update(updated_entries, updated_fields)
+            self.bulk_update(updated_entries, updated_fields)
 
-    def __create_new_from_fetched_data(self, channel_model, entries_data_map):
+    def __create_new_from_fetched_data(self, channels, entries_data_map):
         log.debug("out of which are new: %s", len(entries_data_map))
-        new_entries = []
-        for entry_data in entries_data_map.values():
+        new_entries = self.__build_new_from_fetched_data(channels, entries_data_map)
+        if not new_entries:
+            return []
+
+        with transaction.atomic():
+            entries = self.bulk_create(
+                [entry_dict["entry"] for entry_dict in new_entries],
+                batch_size=ENTRIES_BULK_CREATE_BATCH_SIZE,
+            )
+            if not connection.features.can_return_rows_from_bulk_insert:
+                entries_filter = self.__get_fetched_entries_filter(
+                    (entry.channel_id, entry.gid) for entry in entries
+                )
+                entries_ids_map = {
+                    (channel_pk, gid): pk
+                    for channel_pk, gid, pk in self.get_queryset()
+                    .filter(entries_filter)
+                    .values_list("channel_id", "gid", "pk")
+                }
+                for entry in entries:
+                    entry.pk = entries_ids_map[(entry.channel_id, entry.gid)]
+            self.__create_new_contents(new_entries)
+        return [entry.pk for entry in entries]
+
+    def __upsert_with_fetched_data(self, channels, entries_data_map):
+        entries = self.__build_entries_from_fetched_data(channels, entries_data_map)
+        if not entries:
+            return []
+
+        with transaction.atomic():
+            result = upsert_objects(
+                self.model,
+                entries,
+                unique_fields=("channel", "gid"),
+                compared_fields=(
+                    "link",
+                    "title",
+                    "author",
+                    "published_time_upstream",
+                    "updated_time_upstream",
+                ),
+                inserted_marker="added_time",
+                touched_fields=("updated_time",),
+                batch_size=ENTRIES_BULK_CREATE_BATCH_SIZE,
+            )
+            inserted_keys = {(entry.channel_id, entry.gid) for entry in result.inserted}
+            log.debug(
+                "entries inserted: %s; updated: %s",
+                len(result.inserted),
+                len(result.updated),
+            )
+            self.__create_new_contents(
+                [
+                    {
+                        "entry": entry,
+                        "contents": self.__build_contents_from_fetched_data(
+                            entries_data_map[(entry.channel_id, entry.gid)]
+                        ),
+                    }
+                    for entry in result.inserted
+                ]
+            )
+            self.__upsert_contents_with_fetched_data(
+                [
+                    entry
+                    for entry in entries
+                    if (entry.channel_id, entry.gid) not in inserted_keys
+                    and entries_data_map[(entry.channel_id, entry.gid)].content
+                ],
+                entries_data_map,
+                updated_entries_ids={entry.pk for entry in result.updated},
+            )
+        return [entry.pk for entry in result.inserted]
+
+    def __upsert_contents_with_fetched_data(
+        self, existing_entries, entries_data_map, updated_entries_ids
+    ):
+        if not existing_entries:
+            return
+        # upsert does not return entries that did not change
+        unknown_keys = [
+            (entry.channel_id, entry.gid) for entry in existing_entries if not entry.pk
+        ]
+        if unknown_keys:
+            entries_ids_map = {
+                (channel_pk, gid): pk
+                for channel_pk, gid, pk in self.get_queryset()
+                .filter(self.__get_fetched_entries_filter(unknown_keys))
+                .values_list("channel_id", "gid", "pk")
+            }
+            for entry in existing_entries:
+                if not entry.pk:
+                    entry.pk = entries_ids_map[(entry.channel_id, entry.gid)]
+
+        # contents are compared by hash in database; reading time is
+        # estimated only for contents that were added or changed
+        contents = []
+        for entry in existing_entries:
+            for content in self.__build_contents_from_fetched_data(
+                entries_data_map[(entry.channel_id, entry.gid)],
+                with_reading_time=False,
+            ):
+                content.entry = entry
+                contents.append(content)
+        EntryContent = self.model.content_set.rel.related_model
+        result = update_or_insert_objects(
+            EntryContent,
+            contents,
+            key_fields=("entry", "source", "mimetype", "language"),
+            compared_fields=("content_hash",),
+            touched_fields=("content", "updated_time"),
+            batch_size=ENTRIES_BULK_CREATE_BATCH_SIZE,
+        )
+        changed_contents = result.inserted + result.updated
+        log.debug(
+            "entries contents added: %s; changed: %s",
+            len(result.inserted),
+            len(result.updated),
+        )
+        if not changed_contents:
+            return
+        for content in changed_contents:
+            content.estimated_reading_time = estimate_reading_time(content.content)
+        EntryContent.objects.bulk_update(
+            changed_contents,
+            ["estimated_reading_time"],
+            batch_size=ENTRIES_BULK_CREATE_BATCH_SIZE,
+        )
+        # entries updated only because of content are touched here
+        self.get_queryset().filter(
+            pk__in={content.entry_id for content in changed_contents}
+            - updated_entries_ids
+        ).update(updated_time=django_now())
+
+    def __create_new_contents(self, new_entries):
+        new_contents = []
+        for entry_dict in new_entries:
+            entry, contents = entry_dict.values()
+            log.debug(
+                "entry %s has %s content objects [entry gid: %s]",
+                entry.pk,
+                len(contents),
+                entry.gid,
+            )
+            for content in contents:
+                content.entry = entry
+                new_contents.append(content)
+        if new_contents:
+            self.model.content_set.rel.related_model.objects.bulk_create(
+                new_contents, batch_size=ENTRIES_BULK_CREATE_BATCH_SIZE
+            )
+
+    def __build_new_from_fetched_data(self, channels, entries_data_map):
+        return [
+            {
+                "entry": entry,
+                "contents": self.__build_contents_from_fetched_data(
+                    entries_data_map[(entry.channel_id, entry.gid)]
+                ),
+            }
+            for entry in self.__build_entries_from_fetched_data(
+                channels, entries_data_map
+            )
+        ]
+
+    def __build_entries_from_fetched_data(self, channels, entries_data_map):
+        entries = []
+        for (channel_pk, _), entry_data in entries_data_map.items():
+            channel_model = channels[channel_pk]
             entry = self.model(
                 channel=channel_model,
                 gid=entry_data.gid,
@@ -644,7 +1499,13 @@ class EntryManager(models.Manager):
             )
 
             try:
-                entry.full_clean()
+                # channel exists and gids were just checked against database,
+                # so checks that need a query per entry are skipped
+                entry.full_clean(
+                    exclude=["channel"],
+                    validate_unique=False,
+                    validate_constraints=False,
+                )
             except ValidationError as e:
                 log.warning(
                     (
@@ -657,39 +1518,31 @@ class EntryManager(models.Manager):
                     channel_model.url,
                 )
                 continue
-            EntryContent = entry.content_set.model
-            entry_contents = []
-            for fetched_content in entry_data.content:
-                reading_time = estimate_reading_time(fetched_content.content)
-                content_obj = EntryContent(
-                    updated_time=django_now(),
-                    estimated_reading_time=reading_time,
-                    **{
-                        key: getattr(fetched_content, key)
-                        for key in ("source", "content", "language", "mimetype")
-                    },
-                )
-                entry_contents.append(content_obj)
-            new_entries.append({"entry": entry, "contents": entry_contents})
+            entries.append(entry)
+        return entries
 
-        entries_ids = []
-        with transaction.atomic():
-            for entry_dict in new_entries:
-                entry, contents = entry_dict.values()
-                entry.save()
-                log.debug(
-                    "entry %s has %s content objects [entry gid: %s]",
-                    entry.pk,
-                    len(contents),
-                    entry.gid,
-                )
-                for content in contents:
-                    content.entry = entry
-                    content.save()
-                entries_ids.append(entry.pk)
-        return entries_ids
+    def __build_contents_from_fetched_data(self, entry_data, with_reading_time=True):
+        EntryContent = self.model.content_set.rel.related_model
+        return [
+            EntryContent(
+                updated_time=django_now(),
+                estimated_reading_time=(
+                    estimate_reading_time(fetched_content.content)
+                    if with_reading_time
+                    else 0
+                ),
+                content_hash=get_content_hash(fetched_content.content),
+                **{
+                    key: getattr(fetched_content, key)
+                    for key in ("source", "content", "language", "mimetype")
+                },
+            )
+            for fetched_content in entry_data.content
+        ]
 
-    def __update_single_model_with_fetched_data(self, entry_model, fetched_data):
+    def __update_single_model_with_fetched_data(
+        self, entry_model, fetched_data, new_contents, updated_contents
+    ):
         keys_to_check = ("link", "title", "author", "published_time", "updated_time")
         model_updated_fields = set()
 
@@ -713,7 +1566,7 @@ class EntryManager(models.Manager):
                 model_updated_fields.add(model_key)
 
         content_set_changed = self.__update_single_model_content_set_with_fetched_data(
-            entry_model, fetched_data
+            entry_model, fetched_data, new_contents, updated_contents
         )
 
         if model_updated_fields or content_set_changed:
@@ -723,8 +1576,10 @@ class EntryManager(models.Manager):
         return entry_model, model_updated_fields
 
     def __update_single_model_content_set_with_fetched_data(
-        self, entry_model, fetched_data
+        self, entry_model, fetched_data, new_contents, updated_contents
     ):
+        # changed contents are only collected; they are saved for all
+        # entries at once by __save_content_changes
         if not fetched_data.content:
             return False
         contents_data_map = {
@@ -738,27 +1593,51 @@ class EntryManager(models.Manager):
                 fetched_entry_content.mimetype,
                 fetched_entry_content.language,
             )
+            content_hash = get_content_hash(fetched_entry_content.content)
             if key not in contents_data_map:
                 reading_time = estimate_reading_time(fetched_entry_content.content)
-                entry_model.content_set.create(
-                    updated_time=django_now(),
-                    estimated_reading_time=reading_time,
-                    **{
-                        key: getattr(fetched_entry_content, key)
-                        for key in ("source", "content", "language", "mimetype")
-                    },
+                new_contents.append(
+                    entry_model.content_set.model(
+                        entry=entry_model,
+                        updated_time=django_now(),
+                        estimated_reading_time=reading_time,
+                        content_hash=content_hash,
+                        **{
+                            key: getattr(fetched_entry_content, key)
+                            for key in ("source", "content", "language", "mimetype")
+                        },
+                    )
                 )
                 entry_contents_changed = True
                 continue
             existing_entry_content = contents_data_map.get(key)
-            if existing_entry_content.content == fetched_entry_content.content:
+            if existing_entry_content.content_hash == content_hash:
                 continue
             existing_entry_content.content = fetched_entry_content.content
+            existing_entry_content.content_hash = content_hash
             existing_entry_content.estimated_reading_time = estimate_reading_time(
                 fetched_entry_content.content
             )
             existing_entry_content.updated_time = django_now()
-            existing_entry_content.save()
+            updated_contents.append(existing_entry_content)
             entry_contents_changed = True
         # FIXME: should we remove contents that disappeared from feed?
         return entry_contents_changed
+
+    def __save_content_changes(self, new_contents, updated_contents):
+        log.debug(
+            "entries contents added: %s; changed: %s",
+            len(new_contents),
+            len(updated_contents),
+        )
+        EntryContent = self.model.content_set.rel.related_model
+        if new_contents:
+            EntryContent.objects.bulk_create(
+                new_contents, batch_size=ENTRIES_BULK_CREATE_BATCH_SIZE
+            )
+        if updated_contents:
+            EntryContent.objects.bulk_update(
+                updated_contents,
+                ["content", "content_hash", "estimated_reading_time", "updated_time"],
+                batch_size=ENTRIES_BULK_CREATE_BATCH_SIZE,
+            )
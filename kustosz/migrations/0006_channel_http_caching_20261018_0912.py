@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0005_create_celery_beat_clean_cache_20241123_1308"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="http_etag",
+            field=models.TextField(
+                blank=True, help_text="ETag header sent by channel in last response"
+            ),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="http_last_modified",
+            field=models.TextField(
+                blank=True,
+                help_text="Last-Modified header sent by channel in last response",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:04
+from datetime import timedelta
+
+from django.db import migrations
+from django.db import models
+
+
+def set_next_check_time(apps, schema_editor):
+    Channel = apps.get_model("kustosz", "Channel")
+    channels = Channel.objects.filter(last_check_time__isnull=False).only(
+        "last_check_time", "update_frequency"
+    )
+    for channel in channels.iterator():
+        channel.next_check_time = channel.last_check_time + timedelta(
+            seconds=channel.update_frequency
+        )
+        channel.save(update_fields=["next_check_time"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0006_channel_http_caching_20261018_0912"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="next_check_time",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="When channel should be checked next; empty means right away",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(set_next_check_time, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:31
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0007_channel_next_check_time_20261018_1104"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="effective_update_frequency",
+            field=models.IntegerField(
+                blank=True,
+                help_text=(
+                    "How often channel is checked when adaptive update frequency "
+                    "is enabled, in seconds"
+                ),
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from kustosz.enums import TaskNamesEnum
+
+
+def create_celery_beat(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    schedule, created = CrontabSchedule.objects.get_or_create(
+        minute=30,
+        hour=5,
+    )
+
+    PeriodicTask.objects.create(
+        crontab=schedule,
+        name="Prune feed fetcher cache",
+        task=TaskNamesEnum.PRUNE_FEED_FETCHER_CACHE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+        ("kustosz", "0008_channel_effective_update_frequency_20261018_1231"),
+    ]
+
+    operations = [migrations.RunPython(create_celery_beat)]
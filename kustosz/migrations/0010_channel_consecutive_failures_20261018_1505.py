@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:05
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0009_create_celery_beat_prune_cache_20261018_1420"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="consecutive_failures",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of failed checks since last successful one",
+            ),
+        ),
+    ]
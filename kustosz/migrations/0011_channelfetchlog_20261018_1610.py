@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:10
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0010_channel_consecutive_failures_20261018_1505"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChannelFetchLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "fetch_time",
+                    models.DateTimeField(
+                        db_index=True, help_text="When channel was fetched"
+                    ),
+                ),
+                (
+                    "fetch_failed",
+                    models.BooleanField(
+                        default=False, help_text="Did fetch result in error?"
+                    ),
+                ),
+                (
+                    "not_modified",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Did server respond with 304 Not Modified?",
+                    ),
+                ),
+                (
+                    "http_status",
+                    models.PositiveSmallIntegerField(
+                        blank=True, help_text="HTTP status code of response", null=True
+                    ),
+                ),
+                (
+                    "duration",
+                    models.PositiveIntegerField(
+                        help_text="Time spent downloading channel, in milliseconds"
+                    ),
+                ),
+                (
+                    "parse_duration",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Time spent parsing channel, in milliseconds",
+                        null=True,
+                    ),
+                ),
+                (
+                    "response_size",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Size of response body, in bytes",
+                        null=True,
+                    ),
+                ),
+                (
+                    "new_entries",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of new entries in channel"
+                    ),
+                ),
+                (
+                    "updated_entries",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of changed entries in channel"
+                    ),
+                ),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fetch_logs",
+                        to="kustosz.channel",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:20
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0011_channelfetchlog_20261018_1610"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="websub_hub",
+            field=models.TextField(
+                blank=True, help_text="URL of WebSub hub advertised by channel"
+            ),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="websub_lease_expires",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When WebSub hub stops pushing updates of channel",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="websub_secret",
+            field=models.TextField(
+                blank=True, help_text="Secret used by WebSub hub to sign pushed content"
+            ),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="websub_topic",
+            field=models.TextField(
+                blank=True, help_text="URL channel is subscribed under at WebSub hub"
+            ),
+        ),
+    ]
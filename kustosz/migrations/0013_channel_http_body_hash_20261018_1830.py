@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:30
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kustosz", "0012_channel_websub_20261018_1720"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="http_body_hash",
+            field=models.TextField(
+                blank=True, help_text="Hash of body sent by channel in last response"
+            ),
+        ),
+        migrations.AddField(
+            model_name="channelfetchlog",
+            name="content_unchanged",
+            field=models.BooleanField(
+                default=False, help_text="Did server send the same body as previously?"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:35
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kustosz", "0013_channel_http_body_hash_20261018_1830"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channelfetchlog",
+            name="failure_reason",
+            field=models.TextField(blank=True, help_text="Why did fetch fail?"),
+        ),
+    ]
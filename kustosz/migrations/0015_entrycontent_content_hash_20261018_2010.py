@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:10
+import hashlib
+
+from django.db import migrations
+from django.db import models
+
+
+BATCH_SIZE = 500
+
+
+def set_content_hash(apps, schema_editor):
+    EntryContent = apps.get_model("kustosz", "EntryContent")
+    contents = EntryContent.objects.only("content")
+    batch = []
+    for entry_content in contents.iterator(chunk_size=BATCH_SIZE):
+        entry_content.content_hash = hashlib.sha256(
+            entry_content.content.encode("utf-8")
+        ).hexdigest()
+        batch.append(entry_content)
+        if len(batch) >= BATCH_SIZE:
+            EntryContent.objects.bulk_update(
+                batch, ["content_hash"], batch_size=BATCH_SIZE
+            )
+            batch = []
+    EntryContent.objects.bulk_update(batch, ["content_hash"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0014_channelfetchlog_failure_reason_20261018_1935"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="entrycontent",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="SHA-256 hash of content, to tell if content changed",
+                max_length=64,
+            ),
+        ),
+        migrations.RunPython(set_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:10
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0015_entrycontent_content_hash_20261018_2010"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="websub_pending",
+            field=models.BooleanField(
+                default=False,
+                help_text="Is subscription at WebSub hub waiting to be verified?",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:30
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kustosz", "0016_channel_websub_pending_20261018_2110"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="consecutive_abandonments",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of checks abandoned since last completed one",
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import MultipleObjectsReturned
 from django.core.exceptions import ObjectDoesNotExist
@@ -18,10 +19,13 @@ from .enums import EntryFilterActionsEnum
 from .enums import EntryMarkAsReadStrategiesEnum
 from .enums import TaskNamesEnum
 from .exceptions import InvalidDataException
+from .fetchers.feed import get_feed_fetcher_shard
 from .forms.fields import ChannelURLFormField
+from .managers import ChannelFetchLogManager
 from .managers import ChannelManager
 from .managers import EntryManager
 from .utils import dispatch_task_by_name
+from .utils import get_content_hash
 from .validators import ChannelURLValidator
 
 
@@ -91,6 +95,18 @@ class Channel(models.Model):
         null=True,
         help_text="When last check of channel did not result in error",
     )
+    consecutive_failures = models.PositiveIntegerField(
+        default=0, help_text="Number of failed checks since last successful one"
+    )
+    consecutive_abandonments = models.PositiveIntegerField(
+        default=0, help_text="Number of checks abandoned since last completed one"
+    )
+    next_check_time = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text="When channel should be checked next; empty means right away",
+    )
     added_time = models.DateTimeField(
         auto_now_add=True, help_text="When channel was added to database"
     )
@@ -101,10 +117,44 @@ class Channel(models.Model):
         default=DEFAULT_UPDATE_FREQUENCY,
         help_text="How often channel should be checked, in seconds",
     )
+    effective_update_frequency = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text=(
+            "How often channel is checked when adaptive update frequency "
+            "is enabled, in seconds"
+        ),
+    )
     deduplication_enabled = models.BooleanField(
         default=True,
         help_text="Is new content from this channel subject to deduplication?",
     )
+    http_etag = models.TextField(
+        blank=True, help_text="ETag header sent by channel in last response"
+    )
+    http_last_modified = models.TextField(
+        blank=True, help_text="Last-Modified header sent by channel in last response"
+    )
+    http_body_hash = models.TextField(
+        blank=True, help_text="Hash of body sent by channel in last response"
+    )
+    websub_hub = models.TextField(
+        blank=True, help_text="URL of WebSub hub advertised by channel"
+    )
+    websub_topic = models.TextField(
+        blank=True, help_text="URL channel is subscribed under at WebSub hub"
+    )
+    websub_secret = models.TextField(
+        blank=True, help_text="Secret used by WebSub hub to sign pushed content"
+    )
+    websub_lease_expires = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When WebSub hub stops pushing updates of channel",
+    )
+    websub_pending = models.BooleanField(
+        default=False, help_text="Is subscription at WebSub hub waiting to be verified?"
+    )
 
     @property
     def displayed_title(self):
@@ -131,14 +181,68 @@ class Channel(models.Model):
 
         return staleness_line > last_successful_check
 
+    @property
+    def is_quarantined(self):
+        return (
+            self.consecutive_failures
+            >= settings.KUSTOSZ_FAILING_CHANNEL_QUARANTINE_THRESHOLD
+        )
+
+    @property
+    def is_websub_subscribed(self):
+        if not self.websub_lease_expires:
+            return False
+        return self.websub_lease_expires > django_now()
+
     def delete(self, *args, **kwargs):
+        shard = get_feed_fetcher_shard(self.pk)
         super().delete(*args, **kwargs)
         if self.channel_type == ChannelTypesEnum.FEED:
             dispatch_task_by_name(
                 TaskNamesEnum.CLEAN_FEED_FETCHER_CACHE,
+                kwargs={"shard": shard, "feed_urls": [self.url]},
             )
 
 
+class ChannelFetchLog(models.Model):
+    objects = ChannelFetchLogManager()
+
+    channel = models.ForeignKey(
+        Channel, on_delete=models.CASCADE, related_name="fetch_logs"
+    )
+    fetch_time = models.DateTimeField(
+        db_index=True, help_text="When channel was fetched"
+    )
+    fetch_failed = models.BooleanField(
+        default=False, help_text="Did fetch result in error?"
+    )
+    not_modified = models.BooleanField(
+        default=False, help_text="Did server respond with 304 Not Modified?"
+    )
+    content_unchanged = models.BooleanField(
+        default=False, help_text="Did server send the same body as previously?"
+    )
+    failure_reason = models.TextField(blank=True, help_text="Why did fetch fail?")
+    http_status = models.PositiveSmallIntegerField(
+        blank=True, null=True, help_text="HTTP status code of response"
+    )
+    duration = models.PositiveIntegerField(
+        help_text="Time spent downloading channel, in milliseconds"
+    )
+    parse_duration = models.PositiveIntegerField(
+        blank=True, null=True, help_text="Time spent parsing channel, in milliseconds"
+    )
+    response_size = models.PositiveIntegerField(
+        blank=True, null=True, help_text="Size of response body, in bytes"
+    )
+    new_entries = models.PositiveIntegerField(
+        default=0, help_text="Number of new entries in channel"
+    )
+    updated_entries = models.PositiveIntegerField(
+        default=0, help_text="Number of changed entries in channel"
+    )
+
+
 class Entry(models.Model):
     objects = EntryManager()
 
@@ -235,6 +339,12 @@ class EntryContent(models.Model):
         help_text="Source of this content",
     )
     content = models.TextField(help_text="Content itself")
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="SHA-256 hash of content, to tell if content changed",
+    )
     mimetype = models.TextField(blank=True, help_text="Type of content")
     language = models.TextField(blank=True, help_text="Language of content")
     estimated_reading_time = models.FloatField(
@@ -242,6 +352,15 @@ class EntryContent(models.Model):
     )
     updated_time = models.DateTimeField(help_text="When content was last updated")
 
+    def save(self, *args, **kwargs):
+        # content that was not loaded could not have been changed
+        if "content" not in self.get_deferred_fields():
+            self.content_hash = get_content_hash(self.content)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "content" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "content_hash"}
+        super().save(*args, **kwargs)
+
 
 class EntryFilter(models.Model):
     enabled = models.BooleanField(
@@ -212,11 +212,17 @@ class ChannelSerializer(TaggitSerializer, serializers.ModelSerializer):
             "link",
             "last_check_time",
             "last_successful_check_time",
+            "next_check_time",
             "added_time",
             "active",
             "update_frequency",
+            "effective_update_frequency",
             "deduplication_enabled",
             "is_stale",
+            "consecutive_failures",
+            "is_quarantined",
+            "websub_hub",
+            "is_websub_subscribed",
             "unarchived_entries",
             "tagged_entries",
             "total_entries",
@@ -231,11 +237,33 @@ class ChannelSerializer(TaggitSerializer, serializers.ModelSerializer):
             "link": {"read_only": True},
             "last_check_time": {"read_only": True},
             "last_successful_check_time": {"read_only": True},
+            "next_check_time": {"read_only": True},
             "added_time": {"read_only": True},
+            "effective_update_frequency": {"read_only": True},
             "is_stale": {"read_only": True},
+            "consecutive_failures": {"read_only": True},
+            "is_quarantined": {"read_only": True},
+            "websub_hub": {"read_only": True},
+            "is_websub_subscribed": {"read_only": True},
         }
 
 
+class ChannelFetchStatsSerializer(serializers.Serializer):
+    channel = serializers.IntegerField(read_only=True)
+    channel_url = serializers.CharField(source="channel__url", read_only=True)
+    fetch_count = serializers.IntegerField(read_only=True)
+    failed_count = serializers.IntegerField(read_only=True)
+    not_modified_count = serializers.IntegerField(read_only=True)
+    content_unchanged_count = serializers.IntegerField(read_only=True)
+    avg_duration = serializers.FloatField(read_only=True)
+    max_duration = serializers.IntegerField(read_only=True)
+    avg_parse_duration = serializers.FloatField(read_only=True)
+    avg_response_size = serializers.FloatField(read_only=True)
+    max_response_size = serializers.IntegerField(read_only=True)
+    total_new_entries = serializers.IntegerField(read_only=True)
+    total_updated_entries = serializers.IntegerField(read_only=True)
+
+
 class ChannelsInactivateSerializer(serializers.Serializer):
     inactivated_channels = serializers.ListField(
         child=serializers.IntegerField(), required=True
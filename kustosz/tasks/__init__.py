@@ -12,7 +12,12 @@ from .task_clean_url_fetcher_cache import clean_url_fetcher_cache
 from .task_deduplicate_entries import deduplicate_entries
 from .task_fetch_channel_content import fetch_channel_content
 from .task_fetch_feed_channel_content import fetch_feed_channel_content
+from .task_fetch_feed_channel_content_priority import (
+    fetch_feed_channel_content_priority,
+)
 from .task_fetch_manual_entry_data import fetch_manual_entry_data
 from .task_fetch_manual_entry_metadata import fetch_manual_entry_metadata
 from .task_filter_action_run_script import filter_action_run_script
+from .task_prune_feed_fetcher_cache import prune_feed_fetcher_cache
 from .task_run_filters_on_entries import run_filters_on_entries
+from .task_websub_subscribe import websub_subscribe
@@ -1,11 +1,16 @@
+from typing import Iterable
+from typing import Optional
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
-from kustosz.enums import SerialQueuesNamesEnum
 from kustosz.enums import TaskNamesEnum
 from kustosz.exceptions import SerialTaskAlreadyInProgress
 from kustosz.fetchers.feed import FeedChannelsFetcher
+from kustosz.fetchers.feed import get_feed_fetcher_lock_id
+from kustosz.fetchers.feed import get_feed_fetcher_shards
 from kustosz.utils import cache_lock
+from kustosz.utils import dispatch_task_by_name
 
 
 logger = get_task_logger(__name__)
@@ -18,10 +23,22 @@ logger = get_task_logger(__name__)
     retry_backoff=5,
     retry_jitter=True,
 )
-def clean_feed_fetcher_cache() -> None:
-    lock_id = SerialQueuesNamesEnum.FEED_FETCHER
+def clean_feed_fetcher_cache(
+    shard: Optional[int] = None, feed_urls: Optional[Iterable[str]] = None
+) -> None:
+    if shard is None:
+        # each shard is cleaned by separate task, so retry of shard that is
+        # busy does not clean other shards again
+        for shard in get_feed_fetcher_shards():
+            dispatch_task_by_name(
+                TaskNamesEnum.CLEAN_FEED_FETCHER_CACHE,
+                kwargs={"shard": shard, "feed_urls": feed_urls},
+            )
+        return
+
+    lock_id = get_feed_fetcher_lock_id(shard)
     with cache_lock(lock_id, TaskNamesEnum.CLEAN_FEED_FETCHER_CACHE) as acquired_lock:
         if not acquired_lock:
             raise SerialTaskAlreadyInProgress()
 
-        FeedChannelsFetcher.clean_cached_files()
+        FeedChannelsFetcher.clean_cached_files(shard, feed_urls)
@@ -1,10 +1,11 @@
 from typing import Iterable
+from typing import Optional
 
 from celery import shared_task
 
-from kustosz.enums import SerialQueuesNamesEnum
 from kustosz.enums import TaskNamesEnum
 from kustosz.exceptions import SerialTaskAlreadyInProgress
+from kustosz.fetchers.feed import get_feed_fetcher_lock_id
 from kustosz.models import Channel
 from kustosz.utils import cache_lock
 
@@ -16,13 +17,15 @@ from kustosz.utils import cache_lock
     retry_backoff=5,
     retry_jitter=True,
 )
-def fetch_feed_channel_content(channel_ids: Iterable[int], force_fetch: bool):
-    lock_id = SerialQueuesNamesEnum.FEED_FETCHER
+def fetch_feed_channel_content(
+    channel_ids: Iterable[int], force_fetch: bool, shard: Optional[int] = 0
+):
+    lock_id = get_feed_fetcher_lock_id(shard)
     with cache_lock(lock_id, channel_ids) as acquired_lock:
         if not acquired_lock:
             raise SerialTaskAlreadyInProgress()
 
-        Channel.objects._fetch_feed_channels_content(channel_ids, force_fetch)
+        Channel.objects._fetch_feed_channels_content(channel_ids, force_fetch, shard)
         # return ids of entries that were fetched?
         #        ids of next tasks we have scheduled?
         return channel_ids
@@ -0,0 +1,19 @@
+from typing import Iterable
+
+from celery import shared_task
+
+from kustosz.enums import TaskNamesEnum
+from kustosz.models import Channel
+
+
+@shared_task(name=TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT_PRIORITY)
+def fetch_feed_channel_content_priority(
+    channel_ids: Iterable[int], force_fetch: bool = False
+):
+    # fetch requested by user is not routed to serial feed fetcher queue
+    # and does not take shard lock; it uses its own throwaway reader
+    # database, so it can start right away
+    Channel.objects._fetch_feed_channels_content(
+        channel_ids, force_fetch, priority=True
+    )
+    return channel_ids
@@ -0,0 +1,47 @@
+from typing import Optional
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+
+from kustosz.enums import TaskNamesEnum
+from kustosz.exceptions import SerialTaskAlreadyInProgress
+from kustosz.fetchers.feed import get_feed_fetcher_lock_id
+from kustosz.fetchers.feed import get_feed_fetcher_shards
+from kustosz.models import Entry
+from kustosz.utils import cache_lock
+from kustosz.utils import dispatch_task_by_name
+
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(
+    name=TaskNamesEnum.PRUNE_FEED_FETCHER_CACHE,
+    autoretry_for=(SerialTaskAlreadyInProgress,),
+    retry_kwargs={"max_retries": 5},
+    retry_backoff=5,
+    retry_jitter=True,
+)
+def prune_feed_fetcher_cache(
+    shard: Optional[int] = None,
+    days: Optional[int] = None,
+) -> Optional[int]:
+    if days is None:
+        days = settings.KUSTOSZ_FEED_FETCHER_RETENTION_DAYS
+    if shard is None:
+        # each shard is pruned by separate task, so retry of shard that is
+        # busy does not prune other shards again
+        for shard in get_feed_fetcher_shards():
+            dispatch_task_by_name(
+                TaskNamesEnum.PRUNE_FEED_FETCHER_CACHE,
+                kwargs={"shard": shard, "days": days},
+            )
+        return None
+
+    lock_id = get_feed_fetcher_lock_id(shard)
+    with cache_lock(lock_id, TaskNamesEnum.PRUNE_FEED_FETCHER_CACHE) as acquired_lock:
+        if not acquired_lock:
+            raise SerialTaskAlreadyInProgress()
+
+        return Entry.objects.prune_feed_fetcher_cache(days=days, shard=shard)
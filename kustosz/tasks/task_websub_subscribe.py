@@ -0,0 +1,11 @@
+from typing import Iterable
+
+from celery import shared_task
+
+from kustosz.enums import TaskNamesEnum
+from kustosz.models import Channel
+
+
+@shared_task(name=TaskNamesEnum.WEBSUB_SUBSCRIBE)
+def websub_subscribe(channel_ids: Iterable[int]):
+    Channel.objects._websub_subscribe(channel_ids)
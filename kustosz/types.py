@@ -116,6 +116,30 @@ class AddChannelResult:
     tasks: tuple[AsyncTaskResult, ...]
 
 
+@dataclass(frozen=True)
+class FeedCachingInfo:
+    #: this maps to model.http_etag
+    etag: Optional[str] = ""
+    #: this maps to model.http_last_modified
+    last_modified: Optional[str] = ""
+    #: this maps to model.http_body_hash
+    body_hash: Optional[str] = ""
+
+
+@dataclass(frozen=True)
+class FeedFetchStats:
+    #: time spent downloading feed, in seconds
+    fetch_duration: float
+    #: time spent parsing feed, in seconds; None if nothing was parsed
+    parse_duration: Optional[float] = None
+    #: size of response body, in bytes
+    response_size: Optional[int] = None
+    http_status: Optional[int] = None
+    #: numbers of entries reader considered new and changed
+    new_entries: int = 0
+    updated_entries: int = 0
+
+
 @dataclass(frozen=True)
 class FetchedFeed:
     url: str
@@ -123,6 +147,25 @@ class FetchedFeed:
     #: this maps to model.title_upstream
     title: Optional[str] = ""
     link: Optional[str] = ""
+    #: server responded with 304 Not Modified
+    not_modified: Optional[bool] = False
+    #: server sent the same body as in previous fetch, so it was not parsed
+    content_unchanged: Optional[bool] = False
+    #: feed was not downloaded before chunk deadline; it should be fetched
+    #: again separately, and this fetch should not count as failure
+    abandoned: Optional[bool] = False
+    #: why fetch failed, if it did
+    failure_reason: Optional[str] = ""
+    #: HTTP validators received in response; None if nothing new was received
+    caching_info: Optional[FeedCachingInfo] = None
+    #: number of seconds feed or server claims feed won't change for
+    update_hint: Optional[int] = None
+    #: performance data of fetch; None if feed was not downloaded
+    fetch_stats: Optional[FeedFetchStats] = None
+    #: WebSub hub that pushes updates of feed
+    websub_hub: Optional[str] = ""
+    #: URL feed should be subscribed under at WebSub hub
+    websub_topic: Optional[str] = ""
 
 
 @dataclass(frozen=True)
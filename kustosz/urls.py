@@ -24,6 +24,11 @@ main_api_paths = [
         "channels/activate", views.ChannelsActivate.as_view(), name="channels_activate"
     ),
     path("channels/delete", views.ChannelsDelete.as_view(), name="channels_delete"),
+    path(
+        "channels/fetch_stats",
+        views.ChannelFetchStatsList.as_view(),
+        name="channels_fetch_stats",
+    ),
     path("entries/", views.EntriesList.as_view(), name="entries_list"),
     path("entries/<int:pk>/", views.EntryDetail.as_view(), name="entry_detail"),
     path("entries/archive", views.EntriesArchive.as_view(), name="entries_archive"),
@@ -39,6 +44,7 @@ main_api_paths = [
     path("filters/run", views.EntryFiltersRun.as_view(), name="entry_filters_run"),
     path("tags/channel", views.ChannelTagsList.as_view(), name="channel_tags_list"),
     path("tags/entry", views.EntryTagsList.as_view(), name="entry_tags_list"),
+    path("websub/<int:pk>/", views.WebSubCallback.as_view(), name="websub_callback"),
 ]
 
 
@@ -1,3 +1,4 @@
+import hashlib
 import time
 from contextlib import contextmanager
 from functools import lru_cache
@@ -34,6 +35,10 @@ def estimate_reading_time(text: str) -> float:
     return minutes
 
 
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 def make_unique(sequence):
     return list(dict.fromkeys(sequence))
 
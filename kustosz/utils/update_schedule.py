@@ -0,0 +1,45 @@
+from datetime import datetime
+from statistics import median
+from typing import Sequence
+
+from django.conf import settings
+
+
+def estimate_update_frequency(
+    published_times: Sequence[datetime], now: datetime
+) -> int:
+    """Estimate how often channel should be checked, in seconds.
+
+    published_times are publication times of most recent entries, newest
+    first. Channel is checked twice as often as it typically publishes;
+    channel that has been silent for longer than that is checked less and
+    less often.
+    """
+    min_frequency = settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_MIN
+    max_frequency = settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_MAX
+
+    if not published_times:
+        return max_frequency
+
+    since_last_entry = max((now - published_times[0]).total_seconds(), 0)
+    gaps = [
+        (newer - older).total_seconds()
+        for newer, older in zip(published_times, published_times[1:])
+    ]
+    typical_gap = median(gaps) if gaps else since_last_entry
+
+    frequency = max(typical_gap, since_last_entry / 2) / 2
+    return int(min(max(frequency, min_frequency), max_frequency))
+
+
+def get_backoff_delay(update_frequency: int, consecutive_failures: int) -> int:
+    """Delay before next check of channel that failed consecutive_failures
+    times in a row, in seconds.
+
+    Delay doubles with each failure, up to KUSTOSZ_FAILING_CHANNEL_MAX_BACKOFF;
+    it is never shorter than update_frequency.
+    """
+    max_backoff = max(update_frequency, settings.KUSTOSZ_FAILING_CHANNEL_MAX_BACKOFF)
+    # exponent is bounded, so delay does not grow to absurd numbers
+    exponent = min(consecutive_failures, max_backoff.bit_length())
+    return min(update_frequency * 2**exponent, max_backoff)
@@ -0,0 +1,233 @@
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+
+from django.db import connections
+
+# how database spells "values differ", with NULL treated as a value
+DISTINCT_OPERATORS = {
+    "postgresql": "IS DISTINCT FROM",
+    "sqlite": "IS NOT",
+}
+
+
+class UpsertResult(NamedTuple):
+    inserted: list
+    updated: list
+
+
+def can_upsert(using: str = "default") -> bool:
+    connection = connections[using]
+    return (
+        connection.vendor in DISTINCT_OPERATORS
+        and connection.features.can_return_rows_from_bulk_insert
+    )
+
+
+def upsert_objects(
+    model,
+    objs: Iterable,
+    unique_fields: Iterable[str],
+    compared_fields: Iterable[str],
+    inserted_marker: str,
+    touched_fields: Iterable[str] = (),
+    batch_size: Optional[int] = None,
+    using: str = "default",
+) -> UpsertResult:
+    """Insert objs, updating rows that conflict with them on unique_fields
+    instead. Existing row is updated only if any of compared_fields
+    differs; touched_fields are written together with them.
+
+    inserted_marker is field written on insert only (like auto_now_add
+    timestamp); all inserted rows get the same value of it, unique to this
+    call, telling them apart from updated ones. Objects of rows that were
+    neither inserted nor updated are not in result. Primary keys are set
+    on objects that are.
+    """
+    connection = connections[using]
+    meta = model._meta
+    qn = connection.ops.quote_name
+    table = qn(meta.db_table)
+    fields = [field for field in meta.concrete_fields if not field.primary_key]
+    columns = [qn(field.column) for field in fields]
+    unique_columns = [qn(meta.get_field(name).column) for name in unique_fields]
+    compared_columns = [qn(meta.get_field(name).column) for name in compared_fields]
+    touched_columns = [qn(meta.get_field(name).column) for name in touched_fields]
+    distinct = DISTINCT_OPERATORS[connection.vendor]
+
+    unique_indexes = [columns.index(column) for column in unique_columns]
+    marker_field = meta.get_field(inserted_marker)
+    sql_suffix = " ".join(
+        (
+            f"ON CONFLICT ({', '.join(unique_columns)}) DO UPDATE SET",
+            ", ".join(
+                f"{column} = excluded.{column}"
+                for column in compared_columns + touched_columns
+            ),
+            "WHERE",
+            " OR ".join(
+                f"{table}.{column} {distinct} excluded.{column}"
+                for column in compared_columns
+            ),
+            "RETURNING",
+            ", ".join(
+                [f"{table}.{qn(meta.pk.column)}"]
+                + [f"{table}.{columns[i]}" for i in unique_indexes]
+                + [f"{table}.{qn(marker_field.column)} = %s"]
+            ),
+        )
+    )
+
+    objs = list(objs)
+    if not objs:
+        return UpsertResult(inserted=[], updated=[])
+    marker_value = marker_field.pre_save(objs[0], add=True)
+    # one more field leaves room for marker compared in RETURNING
+    max_batch_size = connection.ops.bulk_batch_size(fields + [marker_field], objs)
+    max_batch_size = max_batch_size or len(objs)
+    batch_size = min(batch_size or max_batch_size, max_batch_size)
+    placeholders = f"({', '.join(['%s'] * len(fields))})"
+    result = UpsertResult(inserted=[], updated=[])
+    with connection.cursor() as cursor:
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start : start + batch_size]
+            objs_map = {}
+            params = []
+            for obj in batch:
+                setattr(obj, marker_field.attname, marker_value)
+                values = [
+                    field.get_db_prep_save(
+                        marker_value
+                        if field is marker_field
+                        else field.pre_save(obj, add=True),
+                        connection,
+                    )
+                    for field in fields
+                ]
+                objs_map[tuple(values[i] for i in unique_indexes)] = obj
+                params.extend(values)
+            sql = (
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES {', '.join([placeholders] * len(batch))} {sql_suffix}"
+            )
+            params.append(marker_field.get_db_prep_save(marker_value, connection))
+            cursor.execute(sql, params)
+            for pk, *key, inserted in cursor.fetchall():
+                obj = objs_map[tuple(key)]
+                obj.pk = pk
+                obj._state.adding = False
+                obj._state.db = using
+                if inserted:
+                    result.inserted.append(obj)
+                else:
+                    result.updated.append(obj)
+    return result
+
+
+def update_or_insert_objects(
+    model,
+    objs: Iterable,
+    key_fields: Iterable[str],
+    compared_fields: Iterable[str],
+    touched_fields: Iterable[str] = (),
+    batch_size: Optional[int] = None,
+    using: str = "default",
+) -> UpsertResult:
+    """Update rows that match objs on key_fields, if any of compared_fields
+    differs; touched_fields are written together with them. Objects that
+    don't match any row are inserted.
+
+    Unlike upsert_objects, key_fields don't need unique constraint; rows
+    are matched and inserted by separate statements, so objs must not be
+    written concurrently by someone else. Objects of rows that were matched,
+    but not updated, are not in result. Primary keys are set on objects
+    that are.
+    """
+    connection = connections[using]
+    meta = model._meta
+    qn = connection.ops.quote_name
+    table = qn(meta.db_table)
+    fields = [field for field in meta.concrete_fields if not field.primary_key]
+    columns = [qn(field.column) for field in fields]
+    distinct = DISTINCT_OPERATORS[connection.vendor]
+
+    # columns of VALUES list are called column1, column2 and so on
+    def values_column(name):
+        return f"v.column{fields.index(meta.get_field(name)) + 1}"
+
+    def table_column(name):
+        return f"{table}.{qn(meta.get_field(name).column)}"
+
+    key_fields = list(key_fields)
+    key_indexes = [fields.index(meta.get_field(name)) for name in key_fields]
+    key_match = " AND ".join(
+        f"{table_column(name)} = {values_column(name)}" for name in key_fields
+    )
+    returning = "RETURNING " + ", ".join(
+        [f"{table}.{qn(meta.pk.column)}"] + [table_column(name) for name in key_fields]
+    )
+    update_sql_suffix = " ".join(
+        (
+            "WHERE",
+            key_match,
+            "AND (",
+            " OR ".join(
+                f"{table_column(name)} {distinct} {values_column(name)}"
+                for name in compared_fields
+            ),
+            ")",
+            returning,
+        )
+    )
+    update_sql_prefix = f"UPDATE {table} SET " + ", ".join(
+        f"{qn(meta.get_field(name).column)} = {values_column(name)}"
+        for name in [*compared_fields, *touched_fields]
+    )
+    insert_sql_prefix = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(f'v.column{i}' for i in range(1, len(fields) + 1))}"
+    )
+    insert_sql_suffix = (
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {key_match}) {returning}"
+    )
+
+    objs = list(objs)
+    if not objs:
+        return UpsertResult(inserted=[], updated=[])
+    max_batch_size = connection.ops.bulk_batch_size(fields, objs)
+    max_batch_size = max_batch_size or len(objs)
+    batch_size = min(batch_size or max_batch_size, max_batch_size)
+    placeholders = f"({', '.join(['%s'] * len(fields))})"
+    result = UpsertResult(inserted=[], updated=[])
+    with connection.cursor() as cursor:
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start : start + batch_size]
+            objs_map = {}
+            params = []
+            for obj in batch:
+                values = [
+                    field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+                    for field in fields
+                ]
+                objs_map[tuple(values[i] for i in key_indexes)] = obj
+                params.extend(values)
+            values_sql = f"(VALUES {', '.join([placeholders] * len(batch))}) AS v"
+            # rows are updated first, so inserted rows are not compared
+            for sql, found in (
+                (
+                    f"{update_sql_prefix} FROM {values_sql} {update_sql_suffix}",
+                    result.updated,
+                ),
+                (
+                    f"{insert_sql_prefix} FROM {values_sql} {insert_sql_suffix}",
+                    result.inserted,
+                ),
+            ):
+                cursor.execute(sql, params)
+                for pk, *key in cursor.fetchall():
+                    obj = objs_map[tuple(key)]
+                    obj.pk = pk
+                    obj._state.adding = False
+                    obj._state.db = using
+                    found.append(obj)
+    return result
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from django.conf import settings
 from django.core.cache import cache
 from django.middleware.csrf import get_token
 from django.utils.timezone import now as django_now
@@ -7,6 +8,7 @@ from rest_framework import generics
 from rest_framework import permissions
 from rest_framework import status
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import NotFound
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
@@ -68,7 +70,9 @@ class ChannelsList(generics.ListCreateAPIView):
             title=serializer.data.get("title", ""),
             tags=serializer.data.get("tags"),
         )
-        models.Channel.objects.add_channels([channel], fetch_content=True)
+        models.Channel.objects.add_channels(
+            [channel], fetch_content=True, priority=True
+        )
 
 
 class ChannelDetail(generics.RetrieveUpdateAPIView):
@@ -79,15 +83,32 @@ class ChannelDetail(generics.RetrieveUpdateAPIView):
     def perform_update(self, serializer):
         if "url" not in serializer.validated_data:
             super().perform_update(serializer)
+            if "update_frequency" in serializer.validated_data:
+                models.Channel.objects.reschedule_next_check(serializer.instance)
             return
 
-        serializer.save(last_check_time=django_now() - timedelta(days=365))
+        # channel is claimed for priority fetch, so regular fetch does not
+        # pick it up in meantime
+        right_now = django_now()
+        serializer.save(
+            last_check_time=right_now - timedelta(days=365),
+            next_check_time=right_now + timedelta(seconds=settings.KUSTOSZ_LOCK_EXPIRE),
+        )
         dispatch_task_by_name(
-            TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+            TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT_PRIORITY,
             kwargs={"channel_ids": [serializer.data.get("id")], "force_fetch": False},
         )
 
 
+class ChannelFetchStatsList(generics.ListAPIView):
+    queryset = models.ChannelFetchLog.objects.get_channel_stats_queryset().order_by(
+        "-avg_duration", "channel"
+    )
+    serializer_class = serializers.ChannelFetchStatsSerializer
+    filterset_class = filters.ChannelFetchStatsFilter
+    permission_classes = [permissions.IsAuthenticated]
+
+
 class EntriesList(generics.ListAPIView):
     queryset = models.Entry.objects.get_annotated_queryset().order_by(
         "-published_time", "id"
@@ -298,3 +319,46 @@ class ExportChannels(generics.RetrieveAPIView):
             headers=headers,
             content_type="text/xml",
         )
+
+
+class WebSubCallback(generics.GenericAPIView):
+    queryset = models.Channel.objects.filter(
+        channel_type=ChannelTypesEnum.FEED, active=True
+    )
+    # hubs don't authenticate, pushed content is signed instead
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    renderer_classes = [renderers.PlainTextRenderer]
+
+    def get_object(self):
+        if not settings.KUSTOSZ_WEBSUB_ENABLED:
+            raise NotFound()
+        return super().get_object()
+
+    def get(self, request, *args, **kwargs):
+        channel = self.get_object()
+        verified = models.Channel.objects.verify_websub_subscription(
+            channel,
+            mode=request.query_params.get("hub.mode", ""),
+            topic=request.query_params.get("hub.topic", ""),
+            lease_seconds=request.query_params.get("hub.lease_seconds"),
+        )
+        if not verified:
+            raise NotFound()
+        challenge = request.query_params.get("hub.challenge", "")
+        return Response(challenge, status=status.HTTP_200_OK)
+
+    def post(self, request, *args, **kwargs):
+        channel = self.get_object()
+        # parsers are chosen by bare media type, without charset and such
+        content_type = request.content_type.split(";")[0].strip()
+        try:
+            models.Channel.objects.ingest_websub_content(
+                channel,
+                content=request.body,
+                content_type=content_type,
+                signature=request.headers.get("X-Hub-Signature", ""),
+            )
+        except InvalidDataException as e:
+            raise ValidationError(e.messages) from e
+        return Response("", status=status.HTTP_200_OK)
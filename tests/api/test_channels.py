@@ -1,10 +1,15 @@
 from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 
+import pytest
 from django.urls import reverse
+from django.utils.timezone import now as django_now
 from rest_framework import status
 
 import kustosz
 from ..framework.factories.models import ChannelFactory
+from ..framework.factories.models import ChannelFetchLogFactory
 from kustosz.constants import DEFAULT_UPDATE_FREQUENCY
 from kustosz.enums import TaskNamesEnum
 from kustosz.models import Channel
@@ -43,14 +48,15 @@ def test_create_channel(db, faker, mocker, authenticated_api_client):
     created_channel = m.last()
     assert created_channel.url == new_url
     kustosz.managers.dispatch_task_by_name.assert_called_once_with(
-        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT_PRIORITY,
         kwargs={"channel_ids": [created_channel.pk], "force_fetch": False},
     )
 
 
 def test_update_url(db, faker, mocker, authenticated_api_client):
     mocker.patch("kustosz.views.dispatch_task_by_name")
-    channel = ChannelFactory.create()
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create(next_check_time=None)
     url = reverse("channel_detail", args=[channel.id])
     new_url = faker.uri()
     data = {"url": new_url}
@@ -64,8 +70,16 @@ def test_update_url(db, faker, mocker, authenticated_api_client):
         datetime.strptime(response.data["last_check_time"], "%Y-%m-%dT%H:%M:%S.%fZ")
     )
     assert channel.last_check_time > last_check_time
+    next_check_time = optional_make_aware(
+        datetime.strptime(response.data["next_check_time"], "%Y-%m-%dT%H:%M:%S.%fZ")
+    )
+    assert next_check_time > django_now()
+    # channel claimed for priority fetch is not picked up by regular fetch
+    assert not Channel.objects.fetch_channels_content(
+        Channel.objects.filter(pk=channel.pk)
+    )
     kustosz.views.dispatch_task_by_name.assert_called_once_with(
-        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT_PRIORITY,
         kwargs={"channel_ids": [channel.pk], "force_fetch": False},
     )
 
@@ -112,6 +126,50 @@ def test_update_update_frequency(db, faker, authenticated_api_client):
     assert response.status_code == status.HTTP_200_OK
     assert response.data["update_frequency"] == new_update_frequency
     assert response.data["update_frequency"] > channel.update_frequency
+    channel.refresh_from_db()
+    assert channel.next_check_time == channel.last_check_time + timedelta(
+        seconds=new_update_frequency
+    )
+
+
+@pytest.mark.parametrize(
+    "channel_kwargs,expected_delay",
+    [
+        pytest.param(
+            {"consecutive_failures": 2},
+            7200 * 4,
+            id="backoff",
+        ),
+        pytest.param(
+            {"effective_update_frequency": 900},
+            900,
+            id="adaptive",
+        ),
+        pytest.param(
+            {"websub_lease_expires": datetime(2030, 1, 1, tzinfo=timezone.utc)},
+            86400,
+            id="websub",
+        ),
+    ],
+)
+def test_update_update_frequency_keeps_schedule(
+    db, authenticated_api_client, settings, channel_kwargs, expected_delay
+):
+    settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_ENABLED = True
+    settings.KUSTOSZ_FAILING_CHANNEL_MAX_BACKOFF = 86400
+    settings.KUSTOSZ_WEBSUB_UPDATE_FREQUENCY = 86400
+    channel = ChannelFactory.create(**channel_kwargs)
+    url = reverse("channel_detail", args=[channel.id])
+    data = {"update_frequency": 7200}
+
+    response = authenticated_api_client.patch(url, data)
+
+    assert response.status_code == status.HTTP_200_OK
+    channel.refresh_from_db()
+    assert channel.update_frequency == 7200
+    assert channel.next_check_time == channel.last_check_time + timedelta(
+        seconds=expected_delay
+    )
 
 
 def test_tags_in_list(db, faker, authenticated_api_client):
@@ -165,3 +223,80 @@ def test_set_tags(db, faker, authenticated_api_client):
     assert set(response.data["tags"]) == set(channel.tags.names())
     assert set(response.data["tags"]) == set(new_tags)
     assert set(response.data["tags"]) != set(old_tags)
+
+
+def test_filter_quarantined(db, authenticated_api_client, settings):
+    settings.KUSTOSZ_FAILING_CHANNEL_QUARANTINE_THRESHOLD = 3
+    ChannelFactory.create(consecutive_failures=2)
+    quarantined = ChannelFactory.create(consecutive_failures=3)
+    url = reverse("channels_list")
+
+    response = authenticated_api_client.get(url, {"is_quarantined": True})
+
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.data["results"]
+    assert [channel["id"] for channel in response_data] == [quarantined.pk]
+    assert response_data[0]["is_quarantined"] is True
+    assert response_data[0]["consecutive_failures"] == 3
+
+    response = authenticated_api_client.get(url, {"is_quarantined": False})
+
+    assert quarantined.pk not in [channel["id"] for channel in response.data["results"]]
+
+
+def test_fetch_stats(db, authenticated_api_client):
+    slow_channel = ChannelFactory.create()
+    large_channel = ChannelFactory.create()
+    for duration in (1000, 3000):
+        ChannelFetchLogFactory.create(
+            channel=slow_channel, duration=duration, response_size=100
+        )
+    ChannelFetchLogFactory.create(
+        channel=large_channel,
+        duration=100,
+        response_size=5000,
+        fetch_failed=True,
+    )
+    url = reverse("channels_fetch_stats")
+
+    response = authenticated_api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.data["results"]
+    assert [item["channel"] for item in response_data] == [
+        slow_channel.pk,
+        large_channel.pk,
+    ]
+    assert response_data[0]["channel_url"] == slow_channel.url
+    assert response_data[0]["fetch_count"] == 2
+    assert response_data[0]["failed_count"] == 0
+    assert response_data[0]["avg_duration"] == 2000
+    assert response_data[0]["max_duration"] == 3000
+    assert response_data[1]["failed_count"] == 1
+
+    response = authenticated_api_client.get(url, {"order": "-max_response_size"})
+
+    assert [item["channel"] for item in response.data["results"]] == [
+        large_channel.pk,
+        slow_channel.pk,
+    ]
+
+
+def test_fetch_stats_time_window(db, authenticated_api_client):
+    channel = ChannelFactory.create()
+    ChannelFetchLogFactory.create(
+        channel=channel, fetch_time=django_now() - timedelta(days=2), duration=9000
+    )
+    ChannelFetchLogFactory.create(channel=channel, duration=1000)
+    url = reverse("channels_fetch_stats")
+    window_start = django_now() - timedelta(days=1)
+
+    response = authenticated_api_client.get(
+        url, {"fetch_time__gte": window_start.isoformat()}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.data["results"]
+    assert len(response_data) == 1
+    assert response_data[0]["fetch_count"] == 1
+    assert response_data[0]["max_duration"] == 1000
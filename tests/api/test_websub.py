@@ -0,0 +1,241 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils.timezone import now as django_now
+from rest_framework import status
+
+from ..framework.factories.models import ChannelFactory
+from ..framework.utils import create_simple_feed
+from kustosz.constants import WEBSUB_LEASE_RENEWAL_MARGIN
+from kustosz.fetchers.feed import FeedChannelsFetcher
+from kustosz.models import Channel
+from kustosz.models import Entry
+
+
+def subscribed_channel_factory(websub_hub, **kwargs):
+    channel = ChannelFactory.create(
+        websub_hub=websub_hub.url,
+        websub_topic="http://example.com/feed.xml",
+        **kwargs,
+    )
+    Channel.objects._websub_subscribe([channel.pk])
+    return channel
+
+
+def test_subscription_verified(db, websub_hub):
+    channel = subscribed_channel_factory(
+        websub_hub, last_check_time=django_now(), update_frequency=3600
+    )
+    subscription = websub_hub.subscriptions[0]
+    channel.refresh_from_db()
+    assert subscription["hub.topic"] == "http://example.com/feed.xml"
+    assert subscription["hub.callback"] == "http://testserver" + reverse(
+        "websub_callback", kwargs={"pk": channel.pk}
+    )
+    assert subscription["hub.secret"] == channel.websub_secret
+    assert not channel.is_websub_subscribed
+
+    response = websub_hub.verify(subscription, challenge="abc123")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b"abc123"
+    channel.refresh_from_db()
+    assert channel.is_websub_subscribed
+    assert channel.websub_lease_expires > django_now() + timedelta(days=9)
+    assert channel.next_check_time == channel.last_check_time + timedelta(days=1)
+
+
+def test_subscription_renewal_keeps_secret(db, websub_hub):
+    channel = subscribed_channel_factory(websub_hub)
+    channel.refresh_from_db()
+    secret = channel.websub_secret
+
+    Channel.objects._websub_subscribe([channel.pk])
+
+    assert [item["hub.secret"] for item in websub_hub.subscriptions] == [
+        secret,
+        secret,
+    ]
+
+
+def test_subscription_with_unknown_topic(db, websub_hub):
+    channel = subscribed_channel_factory(websub_hub)
+    subscription = dict(websub_hub.subscriptions[0])
+    subscription["hub.topic"] = "http://example.com/other.xml"
+
+    response = websub_hub.verify(subscription)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    channel.refresh_from_db()
+    assert not channel.is_websub_subscribed
+
+
+def test_subscription_huge_lease(db, websub_hub):
+    channel = subscribed_channel_factory(websub_hub)
+    subscription = dict(websub_hub.subscriptions[0])
+    subscription["hub.lease_seconds"] = str(10**20)
+
+    response = websub_hub.verify(subscription)
+
+    assert response.status_code == status.HTTP_200_OK
+    channel.refresh_from_db()
+    assert channel.is_websub_subscribed
+    assert channel.websub_lease_expires < django_now() + timedelta(days=366)
+
+
+def test_subscription_short_lease(db, websub_hub, settings):
+    settings.KUSTOSZ_WEBSUB_UPDATE_FREQUENCY = 86400
+    channel = subscribed_channel_factory(
+        websub_hub, last_check_time=django_now(), update_frequency=3600
+    )
+    subscription = dict(websub_hub.subscriptions[0])
+    subscription["hub.lease_seconds"] = "7200"
+
+    response = websub_hub.verify(subscription)
+
+    assert response.status_code == status.HTTP_200_OK
+    channel.refresh_from_db()
+    assert channel.is_websub_subscribed
+    # channel is checked, and subscription renewed, before lease expires
+    renewal_time = channel.websub_lease_expires - timedelta(
+        seconds=WEBSUB_LEASE_RENEWAL_MARGIN
+    )
+    assert renewal_time - timedelta(seconds=1) < channel.next_check_time
+    assert channel.next_check_time <= renewal_time
+
+
+def test_subscription_not_requested(db, websub_hub):
+    channel = ChannelFactory.create(
+        websub_hub=websub_hub.url,
+        websub_topic="http://example.com/feed.xml",
+        websub_secret="secret",
+    )
+    subscription = {
+        "hub.topic": channel.websub_topic,
+        "hub.callback": "http://testserver"
+        + reverse("websub_callback", kwargs={"pk": channel.pk}),
+        "hub.lease_seconds": "864000",
+    }
+
+    response = websub_hub.verify(subscription)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    channel.refresh_from_db()
+    assert not channel.is_websub_subscribed
+
+
+def test_subscription_verified_once(db, websub_hub):
+    channel = subscribed_channel_factory(websub_hub)
+    subscription = websub_hub.subscriptions[0]
+    websub_hub.verify(subscription)
+    channel.refresh_from_db()
+    lease_expires = channel.websub_lease_expires
+
+    response = websub_hub.verify(subscription)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    channel.refresh_from_db()
+    assert channel.websub_lease_expires == lease_expires
+
+
+def test_subscription_denied_unknown_topic(db, websub_hub):
+    channel = subscribed_channel_factory(websub_hub)
+    subscription = dict(websub_hub.subscriptions[0])
+    websub_hub.verify(subscription)
+    subscription["hub.topic"] = "http://example.com/other.xml"
+
+    response = websub_hub.verify(subscription, mode="denied")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    channel.refresh_from_db()
+    assert channel.is_websub_subscribed
+    assert channel.websub_secret
+
+
+def test_subscription_denied(db, websub_hub):
+    channel = subscribed_channel_factory(websub_hub)
+    subscription = websub_hub.subscriptions[0]
+    websub_hub.verify(subscription)
+
+    response = websub_hub.verify(subscription, mode="denied")
+
+    assert response.status_code == status.HTTP_200_OK
+    channel.refresh_from_db()
+    assert not channel.is_websub_subscribed
+    assert not channel.websub_secret
+
+
+def test_content_ingested(db, websub_hub, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = subscribed_channel_factory(
+        websub_hub, last_check_time=django_now() - timedelta(days=1)
+    )
+    subscription = websub_hub.subscriptions[0]
+    websub_hub.verify(subscription)
+    content = create_simple_feed(
+        title="Pushed",
+        entries=[
+            {"gid": "http://example.com/1", "title": "First", "content": "Text"},
+            {"gid": "http://example.com/2", "title": "Second"},
+        ],
+    )
+
+    response = websub_hub.publish(subscription, content)
+
+    assert response.status_code == status.HTTP_200_OK
+    entries = Entry.objects.filter(channel=channel).order_by("gid")
+    assert [entry.title for entry in entries] == ["First", "Second"]
+    assert entries[0].content_set.get().content == "Text"
+    channel.refresh_from_db()
+    assert channel.last_check_time > django_now() - timedelta(minutes=1)
+
+
+def test_content_type_with_parameters(db, websub_hub, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = subscribed_channel_factory(websub_hub)
+    subscription = websub_hub.subscriptions[0]
+    websub_hub.verify(subscription)
+    content = create_simple_feed(entries=[{"gid": "http://example.com/1"}])
+    parse_content = mocker.spy(FeedChannelsFetcher, "parse_content")
+
+    response = websub_hub.publish(
+        subscription, content, content_type="application/rss+xml; charset=utf-8"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert parse_content.call_args.kwargs["mime_type"] == "application/rss+xml"
+    assert Entry.objects.filter(channel=channel).count() == 1
+
+
+def test_content_with_invalid_signature(db, websub_hub, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = subscribed_channel_factory(websub_hub)
+    subscription = websub_hub.subscriptions[0]
+    websub_hub.verify(subscription)
+    content = create_simple_feed(entries=[{"gid": "http://example.com/1"}])
+
+    response = websub_hub.publish(subscription, content, secret="not the secret")
+
+    # hub is not told signature was wrong, content is silently ignored
+    assert response.status_code == status.HTTP_200_OK
+    assert not Entry.objects.filter(channel=channel).exists()
+
+
+def test_invalid_content(db, websub_hub):
+    subscribed_channel_factory(websub_hub)
+    subscription = websub_hub.subscriptions[0]
+    websub_hub.verify(subscription)
+
+    response = websub_hub.publish(subscription, b"\x00 not a feed")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_callback_disabled(db, websub_hub, settings):
+    subscribed_channel_factory(websub_hub)
+    subscription = websub_hub.subscriptions[0]
+    settings.KUSTOSZ_WEBSUB_ENABLED = False
+
+    response = websub_hub.verify(subscription)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
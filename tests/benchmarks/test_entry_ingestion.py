@@ -0,0 +1,107 @@
+import os
+import time
+from dataclasses import replace
+
+import pytest
+from django.db import transaction
+from django.utils.timezone import now as django_now
+
+from ..framework.factories.models import ChannelFactory
+from ..framework.factories.types import FetchedFeedEntryContentFactory
+from ..framework.factories.types import FetchedFeedEntryFactory
+from kustosz.models import Entry
+from kustosz.models import EntryContent
+from kustosz.utils import estimate_reading_time
+from kustosz.utils import optional_make_aware
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("KUSTOSZ_BENCHMARKS"),
+    reason="benchmarks run only when KUSTOSZ_BENCHMARKS is set",
+)
+
+ENTRIES = 10_000
+
+
+def create_entries_one_by_one(channel, entries_data):
+    # how new entries were stored before they were inserted in bulk
+    with transaction.atomic():
+        for entry_data in entries_data:
+            entry = Entry(
+                channel=channel,
+                gid=entry_data.gid,
+                link=entry_data.link,
+                title=entry_data.title,
+                author=entry_data.author,
+                updated_time=django_now(),
+                published_time_upstream=optional_make_aware(entry_data.published_time),
+                updated_time_upstream=optional_make_aware(entry_data.updated_time),
+            )
+            entry.full_clean()
+            entry.save()
+            for fetched_content in entry_data.content:
+                EntryContent.objects.create(
+                    entry=entry,
+                    source=fetched_content.source,
+                    content=fetched_content.content,
+                    language=fetched_content.language,
+                    mimetype=fetched_content.mimetype,
+                    estimated_reading_time=estimate_reading_time(
+                        fetched_content.content
+                    ),
+                    updated_time=django_now(),
+                )
+
+
+def test_new_entries_ingestion(db, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    content = FetchedFeedEntryContentFactory.build()
+    entries_data = [
+        FetchedFeedEntryFactory.build(gid=f"http://e.com/{i}", content=[content])
+        for i in range(ENTRIES)
+    ]
+    one_by_one_channel, bulk_channel = ChannelFactory.create_batch(2)
+
+    start = time.perf_counter()
+    create_entries_one_by_one(one_by_one_channel, entries_data)
+    one_by_one_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Entry.objects._create_or_update_with_fetched_data(bulk_channel, entries_data)
+    bulk_time = time.perf_counter() - start
+
+    assert bulk_channel.entries.count() == ENTRIES
+    assert EntryContent.objects.filter(entry__channel=bulk_channel).count() == ENTRIES
+    print(
+        f"\n{ENTRIES} new entries: "
+        f"saved one by one {one_by_one_time:.3f}s, "
+        f"created in bulk {bulk_time:.3f}s"
+    )
+
+
+def test_existing_entries_ingestion(db, mocker, settings):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    entries_data = [
+        FetchedFeedEntryFactory.build(gid=f"http://e.com/{i}", content=[])
+        for i in range(ENTRIES)
+    ]
+    changed_entries_data = [
+        replace(entry_data, title=f"Changed {i}") if i % 2 else entry_data
+        for i, entry_data in enumerate(entries_data)
+    ]
+    times = {}
+    for upsert in (False, True):
+        settings.KUSTOSZ_FEED_ENTRIES_UPSERT = upsert
+        channel = ChannelFactory.create()
+        Entry.objects._create_or_update_with_fetched_data(channel, entries_data)
+
+        start = time.perf_counter()
+        Entry.objects._create_or_update_with_fetched_data(channel, changed_entries_data)
+        times[upsert] = time.perf_counter() - start
+
+        assert channel.entries.filter(title__startswith="Changed").count() == (
+            ENTRIES // 2
+        )
+    print(
+        f"\n{ENTRIES} existing entries, half of them changed: "
+        f"compared {times[False]:.3f}s, upserted {times[True]:.3f}s"
+    )
@@ -0,0 +1,53 @@
+import os
+import time
+
+import pytest
+
+from ..framework.utils import create_simple_feed
+from kustosz.fetchers.feed import FeedChannelsFetcher
+from kustosz.fetchers.feed import FeedFetcherPurpose
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("KUSTOSZ_BENCHMARKS"),
+    reason="benchmarks run only when KUSTOSZ_BENCHMARKS is set",
+)
+
+FEEDS = 50
+ENTRIES_PER_FEED = 60
+
+
+def get_entries_one_by_one(fetcher):
+    # how entries were retrieved before they were taken from update hook
+    return [
+        fetcher._reader.get_entry((entry.feed_url, entry.id))
+        for entry in fetcher._fetched_entries
+    ]
+
+
+def test_feed_fetcher_new_entries_data(db, fetchers_cache_dir, feed_server, settings):
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0
+    feed_urls = []
+    for i in range(FEEDS):
+        entries = [
+            {"gid": f"http://e.com/{i}/{j}", "title": f"Entry {j}", "content": "x"}
+            for j in range(ENTRIES_PER_FEED)
+        ]
+        body = create_simple_feed(title=f"Feed {i}", entries=entries)
+        feed_urls.append(feed_server.add_feed(f"/feed{i}.xml", body))
+    fetcher = FeedChannelsFetcher(purpose=FeedFetcherPurpose.MAIN)
+    fetcher.update(feed_urls)
+
+    start = time.perf_counter()
+    get_entries_one_by_one(fetcher)
+    one_by_one_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    entries_data = fetcher._get_new_entries_data()
+    batched_time = time.perf_counter() - start
+
+    assert len(entries_data) == FEEDS * ENTRIES_PER_FEED
+    print(
+        f"\n{len(entries_data)} entries: "
+        f"get_entry() per entry {one_by_one_time:.3f}s, "
+        f"from update hook {batched_time:.3f}s"
+    )
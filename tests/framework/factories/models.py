@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import factory.fuzzy
 from django.utils.timezone import now
 from factory.django import DjangoModelFactory
@@ -23,6 +25,13 @@ class ChannelFactory(DjangoModelFactory):
     added_time = factory.LazyFunction(now)
     active = True
     update_frequency = DEFAULT_UPDATE_FREQUENCY
+    next_check_time = factory.LazyAttribute(
+        lambda o: (
+            o.last_check_time + timedelta(seconds=o.update_frequency)
+            if o.last_check_time
+            else None
+        )
+    )
     deduplication_enabled = True
 
     @factory.post_generation
@@ -41,6 +50,22 @@ class ChannelFactory(DjangoModelFactory):
             EntryFactory.create_batch(size=extracted, channel=self, **kwargs)
 
 
+class ChannelFetchLogFactory(DjangoModelFactory):
+    class Meta:
+        model = kustosz_models.ChannelFetchLog
+
+    channel = factory.SubFactory(ChannelFactory)
+    fetch_time = factory.LazyFunction(now)
+    fetch_failed = False
+    not_modified = False
+    http_status = 200
+    duration = factory.Faker("pyint", max_value=10000)
+    parse_duration = factory.Faker("pyint", max_value=1000)
+    response_size = factory.Faker("pyint", max_value=1024 * 1024)
+    new_entries = factory.Faker("pyint", max_value=20)
+    updated_entries = factory.Faker("pyint", max_value=20)
+
+
 class EntryContentFactory(DjangoModelFactory):
     class Meta:
         model = kustosz_models.EntryContent
@@ -76,6 +76,18 @@ class FetchedFeedEntryFactory(factory.Factory):
     content = factory.List([FetchedFeedEntryContentFactory()])
 
 
+class FeedFetchStatsFactory(factory.Factory):
+    class Meta:
+        model = kustosz_types.FeedFetchStats
+
+    fetch_duration = factory.Faker("pyfloat", min_value=0, max_value=10)
+    parse_duration = factory.Faker("pyfloat", min_value=0, max_value=1)
+    response_size = factory.Faker("pyint", max_value=1024 * 1024)
+    http_status = 200
+    new_entries = factory.Faker("pyint", max_value=20)
+    updated_entries = factory.Faker("pyint", max_value=20)
+
+
 class FetchedFeedFactory(factory.Factory):
     class Meta:
         model = kustosz_types.FetchedFeed
@@ -2,6 +2,11 @@ import pytest
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
+from .utils import FeedServer
+from .utils import WebSubHub
+from kustosz.fetchers.feed import close_warm_feed_fetchers
+from kustosz.fetchers.parse_pool import shutdown_parse_pools
+from kustosz.fetchers.politeness import get_host_politeness_scheduler
 from kustosz.models import User
 
 
@@ -24,3 +29,51 @@ def authenticated_api_client(user_model):
     token = Token.objects.create(user=user_model)
     api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
     yield api_client
+
+
+@pytest.fixture()
+def fetchers_cache_dir(tmp_path, mocker):
+    mocker.patch("kustosz.fetchers.feed.FETCHERS_CACHE_DIR", tmp_path / "cache")
+    mocker.patch(
+        "kustosz.fetchers.feed.FEED_FETCHER_LOCAL_FEEDS_DIR", tmp_path / "feeds"
+    )
+    mocker.patch("kustosz.fetchers.url.FETCHERS_CACHE_DIR", tmp_path / "cache")
+    yield tmp_path / "cache"
+
+
+@pytest.fixture()
+def feed_server():
+    # all feeds are served by the same host; don't let requests sent in
+    # previous tests delay this one
+    get_host_politeness_scheduler.cache_clear()
+    server = FeedServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def websub_hub(feed_server, api_client, settings):
+    settings.KUSTOSZ_WEBSUB_ENABLED = True
+    settings.KUSTOSZ_WEBSUB_CALLBACK_BASE_URL = "http://testserver"
+    yield WebSubHub(feed_server, api_client)
+
+
+@pytest.fixture()
+def warm_feed_fetchers(fetchers_cache_dir, settings):
+    settings.KUSTOSZ_FEED_FETCHER_KEEP_WARM = True
+    yield
+    close_warm_feed_fetchers()
+
+
+@pytest.fixture()
+def feed_parse_pool(fetchers_cache_dir, settings):
+    settings.KUSTOSZ_FEED_PARSER_PROCESSES = 2
+    yield
+    shutdown_parse_pools()
+
+
+@pytest.fixture(params=[False, True], ids=["compared", "upserted"])
+def feed_entries_upsert(request, settings):
+    settings.KUSTOSZ_FEED_ENTRIES_UPSERT = request.param
+    yield request.param
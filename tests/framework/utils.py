@@ -1,3 +1,12 @@
+import hashlib
+import hmac
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
 from dominate import document
 from dominate import tags as t
 
@@ -24,3 +33,187 @@ def create_simple_html(title=None, meta=None, body=None):
         else:
             doc.body.add(*body)
     return doc.render(pretty=False)
+
+
+def create_simple_feed(title="", link="", entries=(), extra_elements=""):
+    items = []
+    for entry in entries:
+        items.append(
+            "<item>"
+            f"<guid>{entry['gid']}</guid>"
+            f"<title>{entry.get('title', '')}</title>"
+            f"<link>{entry.get('link', entry['gid'])}</link>"
+            f"<description>{entry.get('content', '')}</description>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>{title}</title><link>{link}</link>{extra_elements}"
+        f"{''.join(items)}"
+        "</channel></rss>"
+    ).encode("utf-8")
+
+
+class FeedServer:
+    """Minimal HTTP server serving feeds from memory, for fetcher tests.
+
+    Honors If-None-Match and If-Modified-Since, and records headers of
+    every request received, as well as the highest number of requests
+    handled at the same time. Forms sent in POST requests are recorded, too.
+    Connections are kept alive; addresses of clients are recorded, so
+    tests can tell if connections were reused. Feeds added with
+    trickle_delay have their body sent in small pieces, with delay
+    between them."""
+
+    def __init__(self, response_delay=0):
+        self.routes = {}
+        self.requests = []
+        self.forms = []
+        self.client_addresses = []
+        self.request_times = []
+        self.response_delay = response_delay
+        self.max_concurrent_requests = 0
+        self._concurrent_requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def _make_handler(self):
+        server = self
+
+        class FeedServerHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are sent separately; without this, client
+            # waits for delayed ACK on each kept-alive connection
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                server.client_addresses.append(self.client_address)
+                server.request_times.append(time.monotonic())
+                with server._lock:
+                    server._concurrent_requests += 1
+                    server.max_concurrent_requests = max(
+                        server.max_concurrent_requests, server._concurrent_requests
+                    )
+                try:
+                    time.sleep(server.response_delay)
+                    self._respond()
+                finally:
+                    with server._lock:
+                        server._concurrent_requests -= 1
+
+            def do_POST(self):
+                content_length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(content_length).decode("utf-8")
+                server.forms.append((self.path, dict(parse_qsl(body))))
+                route = server.routes.get(self.path)
+                self.send_response(route["status"] if route else 404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _respond(self):
+                route = server.routes.get(self.path)
+                if not route:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                headers = route["headers"]
+                etag = headers.get("ETag")
+                last_modified = headers.get("Last-Modified")
+                if (etag and self.headers.get("If-None-Match") == etag) or (
+                    last_modified
+                    and self.headers.get("If-Modified-Since") == last_modified
+                ):
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                self.send_response(route["status"])
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("Content-Length", str(len(route["body"])))
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.end_headers()
+                if not route["trickle_delay"]:
+                    self.wfile.write(route["body"])
+                    return
+                body = route["body"]
+                piece_size = max(len(body) // 10, 1)
+                for start in range(0, len(body), piece_size):
+                    self.wfile.write(body[start : start + piece_size])
+                    self.wfile.flush()
+                    time.sleep(route["trickle_delay"])
+
+            def log_message(self, *args, **kwargs):
+                pass
+
+        return FeedServerHandler
+
+    def add_feed(self, path, body, headers=None, status=200, trickle_delay=0):
+        self.routes[path] = {
+            "body": body,
+            "headers": headers or {},
+            "status": status,
+            "trickle_delay": trickle_delay,
+        }
+        return self.url(path)
+
+    def url(self, path):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}{path}"
+
+    def requests_for(self, path):
+        return [
+            headers for request_path, headers in self.requests if request_path == path
+        ]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class WebSubHub:
+    """Stand-in for WebSub hub. Subscription requests are received by
+    feed server; verification requests and content are delivered to
+    Kustosz callback by API client."""
+
+    def __init__(self, feed_server, api_client, path="/hub"):
+        self._feed_server = feed_server
+        self._api_client = api_client
+        self._path = path
+        self.url = feed_server.add_feed(path, b"", status=202)
+
+    @property
+    def subscriptions(self):
+        return [form for path, form in self._feed_server.forms if path == self._path]
+
+    def verify(self, subscription, mode="subscribe", challenge="challenge"):
+        query = {
+            "hub.mode": mode,
+            "hub.topic": subscription["hub.topic"],
+            "hub.challenge": challenge,
+            "hub.lease_seconds": subscription["hub.lease_seconds"],
+        }
+        return self._api_client.get(self._callback_path(subscription), query)
+
+    def publish(
+        self, subscription, content, secret=None, content_type="application/rss+xml"
+    ):
+        if secret is None:
+            secret = subscription["hub.secret"]
+        signature = hmac.new(secret.encode("utf-8"), content, hashlib.sha256)
+        return self._api_client.post(
+            self._callback_path(subscription),
+            data=content,
+            content_type=content_type,
+            HTTP_X_HUB_SIGNATURE=f"sha256={signature.hexdigest()}",
+        )
+
+    def _callback_path(self, subscription):
+        return urlsplit(subscription["hub.callback"]).path
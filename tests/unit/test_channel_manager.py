@@ -1,23 +1,33 @@
+from collections import defaultdict
 from datetime import timedelta
 
 import pytest
+from django.db import connection
 from django.utils.timezone import now as django_now
 from lxml import etree
 
 import kustosz
 from ..framework.factories.models import ChannelFactory
+from ..framework.factories.models import ChannelFetchLogFactory
 from ..framework.factories.models import EntryFactory
 from ..framework.factories.types import ChannelDataInputFactory
+from ..framework.factories.types import FeedFetchStatsFactory
 from ..framework.factories.types import FetchedFeedEntryContentFactory
 from ..framework.factories.types import FetchedFeedEntryFactory
 from ..framework.factories.types import FetchedFeedFactory
+from kustosz.constants import WEBSUB_LEASE_RENEWAL_MARGIN
 from kustosz.enums import ChannelTypesEnum
 from kustosz.enums import TaskNamesEnum
 from kustosz.exceptions import NoNewChannelsAddedException
+from kustosz.fetchers.deadlines import ABANDONED_MESSAGE
+from kustosz.fetchers.feed import FeedFetcherPurpose
 from kustosz.models import Channel
+from kustosz.models import ChannelFetchLog
+from kustosz.types import FeedCachingInfo
 from kustosz.types import FeedFetcherResult
 from kustosz.types import FetchedFeed
 from kustosz.utils import estimate_reading_time
+from kustosz.utils.update_schedule import get_backoff_delay
 
 
 def test_add_channels(db):
@@ -65,7 +75,7 @@ def test_add_channel_with_tags(db):
 
 def test_fetch_channels_content(db, mocker):
     mocker.patch("kustosz.managers.dispatch_task_by_name", return_value="1")
-    channel = ChannelFactory.create()
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     m = Channel.objects
     qs = m.all()
 
@@ -73,7 +83,7 @@ def test_fetch_channels_content(db, mocker):
 
     kustosz.managers.dispatch_task_by_name.assert_called_once_with(
         TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
-        kwargs={"channel_ids": [channel.pk], "force_fetch": False},
+        kwargs={"channel_ids": [channel.pk], "force_fetch": False, "shard": 0},
     )
     assert len(tasks) == 1
 
@@ -92,7 +102,7 @@ def test_fetch_channels_content_only_inactive(db, mocker):
 
 def test_fetch_channels_content_mix_active_inactive(db, mocker):
     mocker.patch("kustosz.managers.dispatch_task_by_name", return_value="1")
-    channel = ChannelFactory.create()
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     ChannelFactory.create(active=False)
     m = Channel.objects
     qs = m.all()
@@ -101,14 +111,57 @@ def test_fetch_channels_content_mix_active_inactive(db, mocker):
 
     kustosz.managers.dispatch_task_by_name.assert_called_once_with(
         TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
-        kwargs={"channel_ids": [channel.pk], "force_fetch": False},
+        kwargs={"channel_ids": [channel.pk], "force_fetch": False, "shard": 0},
+    )
+    assert len(tasks) == 1
+
+
+def test_fetch_channels_content_nothing_due(db, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    ChannelFactory.create_batch(2)
+    m = Channel.objects
+    qs = m.all()
+
+    tasks = m.fetch_channels_content(qs, force_fetch=False)
+
+    assert not kustosz.managers.dispatch_task_by_name.called
+    assert len(tasks) == 0
+
+
+def test_fetch_channels_content_nothing_due_force(db, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create()
+    m = Channel.objects
+    qs = m.all()
+
+    tasks = m.fetch_channels_content(qs, force_fetch=True)
+
+    kustosz.managers.dispatch_task_by_name.assert_any_call(
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+        kwargs={"channel_ids": [channel.pk], "force_fetch": True, "shard": 0},
+    )
+    assert len(tasks) == 1
+
+
+def test_fetch_channels_content_never_checked(db, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create(last_check_time=None)
+    ChannelFactory.create()
+    m = Channel.objects
+    qs = m.all()
+
+    tasks = m.fetch_channels_content(qs, force_fetch=False)
+
+    kustosz.managers.dispatch_task_by_name.assert_called_once_with(
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+        kwargs={"channel_ids": [channel.pk], "force_fetch": False, "shard": 0},
     )
     assert len(tasks) == 1
 
 
 def test_fetch_channels_content_paging(db, mocker):
     mocker.patch("kustosz.managers.dispatch_task_by_name")
-    ChannelFactory.create_batch(51)
+    ChannelFactory.create_batch(51, last_check_time=django_now() - timedelta(days=365))
     m = Channel.objects
     qs = m.all()
 
@@ -118,6 +171,92 @@ def test_fetch_channels_content_paging(db, mocker):
     assert len(tasks) == 2
 
 
+def test_fetch_channels_content_shards(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCHER_SHARDS = 2
+    settings.KUSTOSZ_FETCH_CHANNELS_CHUNK_SIZE = 2
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channels = ChannelFactory.create_batch(
+        5, last_check_time=django_now() - timedelta(days=365)
+    )
+    m = Channel.objects
+    qs = m.all()
+
+    tasks = m.fetch_channels_content(qs, force_fetch=False)
+
+    assert len(tasks) == 3
+    calls = kustosz.managers.dispatch_task_by_name.call_args_list
+    requested_shards = [call.kwargs["kwargs"]["shard"] for call in calls]
+    assert requested_shards == [0, 1, channels[-1].pk % 2]
+    for call in calls:
+        kwargs = call.kwargs["kwargs"]
+        for channel_id in kwargs["channel_ids"]:
+            assert channel_id % 2 == kwargs["shard"]
+
+
+def test_delete_channels_cleans_feed_fetcher_cache(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCHER_SHARDS = 2
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channels = ChannelFactory.create_batch(3)
+    ChannelFactory.create_batch(2)
+    m = Channel.objects
+    qs = m.filter(pk__in=[channel.pk for channel in channels])
+
+    m.delete_channels(qs)
+
+    expected_calls = defaultdict(list)
+    for channel in channels:
+        expected_calls[channel.pk % 2].append(channel.url)
+    calls = kustosz.managers.dispatch_task_by_name.call_args_list
+    assert len(calls) == len(expected_calls)
+    for call in calls:
+        assert call.args[0] == TaskNamesEnum.CLEAN_FEED_FETCHER_CACHE
+        kwargs = call.kwargs["kwargs"]
+        assert sorted(kwargs["feed_urls"]) == sorted(expected_calls[kwargs["shard"]])
+
+
+def test_fetch_channels_content_force_shards(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCHER_SHARDS = 2
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    ChannelFactory.create_batch(2)
+    m = Channel.objects
+    qs = m.all()
+
+    m.fetch_channels_content(qs, force_fetch=True)
+
+    calls = kustosz.managers.dispatch_task_by_name.call_args_list
+    assert [call.args[0] for call in calls] == [
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+    ]
+    assert [call.kwargs["kwargs"]["shard"] for call in calls] == [0, 1]
+    assert all(call.kwargs["kwargs"]["force_fetch"] for call in calls)
+
+
+def test_fetch_channels_content_priority(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCHER_SHARDS = 2
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channels = ChannelFactory.create_batch(
+        2, last_check_time=django_now() - timedelta(days=365)
+    )
+    m = Channel.objects
+    qs = m.all()
+
+    m.fetch_channels_content(qs, priority=True)
+
+    kustosz.managers.dispatch_task_by_name.assert_called_once_with(
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT_PRIORITY,
+        kwargs={
+            "channel_ids": [channel.pk for channel in channels],
+            "force_fetch": False,
+        },
+    )
+    # regular fetch does not pick up channels claimed by priority fetch
+    for channel in channels:
+        channel.refresh_from_db()
+        assert channel.next_check_time > django_now()
+    assert m.fetch_channels_content(qs) == []
+
+
 def test_fetch_feed_channels_content(db, mocker):
     mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch")
     mocker.patch(
@@ -133,7 +272,7 @@ def test_fetch_feed_channels_content(db, mocker):
     m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
 
     kustosz.managers.FeedChannelsFetcher.fetch.assert_called_once_with(
-        feed_urls=[channel.url]
+        feed_urls=[channel.url], caching_info={}, shard=0, force_fetch=False
     )
     assert (
         kustosz.managers.ChannelManager._ChannelManager__update_feeds_with_fetched_data.called  # noqa
@@ -180,7 +319,7 @@ def test_fetch_feed_channels_content_updated_recently_force_true(db, mocker):
     m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=True)
 
     kustosz.managers.FeedChannelsFetcher.fetch.assert_called_once_with(
-        feed_urls=[channel.url]
+        feed_urls=[channel.url], caching_info={}, shard=0, force_fetch=True
     )
     assert (
         kustosz.managers.ChannelManager._ChannelManager__update_feeds_with_fetched_data.called  # noqa
@@ -190,6 +329,84 @@ def test_fetch_feed_channels_content_updated_recently_force_true(db, mocker):
     )
 
 
+def test_fetch_feed_channels_content_caching_info(db, mocker):
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch")
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_feeds_with_fetched_data"  # noqa
+    )
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_entries_with_fetched_data"  # noqa
+    )
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365),
+        http_etag='"abc"',
+        http_last_modified="Mon, 05 Oct 2026 10:00:00 GMT",
+    )
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    kustosz.managers.FeedChannelsFetcher.fetch.assert_called_once_with(
+        feed_urls=[channel.url],
+        caching_info={
+            channel.url: FeedCachingInfo(
+                etag=channel.http_etag, last_modified=channel.http_last_modified
+            )
+        },
+        shard=0,
+        force_fetch=False,
+    )
+
+
+def test_fetch_feed_channels_content_caching_info_force_true(db, mocker):
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch")
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_feeds_with_fetched_data"  # noqa
+    )
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_entries_with_fetched_data"  # noqa
+    )
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create(http_etag='"abc"')
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=True)
+
+    kustosz.managers.FeedChannelsFetcher.fetch.assert_called_once_with(
+        feed_urls=[channel.url], caching_info={}, shard=0, force_fetch=True
+    )
+
+
+def test_fetch_feed_channels_content_priority(db, mocker):
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch")
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_feeds_with_fetched_data"  # noqa
+    )
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_entries_with_fetched_data"  # noqa
+    )
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365),
+        next_check_time=django_now() + timedelta(minutes=3),
+        http_etag='"abc"',
+    )
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(
+        channel_ids=[channel.id], force_fetch=False, priority=True
+    )
+
+    kustosz.managers.FeedChannelsFetcher.fetch.assert_called_once_with(
+        feed_urls=[channel.url],
+        caching_info={},
+        shard=0,
+        force_fetch=False,
+        purpose=FeedFetcherPurpose.PRIORITY,
+    )
+
+
 def test_fetch_channels_content_channel_updated(db, mocker):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     fetched_feed_data = FetchedFeedFactory(url=channel.url)
@@ -208,6 +425,9 @@ def test_fetch_channels_content_channel_updated(db, mocker):
     assert updated_channel.link != channel.link
     assert updated_channel.link == fetched_feed_data.link
     assert updated_channel.last_check_time > channel.last_check_time
+    assert updated_channel.next_check_time == (
+        updated_channel.last_check_time + timedelta(seconds=channel.update_frequency)
+    )
     assert (
         updated_channel.last_successful_check_time > channel.last_successful_check_time
     )
@@ -241,6 +461,496 @@ def test_fetch_channels_content_channel_not_updated_no_new_data(db, mocker):
     )
 
 
+def test_fetch_channels_content_adaptive_update_frequency(db, mocker, settings):
+    settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_ENABLED = True
+    channel, failed_channel = ChannelFactory.create_batch(
+        2, last_check_time=django_now() - timedelta(days=365)
+    )
+    right_now = django_now()
+    for hours in (2, 4, 6):
+        EntryFactory.create(
+            channel=channel,
+            published_time_upstream=right_now - timedelta(hours=hours),
+        )
+    fetcher_rv = FeedFetcherResult(
+        feeds=[
+            FetchedFeedFactory(url=channel.url),
+            FetchedFeedFactory(url=failed_channel.url, fetch_failed=True),
+        ],
+        entries=[],
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(
+        channel_ids=[channel.id, failed_channel.id], force_fetch=False
+    )
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.effective_update_frequency == 3600
+    assert updated_channel.next_check_time == (
+        updated_channel.last_check_time + timedelta(seconds=3600)
+    )
+    updated_failed_channel = m.get(pk=failed_channel.id)
+    assert updated_failed_channel.effective_update_frequency is None
+    assert updated_failed_channel.next_check_time == (
+        updated_failed_channel.last_check_time
+        + timedelta(seconds=get_backoff_delay(failed_channel.update_frequency, 1))
+    )
+
+
+def test_fetch_channels_content_adaptive_update_frequency_disabled(db, mocker):
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    EntryFactory.create_batch(3, channel=channel)
+    fetcher_rv = FeedFetcherResult(
+        feeds=[FetchedFeedFactory(url=channel.url)], entries=[]
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.effective_update_frequency is None
+    assert updated_channel.next_check_time == (
+        updated_channel.last_check_time + timedelta(seconds=channel.update_frequency)
+    )
+
+
+def test_fetch_channels_content_channel_caching_info_updated(db, mocker):
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365), http_etag='"old"'
+    )
+    fetched_feed_data = FetchedFeedFactory(
+        url=channel.url, caching_info=FeedCachingInfo(etag='"new"')
+    )
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_entries_with_fetched_data"  # noqa
+    )
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.http_etag == '"new"'
+    assert updated_channel.http_last_modified == ""
+
+
+@pytest.mark.parametrize(
+    "update_frequency,update_hint,expected_delay",
+    [
+        pytest.param(3600, None, 3600, id="no_hint"),
+        pytest.param(3600, 600, 3600, id="hint_shorter"),
+        pytest.param(3600, 7200, 7200, id="hint_longer"),
+    ],
+)
+def test_fetch_channels_content_update_hint(
+    db, mocker, update_frequency, update_hint, expected_delay
+):
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365),
+        update_frequency=update_frequency,
+    )
+    fetched_feed_data = FetchedFeedFactory(url=channel.url, update_hint=update_hint)
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.next_check_time == (
+        updated_channel.last_check_time + timedelta(seconds=expected_delay)
+    )
+
+
+def test_fetch_channels_content_adaptive_update_frequency_update_hint(
+    db, mocker, settings
+):
+    settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_ENABLED = True
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    fetched_feed_data = FetchedFeedFactory(url=channel.url, update_hint=172800)
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.effective_update_frequency == (
+        settings.KUSTOSZ_ADAPTIVE_UPDATE_FREQUENCY_MAX
+    )
+    assert updated_channel.next_check_time == (
+        updated_channel.last_check_time + timedelta(seconds=172800)
+    )
+
+
+@pytest.mark.parametrize(
+    "consecutive_failures,fetch_failed,expected_failures,expected_delay",
+    [
+        pytest.param(0, True, 1, 7200, id="first_failure"),
+        pytest.param(2, True, 3, 28800, id="third_failure"),
+        pytest.param(20, True, 21, 86400, id="max_backoff"),
+        pytest.param(20, False, 0, 3600, id="recovered"),
+    ],
+)
+def test_fetch_channels_content_failure_backoff(
+    db,
+    mocker,
+    settings,
+    consecutive_failures,
+    fetch_failed,
+    expected_failures,
+    expected_delay,
+):
+    settings.KUSTOSZ_FAILING_CHANNEL_MAX_BACKOFF = 86400
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365),
+        update_frequency=3600,
+        consecutive_failures=consecutive_failures,
+    )
+    fetched_feed_data = FetchedFeedFactory(url=channel.url, fetch_failed=fetch_failed)
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.consecutive_failures == expected_failures
+    assert updated_channel.next_check_time == (
+        updated_channel.last_check_time + timedelta(seconds=expected_delay)
+    )
+
+
+def test_fetch_channels_content_records_fetch_logs(db, mocker):
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    not_fetched_channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365)
+    )
+    fetch_stats = FeedFetchStatsFactory(
+        fetch_duration=1.5,
+        parse_duration=0.0123,
+        response_size=2048,
+        http_status=200,
+        new_entries=3,
+        updated_entries=1,
+    )
+    fetcher_rv = FeedFetcherResult(
+        feeds=[
+            FetchedFeedFactory(url=channel.url, fetch_stats=fetch_stats),
+            FetchedFeedFactory(url=not_fetched_channel.url),
+        ],
+        entries=[],
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(
+        channel_ids=[channel.id, not_fetched_channel.id], force_fetch=False
+    )
+
+    fetch_log = ChannelFetchLog.objects.get()
+    assert fetch_log.channel == channel
+    assert not fetch_log.fetch_failed
+    assert not fetch_log.not_modified
+    assert fetch_log.http_status == 200
+    assert fetch_log.duration == 1500
+    assert fetch_log.parse_duration == 12
+    assert fetch_log.response_size == 2048
+    assert fetch_log.new_entries == 3
+    assert fetch_log.updated_entries == 1
+
+
+def test_fetch_channels_content_trims_fetch_logs(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCH_LOG_RETENTION_DAYS = 7
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    old_log = ChannelFetchLogFactory.create(
+        channel=channel, fetch_time=django_now() - timedelta(days=8)
+    )
+    recent_log = ChannelFetchLogFactory.create(
+        channel=channel, fetch_time=django_now() - timedelta(days=6)
+    )
+    fetcher_rv = FeedFetcherResult(
+        feeds=[
+            FetchedFeedFactory(url=channel.url, fetch_stats=FeedFetchStatsFactory())
+        ],
+        entries=[],
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    fetch_logs = ChannelFetchLog.objects.filter(channel=channel)
+    assert fetch_logs.count() == 2
+    assert not fetch_logs.filter(pk=old_log.pk).exists()
+    assert fetch_logs.filter(pk=recent_log.pk).exists()
+
+
+def test_fetch_channels_content_fetch_logs_disabled(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCH_LOG_RETENTION_DAYS = 0
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    fetcher_rv = FeedFetcherResult(
+        feeds=[
+            FetchedFeedFactory(url=channel.url, fetch_stats=FeedFetchStatsFactory())
+        ],
+        entries=[],
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    assert not ChannelFetchLog.objects.exists()
+
+
+def test_fetch_channels_content_requests_websub_subscription(db, mocker, settings):
+    settings.KUSTOSZ_WEBSUB_ENABLED = True
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    channel_without_hub = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365)
+    )
+    fetcher_rv = FeedFetcherResult(
+        feeds=[
+            FetchedFeedFactory(url=channel.url, websub_hub="http://hub.example.com/"),
+            FetchedFeedFactory(url=channel_without_hub.url),
+        ],
+        entries=[],
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(
+        channel_ids=[channel.id, channel_without_hub.id], force_fetch=False
+    )
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.websub_hub == "http://hub.example.com/"
+    # feed did not tell which URL it is subscribed under
+    assert updated_channel.websub_topic == channel.url
+    kustosz.managers.dispatch_task_by_name.assert_called_once_with(
+        TaskNamesEnum.WEBSUB_SUBSCRIBE, kwargs={"channel_ids": [channel.id]}
+    )
+
+
+def _websub_renewal_time(channel):
+    return channel.websub_lease_expires - timedelta(seconds=WEBSUB_LEASE_RENEWAL_MARGIN)
+
+
+@pytest.mark.parametrize(
+    "lease_expires,expected_next_check_time,expected_subscription_request",
+    [
+        pytest.param(
+            timedelta(days=5),
+            lambda channel: channel.last_check_time + timedelta(days=1),
+            False,
+            id="lease_valid",
+        ),
+        pytest.param(
+            timedelta(hours=12),
+            _websub_renewal_time,
+            False,
+            id="lease_expiring",
+        ),
+        pytest.param(
+            timedelta(minutes=5),
+            lambda channel: channel.last_check_time + timedelta(hours=1),
+            True,
+            id="lease_renewal_due",
+        ),
+    ],
+)
+def test_fetch_channels_content_websub_subscribed(
+    db,
+    mocker,
+    settings,
+    lease_expires,
+    expected_next_check_time,
+    expected_subscription_request,
+):
+    settings.KUSTOSZ_WEBSUB_ENABLED = True
+    settings.KUSTOSZ_WEBSUB_UPDATE_FREQUENCY = 86400
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365),
+        update_frequency=3600,
+        websub_hub="http://hub.example.com/",
+        websub_topic="http://example.com/feed.xml",
+        websub_secret="secret",
+        websub_lease_expires=django_now() + lease_expires,
+    )
+    fetched_feed_data = FetchedFeedFactory(
+        url=channel.url,
+        websub_hub="http://hub.example.com/",
+        websub_topic="http://example.com/feed.xml",
+    )
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    # channel is checked, and subscription renewed, before lease expires
+    expected_next_check_time = expected_next_check_time(updated_channel)
+    assert (
+        expected_next_check_time - timedelta(seconds=1)
+        < updated_channel.next_check_time
+        <= expected_next_check_time
+    )
+    assert kustosz.managers.dispatch_task_by_name.called is (
+        expected_subscription_request
+    )
+
+
+def test_fetch_channels_content_websub_hub_changed(db, mocker, settings):
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365),
+        websub_hub="http://hub.example.com/",
+        websub_topic="http://example.com/feed.xml",
+        websub_secret="secret",
+        websub_lease_expires=django_now() + timedelta(days=5),
+    )
+    fetched_feed_data = FetchedFeedFactory(
+        url=channel.url,
+        websub_hub="http://other-hub.example.com/",
+        websub_topic="http://example.com/feed.xml",
+    )
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.websub_hub == "http://other-hub.example.com/"
+    assert not updated_channel.is_websub_subscribed
+
+
+def test_fetch_channels_content_channel_not_modified(db, mocker):
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365), http_etag='"abc"'
+    )
+    fetched_feed_data = FetchedFeed(
+        url=channel.url, fetch_failed=False, not_modified=True
+    )
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_entries_with_fetched_data"  # noqa
+    )
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.title_upstream == channel.title_upstream
+    assert updated_channel.link == channel.link
+    assert updated_channel.http_etag == channel.http_etag
+    assert updated_channel.last_check_time > channel.last_check_time
+    assert (
+        updated_channel.last_successful_check_time > channel.last_successful_check_time
+    )
+
+
+def test_fetch_channels_content_channel_content_unchanged(db, mocker):
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365), http_body_hash="abc"
+    )
+    fetched_feed_data = FetchedFeed(
+        url=channel.url,
+        fetch_failed=False,
+        content_unchanged=True,
+        fetch_stats=FeedFetchStatsFactory(),
+    )
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_entries_with_fetched_data"  # noqa
+    )
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    kustosz.managers.FeedChannelsFetcher.fetch.assert_called_once_with(
+        feed_urls=[channel.url],
+        caching_info={channel.url: FeedCachingInfo(body_hash="abc")},
+        shard=0,
+        force_fetch=False,
+    )
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.title_upstream == channel.title_upstream
+    assert updated_channel.link == channel.link
+    assert updated_channel.http_body_hash == channel.http_body_hash
+    assert updated_channel.last_check_time > channel.last_check_time
+    assert ChannelFetchLog.objects.get().content_unchanged
+
+
+def test_fetch_channels_content_channel_abandoned(db, mocker):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    fetched_feed_data = FetchedFeed(
+        url=channel.url,
+        fetch_failed=True,
+        abandoned=True,
+        failure_reason=ABANDONED_MESSAGE,
+        fetch_stats=FeedFetchStatsFactory(),
+    )
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.last_check_time == channel.last_check_time
+    assert updated_channel.next_check_time == channel.next_check_time
+    assert updated_channel.consecutive_abandonments == 1
+    assert updated_channel.consecutive_failures == channel.consecutive_failures
+    assert ChannelFetchLog.objects.get().failure_reason == ABANDONED_MESSAGE
+    kustosz.managers.dispatch_task_by_name.assert_called_once_with(
+        TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT,
+        kwargs={"channel_ids": [channel.id], "force_fetch": False, "shard": 0},
+    )
+
+
+def test_fetch_channels_content_channel_abandoned_too_many_times(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCHER_MAX_ABANDONMENTS = 3
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    channel = ChannelFactory.create(
+        last_check_time=django_now() - timedelta(days=365),
+        consecutive_failures=0,
+        consecutive_abandonments=2,
+    )
+    fetched_feed_data = FetchedFeed(
+        url=channel.url,
+        fetch_failed=True,
+        abandoned=True,
+        failure_reason=ABANDONED_MESSAGE,
+        fetch_stats=FeedFetchStatsFactory(),
+    )
+    fetcher_rv = FeedFetcherResult(feeds=[fetched_feed_data], entries=[])
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    # channel is failed and backs off instead of being requested again
+    updated_channel = m.get(pk=channel.id)
+    assert updated_channel.last_check_time > channel.last_check_time
+    assert updated_channel.next_check_time > django_now()
+    assert updated_channel.consecutive_failures == 1
+    assert updated_channel.consecutive_abandonments == 0
+    dispatched_tasks = [
+        call.args[0] for call in kustosz.managers.dispatch_task_by_name.call_args_list
+    ]
+    assert TaskNamesEnum.FETCH_FEED_CHANNEL_CONTENT not in dispatched_tasks
+
+
 def test_fetch_channels_content_channel_not_updated_fetch_failure(db, mocker):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     fetched_feed_data = FetchedFeed(
@@ -351,7 +1061,7 @@ def test_fetch_channels_content_unexpected_channel(db, mocker):
     assert updated_channel.url != deleted_channel.url
 
 
-def test_fetch_feed_channels_entry_added(db, mocker):
+def test_fetch_feed_channels_entry_added(db, mocker, feed_entries_upsert):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     fetched_entry_data = FetchedFeedEntryFactory(feed_url=channel.url)
     fetcher_rv = FeedFetcherResult(feeds=[], entries=[fetched_entry_data])
@@ -379,7 +1089,101 @@ def test_fetch_feed_channels_entry_added(db, mocker):
     assert new_entry_content.mimetype == fetched_entry_data.content[0].mimetype
 
 
-def test_fetch_feed_channels_entry_updated(db, mocker):
+@pytest.mark.parametrize("can_return_rows", [True, False])
+def test_fetch_feed_channels_entries_added_in_bulk(db, mocker, can_return_rows):
+    mocker.patch.object(
+        type(connection.features),
+        "can_return_rows_from_bulk_insert",
+        new_callable=mocker.PropertyMock,
+        return_value=can_return_rows,
+    )
+    channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
+    fetched_entries_data = FetchedFeedEntryFactory.build_batch(
+        3,
+        feed_url=channel.url,
+        content=FetchedFeedEntryContentFactory.build_batch(2),
+    )
+    invalid_entry_data = FetchedFeedEntryFactory(
+        feed_url=channel.url, link="not a link"
+    )
+    fetcher_rv = FeedFetcherResult(
+        feeds=[], entries=fetched_entries_data + [invalid_entry_data]
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch", return_value=fetcher_rv)
+    mocker.patch(
+        "kustosz.managers.ChannelManager._ChannelManager__update_feeds_with_fetched_data"  # noqa
+    )
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(channel_ids=[channel.id], force_fetch=False)
+
+    new_entries = {entry.gid: entry for entry in channel.entries.all()}
+    assert set(new_entries) == {item.gid for item in fetched_entries_data}
+    for fetched_entry_data in fetched_entries_data:
+        new_entry = new_entries[fetched_entry_data.gid]
+        assert sorted(new_entry.content_set.values_list("content", flat=True)) == (
+            sorted(content.content for content in fetched_entry_data.content)
+        )
+    kustosz.managers.dispatch_task_by_name.assert_any_call(
+        TaskNamesEnum.RUN_FILTERS_ON_ENTRIES,
+        kwargs={"entries_ids": mocker.ANY},
+    )
+    run_filters_call = next(
+        call
+        for call in kustosz.managers.dispatch_task_by_name.call_args_list
+        if call.args[0] == TaskNamesEnum.RUN_FILTERS_ON_ENTRIES
+    )
+    assert set(run_filters_call.kwargs["kwargs"]["entries_ids"]) == {
+        entry.pk for entry in new_entries.values()
+    }
+
+
+def test_fetch_feed_channels_streaming(db, mocker, settings):
+    settings.KUSTOSZ_FEED_FETCHER_STREAMING = True
+    channels = ChannelFactory.create_batch(
+        2, last_check_time=django_now() - timedelta(days=365)
+    )
+    fetched_data_stream = [
+        FeedFetcherResult(
+            feeds=[FetchedFeedFactory(url=channel.url)],
+            entries=FetchedFeedEntryFactory.build_batch(2, feed_url=channel.url),
+        )
+        for channel in channels
+    ]
+    mocker.patch(
+        "kustosz.managers.FeedChannelsFetcher.fetch_iter",
+        return_value=iter(fetched_data_stream),
+    )
+    mocker.patch("kustosz.managers.FeedChannelsFetcher.fetch")
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    m = Channel.objects
+
+    m._fetch_feed_channels_content(
+        channel_ids=[channel.id for channel in channels], force_fetch=False
+    )
+
+    assert not kustosz.managers.FeedChannelsFetcher.fetch.called
+    for channel, fetched_data in zip(channels, fetched_data_stream):
+        updated_channel = m.get(pk=channel.id)
+        assert updated_channel.title_upstream == fetched_data.feeds[0].title
+        assert updated_channel.last_successful_check_time
+        assert set(updated_channel.entries.values_list("gid", flat=True)) == {
+            entry.gid for entry in fetched_data.entries
+        }
+    run_filters_calls = [
+        call
+        for call in kustosz.managers.dispatch_task_by_name.call_args_list
+        if call.args[0] == TaskNamesEnum.RUN_FILTERS_ON_ENTRIES
+    ]
+    assert len(run_filters_calls) == 1
+    assert len(run_filters_calls[0].kwargs["kwargs"]["entries_ids"]) == 4
+    kustosz.managers.dispatch_task_by_name.assert_any_call(
+        TaskNamesEnum.DEDUPLICATE_ENTRIES
+    )
+
+
+def test_fetch_feed_channels_entry_updated(db, mocker, feed_entries_upsert):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     entry = EntryFactory.create(channel=channel)
     fetched_entry_data = FetchedFeedEntryFactory(feed_url=channel.url, gid=entry.gid)
@@ -407,7 +1211,9 @@ def test_fetch_feed_channels_entry_updated(db, mocker):
     assert updated_entry.updated_time > entry.added_time
 
 
-def test_fetch_feed_channels_entry_not_updated_no_new_data(db, mocker):
+def test_fetch_feed_channels_entry_not_updated_no_new_data(
+    db, mocker, feed_entries_upsert
+):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     entry = EntryFactory.create(channel=channel)
     fetched_entry_data = FetchedFeedEntryFactory(
@@ -444,7 +1250,7 @@ def test_fetch_feed_channels_entry_not_updated_no_new_data(db, mocker):
     assert updated_entry.updated_time == entry.updated_time
 
 
-def test_fetch_feed_channels_entry_content_updated(db, mocker):
+def test_fetch_feed_channels_entry_content_updated(db, mocker, feed_entries_upsert):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     entry = EntryFactory.create(channel=channel, content_set=1)
     entry_content = entry.content_set.first()
@@ -482,7 +1288,7 @@ def test_fetch_feed_channels_entry_content_updated(db, mocker):
     )
 
 
-def test_fetch_feed_channels_entry_content_added(db, mocker):
+def test_fetch_feed_channels_entry_content_added(db, mocker, feed_entries_upsert):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     entry = EntryFactory.create(channel=channel, content_set=1)
     entry_content = entry.content_set.first()
@@ -517,7 +1323,9 @@ def test_fetch_feed_channels_entry_content_added(db, mocker):
     )
 
 
-def test_fetch_feed_channels_entry_content_not_updated_no_changes(db, mocker):
+def test_fetch_feed_channels_entry_content_not_updated_no_changes(
+    db, mocker, feed_entries_upsert
+):
     channel = ChannelFactory.create(last_check_time=django_now() - timedelta(days=365))
     entry = EntryFactory.create(channel=channel, content_set=1)
     entry_content = entry.content_set.first()
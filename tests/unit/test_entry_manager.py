@@ -1,5 +1,7 @@
 from datetime import timedelta
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now as django_now
 from freezegun import freeze_time
 
@@ -7,12 +9,20 @@ import kustosz
 from ..framework.factories.models import ChannelFactory
 from ..framework.factories.models import EntryFactory
 from ..framework.factories.models import EntryFilterFactory
+from ..framework.factories.types import FetchedFeedEntryContentFactory
+from ..framework.factories.types import FetchedFeedEntryFactory
 from ..framework.factories.types import ReadabilityContentListFactory
 from ..framework.factories.types import SingleEntryExtractedMetadataFactory
+from ..framework.utils import create_simple_feed
 from kustosz.enums import EntryFilterActionsEnum
+from kustosz.fetchers.feed import FeedChannelsFetcher
+from kustosz.fetchers.feed import FeedFetcherPurpose
 from kustosz.managers import DuplicateFinder
 from kustosz.models import Entry
+from kustosz.models import EntryContent
 from kustosz.models import EntryFilter
+from kustosz.utils import estimate_reading_time
+from kustosz.utils import get_content_hash
 
 
 def test_deduplication_same_gid(db):
@@ -456,3 +466,202 @@ def test_add_readability(db, mocker):
     assert entry_content.source == extracted_data.content[0].source
     assert entry_content.content == extracted_data.content[0].content
     assert entry_content.mimetype == extracted_data.content[0].mimetype
+    assert entry_content.content_hash == get_content_hash(entry_content.content)
+
+
+def get_channels_ingestion_queries_count(channels_count):
+    channels_entries_data = {}
+    for channel in ChannelFactory.create_batch(channels_count):
+        existing_entry = EntryFactory.create(channel=channel, content_set=1)
+        existing_content = existing_entry.content_set.get()
+        changed_content = FetchedFeedEntryContentFactory(
+            source=existing_content.source,
+            mimetype=existing_content.mimetype,
+            language=existing_content.language,
+        )
+        channels_entries_data[channel] = [
+            FetchedFeedEntryFactory(
+                feed_url=channel.url,
+                gid=existing_entry.gid,
+                content=[changed_content, FetchedFeedEntryContentFactory()],
+            ),
+            FetchedFeedEntryFactory(feed_url=channel.url),
+        ]
+    with CaptureQueriesContext(connection) as context:
+        new_entries_ids = Entry.objects._create_or_update_channels_with_fetched_data(
+            channels_entries_data
+        )
+    assert len(new_entries_ids) == channels_count
+    for channel, entries_data in channels_entries_data.items():
+        assert set(channel.entries.values_list("title", flat=True)) == {
+            entry_data.title for entry_data in entries_data
+        }
+        assert set(
+            EntryContent.objects.filter(entry__channel=channel).values_list(
+                "content", flat=True
+            )
+        ) == {
+            content.content
+            for entry_data in entries_data
+            for content in entry_data.content
+        }
+    return len(context.captured_queries)
+
+
+def test_create_or_update_channels_queries(db, mocker, feed_entries_upsert):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    assert get_channels_ingestion_queries_count(
+        1
+    ) == get_channels_ingestion_queries_count(5)
+
+
+def test_create_or_update_compares_content_hashes(db, mocker, feed_entries_upsert):
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    entry = EntryFactory.create(content_set=2)
+    unchanged_content, changed_content = entry.content_set.order_by("pk")
+    fetched_contents = [
+        FetchedFeedEntryContentFactory(
+            source=entry_content.source,
+            mimetype=entry_content.mimetype,
+            language=entry_content.language,
+            content=content,
+        )
+        for entry_content, content in (
+            (unchanged_content, unchanged_content.content),
+            (changed_content, "Changed content"),
+        )
+    ]
+    fetched_entry_data = FetchedFeedEntryFactory(
+        feed_url=entry.channel.url, gid=entry.gid, content=fetched_contents
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        Entry.objects._create_or_update_with_fetched_data(
+            entry.channel, [fetched_entry_data]
+        )
+
+    content_column = f'"{EntryContent._meta.db_table}"."content"'
+    assert not any(
+        query["sql"].startswith("SELECT") and content_column in query["sql"]
+        for query in context.captured_queries
+    )
+    unchanged_content_data = EntryContent.objects.values().get(pk=unchanged_content.pk)
+    assert unchanged_content_data["updated_time"] == unchanged_content.updated_time
+    changed_content.refresh_from_db()
+    assert changed_content.content == "Changed content"
+    assert changed_content.content_hash == get_content_hash("Changed content")
+
+
+def test_upsert_compares_content_hashes_in_database(db, mocker, settings):
+    settings.KUSTOSZ_FEED_ENTRIES_UPSERT = True
+    mocker.patch("kustosz.managers.dispatch_task_by_name")
+    estimate_reading_time_spy = mocker.spy(kustosz.managers, "estimate_reading_time")
+    entry = EntryFactory.create(content_set=2)
+    unchanged_content, changed_content = entry.content_set.order_by("pk")
+    fetched_contents = [
+        FetchedFeedEntryContentFactory(
+            source=entry_content.source,
+            mimetype=entry_content.mimetype,
+            language=entry_content.language,
+            content=content,
+        )
+        for entry_content, content in (
+            (unchanged_content, unchanged_content.content),
+            (changed_content, "Changed content"),
+        )
+    ]
+    fetched_entry_data = FetchedFeedEntryFactory(
+        feed_url=entry.channel.url,
+        gid=entry.gid,
+        link=entry.link,
+        title=entry.title,
+        author=entry.author,
+        published_time=entry.published_time_upstream,
+        updated_time=entry.updated_time_upstream,
+        content=fetched_contents,
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        Entry.objects._create_or_update_with_fetched_data(
+            entry.channel, [fetched_entry_data]
+        )
+
+    content_table = f'"{EntryContent._meta.db_table}"'
+    assert not any(
+        query["sql"].startswith("SELECT") and content_table in query["sql"]
+        for query in context.captured_queries
+    )
+    estimate_reading_time_spy.assert_called_once_with("Changed content")
+    unchanged_content_data = EntryContent.objects.values().get(pk=unchanged_content.pk)
+    assert unchanged_content_data["updated_time"] == unchanged_content.updated_time
+    changed_content.refresh_from_db()
+    assert changed_content.content == "Changed content"
+    assert changed_content.content_hash == get_content_hash("Changed content")
+    assert changed_content.estimated_reading_time == estimate_reading_time(
+        "Changed content"
+    )
+    updated_entry = Entry.objects.get(pk=entry.pk)
+    assert updated_entry.updated_time > entry.updated_time
+
+
+def test_prune_feed_fetcher_cache(db, fetchers_cache_dir, feed_server):
+    entries = [{"gid": f"http://e.com/{i}"} for i in range(4)]
+    body = create_simple_feed(entries=entries[:3])
+    feed_url = feed_server.add_feed("/feed.xml", body)
+    with freeze_time(django_now() - timedelta(days=8)):
+        FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    body = create_simple_feed(entries=entries[3:])
+    feed_server.add_feed("/feed.xml", body, headers={"ETag": '"abc"'})
+    with freeze_time(django_now() - timedelta(days=1)):
+        FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    channel = ChannelFactory.create(url=feed_url)
+    for entry in entries[:2]:
+        EntryFactory.create(channel=channel, gid=entry["gid"])
+    m = Entry.objects
+
+    removed_count = m.prune_feed_fetcher_cache(days=7)
+
+    assert removed_count == 2
+    fetcher = FeedChannelsFetcher(purpose=FeedFetcherPurpose.MAIN)
+    cached_entries = {entry.id for entry in fetcher._reader.get_entries()}
+    assert cached_entries == {entries[2]["gid"], entries[3]["gid"]}
+    # caching metadata of feed survived
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    third_request_headers = feed_server.requests_for("/feed.xml")[2]
+    assert third_request_headers.get("If-None-Match") == '"abc"'
+
+
+def test_prune_feed_fetcher_cache_entries_in_feed(db, fetchers_cache_dir, feed_server):
+    entries = [{"gid": f"http://e.com/{i}"} for i in range(3)]
+    body = create_simple_feed(entries=entries[:2])
+    feed_url = feed_server.add_feed("/feed.xml", body)
+    with freeze_time(django_now() - timedelta(days=8)):
+        FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    body = create_simple_feed(entries=entries[1:])
+    feed_server.add_feed("/feed.xml", body)
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    channel = ChannelFactory.create(url=feed_url)
+    for entry in entries:
+        EntryFactory.create(channel=channel, gid=entry["gid"])
+    m = Entry.objects
+
+    removed_count = m.prune_feed_fetcher_cache(days=7)
+
+    # old entry still in feed would be reported as new if it was removed
+    assert removed_count == 1
+    fetcher = FeedChannelsFetcher(purpose=FeedFetcherPurpose.MAIN)
+    cached_entries = {entry.id for entry in fetcher._reader.get_entries()}
+    assert cached_entries == {entries[1]["gid"], entries[2]["gid"]}
+
+
+def test_prune_feed_fetcher_cache_recent_entries(db, fetchers_cache_dir, feed_server):
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body)
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    channel = ChannelFactory.create(url=feed_url)
+    EntryFactory.create(channel=channel, gid="http://e.com/1")
+    m = Entry.objects
+
+    removed_count = m.prune_feed_fetcher_cache(days=7)
+
+    assert removed_count == 0
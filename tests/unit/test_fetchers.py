@@ -1,8 +1,42 @@
+import hashlib
+import hmac
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+
 import pytest
+from django.core.cache import cache
+from django.utils.timezone import now as django_now
+from freezegun import freeze_time
 
 from ..framework.factories.types import FakeRequestFactory
+from ..framework.utils import create_simple_feed
+from kustosz.constants import HOSTS_RETRY_AFTER_CACHE_KEY
+from kustosz.enums import EntryContentSourceTypesEnum
+from kustosz.enums import FeedFetcherEnginesEnum
+from kustosz.exceptions import HostRateLimitedError
+from kustosz.exceptions import PermanentFetcherError
+from kustosz.fetchers.asyncio_engine import AsyncioRetrievalEngine
+from kustosz.fetchers.deadlines import ABANDONED_MESSAGE
+from kustosz.fetchers.feed import FeedChannelsFetcher
+from kustosz.fetchers.feed import FeedFetcherPurpose
+from kustosz.fetchers.parse_pool import can_use_parse_pool
+from kustosz.fetchers.parse_pool import ProcessPoolFeedparserParser
+from kustosz.fetchers.pipeline import iterate_in_background
+from kustosz.fetchers.politeness import get_host_politeness_scheduler
+from kustosz.fetchers.politeness import parse_retry_after
+from kustosz.fetchers.update_hints import get_feed_head
+from kustosz.fetchers.update_hints import get_feed_update_hint
+from kustosz.fetchers.update_hints import get_http_update_hint
 from kustosz.fetchers.url import EncodingSeekingParser
 from kustosz.fetchers.url import SingleURLFetcher
+from kustosz.fetchers.websub import get_feed_websub_links
+from kustosz.fetchers.websub import is_valid_websub_signature
+from kustosz.types import FeedCachingInfo
 
 
 @pytest.mark.parametrize(
@@ -93,7 +127,7 @@ def test_encoding_seeking_parser(text, expected):
         ),
     ],
 )
-def test_fetched_url_encoding(fake_request, expected, mocker):
+def test_fetched_url_encoding(db, fake_request, expected, mocker):
     mocker.patch("kustosz.fetchers.url.CachedSession.get", return_value=fake_request)
     response = SingleURLFetcher.fetch("http://example.com")
     assert response.encoding == expected
@@ -104,3 +138,899 @@ def test_fetched_url_encoding(fake_request, expected, mocker):
     ]
     for encoding in encodings:
         assert response.encoding != encoding
+
+
+def test_feed_fetcher_receives_caching_info(db, fetchers_cache_dir, feed_server):
+    body = create_simple_feed(title="Test", entries=[{"gid": "http://e.com/1"}])
+    headers = {"ETag": '"abc"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"}
+    feed_url = feed_server.add_feed("/feed.xml", body, headers=headers)
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+
+    fetched_feed = fetched_data.feeds[0]
+    assert not fetched_feed.fetch_failed
+    assert not fetched_feed.not_modified
+    assert fetched_feed.title == "Test"
+    assert fetched_feed.caching_info == FeedCachingInfo(
+        etag=headers["ETag"],
+        last_modified=headers["Last-Modified"],
+        body_hash=hashlib.sha256(body).hexdigest(),
+    )
+    assert len(fetched_data.entries) == 1
+
+
+def test_feed_fetcher_sends_caching_info_without_reader_cache(
+    db, fetchers_cache_dir, feed_server
+):
+    body = create_simple_feed(title="Test", entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body, headers={"ETag": '"abc"'})
+    caching_info = {feed_url: FeedCachingInfo(etag='"abc"')}
+
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[feed_url], caching_info=caching_info
+    )
+
+    request_headers = feed_server.requests_for("/feed.xml")[0]
+    assert request_headers.get("If-None-Match") == '"abc"'
+    fetched_feed = fetched_data.feeds[0]
+    assert not fetched_feed.fetch_failed
+    assert fetched_feed.not_modified
+    assert fetched_feed.caching_info is None
+    assert not fetched_data.entries
+
+
+def test_feed_fetcher_skips_unchanged_body(db, fetchers_cache_dir, feed_server):
+    body = create_simple_feed(title="Test", entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body)
+    changed_url = feed_server.add_feed("/changed.xml", body)
+    body_hash = hashlib.sha256(body).hexdigest()
+    caching_info = {
+        feed_url: FeedCachingInfo(body_hash=body_hash),
+        changed_url: FeedCachingInfo(body_hash="0" * 64),
+    }
+
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[feed_url, changed_url], caching_info=caching_info
+    )
+
+    fetched_feeds = {feed.url: feed for feed in fetched_data.feeds}
+    unchanged_feed = fetched_feeds[feed_url]
+    assert not unchanged_feed.fetch_failed
+    assert unchanged_feed.content_unchanged
+    assert unchanged_feed.caching_info.body_hash == body_hash
+    assert unchanged_feed.fetch_stats.response_size == len(body)
+    assert not fetched_feeds[changed_url].content_unchanged
+    assert fetched_feeds[changed_url].caching_info.body_hash == body_hash
+    assert [entry.feed_url for entry in fetched_data.entries] == [changed_url]
+
+
+def test_feed_fetcher_prefers_reader_caching_info(db, fetchers_cache_dir, feed_server):
+    body = create_simple_feed(title="Test", entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body, headers={"ETag": '"new"'})
+    caching_info = {feed_url: FeedCachingInfo(etag='"old"')}
+
+    with freeze_time(django_now() - timedelta(days=1)):
+        FeedChannelsFetcher.fetch(feed_urls=[feed_url], caching_info=caching_info)
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[feed_url], caching_info=caching_info
+    )
+
+    second_request_headers = feed_server.requests_for("/feed.xml")[1]
+    assert second_request_headers.get("If-None-Match") == '"new"'
+    assert fetched_data.feeds[0].not_modified
+
+
+@pytest.mark.parametrize("pipeline_size", [0, 2])
+def test_feed_fetcher_fetch_iter(
+    db, fetchers_cache_dir, feed_server, settings, pipeline_size
+):
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0
+    settings.KUSTOSZ_FEED_FETCHER_PIPELINE_SIZE = pipeline_size
+    feed_urls = []
+    for i in range(3):
+        entries = [{"gid": f"http://e.com/{i}/{j}"} for j in range(i + 1)]
+        body = create_simple_feed(title=f"Feed {i}", entries=entries)
+        feed_urls.append(feed_server.add_feed(f"/feed{i}.xml", body))
+    feed_urls.append(feed_server.add_feed("/broken.xml", b"", status=500))
+
+    fetched_data_stream = list(FeedChannelsFetcher.fetch_iter(feed_urls=feed_urls))
+
+    assert len(fetched_data_stream) == 4
+    fetched_data_by_url = {}
+    for fetched_data in fetched_data_stream:
+        assert len(fetched_data.feeds) == 1
+        fetched_feed = fetched_data.feeds[0]
+        assert {entry.feed_url for entry in fetched_data.entries} <= {fetched_feed.url}
+        fetched_data_by_url[fetched_feed.url] = fetched_data
+    for i, feed_url in enumerate(feed_urls[:3]):
+        fetched_data = fetched_data_by_url[feed_url]
+        assert not fetched_data.feeds[0].fetch_failed
+        assert fetched_data.feeds[0].title == f"Feed {i}"
+        assert len(fetched_data.entries) == i + 1
+    assert fetched_data_by_url[feed_urls[3]].feeds[0].fetch_failed
+
+
+def test_feed_fetcher_shards_use_separate_databases(
+    db, fetchers_cache_dir, feed_server
+):
+    body = create_simple_feed(title="Test", entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body)
+
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url], shard=0)
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url], shard=1)
+    FeedChannelsFetcher.clean_cached_files(shard=1)
+
+    db_files = {path.name for path in fetchers_cache_dir.glob("readerdb.*")}
+    assert "readerdb.MAIN.sqlite" in db_files
+    assert not any(".MAIN.1." in name for name in db_files)
+
+
+def test_feed_fetcher_priority_uses_throwaway_database(
+    db, fetchers_cache_dir, feed_server
+):
+    body = create_simple_feed(title="Test", entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body, headers={"ETag": '"abc"'})
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    db_files = {path.name for path in fetchers_cache_dir.glob("readerdb.*")}
+
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[feed_url], purpose=FeedFetcherPurpose.PRIORITY
+    )
+
+    assert feed_server.requests_for("/feed.xml")[1].get("If-None-Match") is None
+    assert len(fetched_data.entries) == 1
+    assert {path.name for path in fetchers_cache_dir.glob("readerdb.*")} == db_files
+
+
+def test_feed_fetcher_keep_warm(db, warm_feed_fetchers, feed_server, mocker):
+    first_body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", first_body, headers={"ETag": '"1"'})
+    other_url = feed_server.add_feed("/other.xml", first_body)
+    with freeze_time(django_now() - timedelta(days=1)):
+        FeedChannelsFetcher.fetch(feed_urls=[feed_url, other_url])
+    second_body = create_simple_feed(
+        entries=[{"gid": "http://e.com/1"}, {"gid": "http://e.com/2"}]
+    )
+    feed_server.add_feed("/feed.xml", second_body, headers={"ETag": '"2"'})
+    make_reader = mocker.patch("kustosz.fetchers.feed.make_reader")
+
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[feed_url],
+        caching_info={feed_url: FeedCachingInfo(etag='"0"')},
+    )
+
+    make_reader.assert_not_called()
+    # state of previous fetch is not reported again
+    assert [feed.url for feed in fetched_data.feeds] == [feed_url]
+    assert [entry.gid for entry in fetched_data.entries] == ["http://e.com/2"]
+    assert fetched_data.feeds[0].caching_info.etag == '"2"'
+    assert fetched_data.feeds[0].fetch_stats.new_entries == 1
+    # connection made by previous fetch was reused
+    assert len(set(feed_server.client_addresses)) == 1
+
+
+def test_feed_fetcher_keep_warm_clean_cached_files(db, warm_feed_fetchers, feed_server):
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body, headers={"ETag": '"abc"'})
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+
+    FeedChannelsFetcher.clean_cached_files()
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+
+    assert feed_server.requests_for("/feed.xml")[1].get("If-None-Match") is None
+    assert len(fetched_data.entries) == 1
+
+
+def test_feed_fetcher_clean_selected_feeds(db, fetchers_cache_dir, feed_server):
+    headers = {"ETag": '"abc"'}
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    removed_url = feed_server.add_feed("/removed.xml", body, headers=headers)
+    kept_url = feed_server.add_feed("/kept.xml", body, headers=headers)
+    with freeze_time(django_now() - timedelta(days=1)):
+        FeedChannelsFetcher.fetch(feed_urls=[removed_url, kept_url])
+
+    FeedChannelsFetcher.clean_cached_files(feed_urls=[removed_url])
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[removed_url, kept_url])
+
+    assert feed_server.requests_for("/removed.xml")[1].get("If-None-Match") is None
+    assert feed_server.requests_for("/kept.xml")[1].get("If-None-Match") == '"abc"'
+    assert [entry.feed_url for entry in fetched_data.entries] == [removed_url]
+
+
+def test_feed_fetcher_force_fetch(db, fetchers_cache_dir, feed_server):
+    headers = {"ETag": '"abc"'}
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body, headers=headers)
+    other_url = feed_server.add_feed("/other.xml", body, headers=headers)
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url, other_url])
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[feed_url], force_fetch=True)
+
+    assert len(feed_server.requests_for("/feed.xml")) == 2
+    assert feed_server.requests_for("/feed.xml")[1].get("If-None-Match") is None
+    assert not fetched_data.feeds[0].not_modified
+    assert len(fetched_data.entries) == 1
+    fetcher = FeedChannelsFetcher(purpose=FeedFetcherPurpose.MAIN)
+    assert {feed.url for feed in fetcher._reader.get_feeds()} == {feed_url, other_url}
+
+
+def test_feed_fetcher_reader_deletes_feed_entries(db, fetchers_cache_dir, feed_server):
+    # pruning deletes entries added by feed with reader storage method,
+    # which is not public API; reader is pinned to minor version where it
+    # works, and this fails when it does not anymore
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body)
+    FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    fetcher = FeedChannelsFetcher(purpose=FeedFetcherPurpose.MAIN)
+    (entry,) = fetcher._reader.get_entries()
+    assert entry.added_by == "feed"
+
+    fetcher._reader._storage.delete_entries(
+        [(entry.feed_url, entry.id)], added_by="feed"
+    )
+
+    assert not list(fetcher._reader.get_entries())
+
+
+def test_feed_fetcher_asyncio_engine(db, fetchers_cache_dir, feed_server, settings):
+    settings.KUSTOSZ_FEED_FETCHER_ENGINE = FeedFetcherEnginesEnum.ASYNCIO
+    settings.KUSTOSZ_HOST_MAX_CONNECTIONS = 2
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0
+    feed_server.response_delay = 0.2
+    feed_urls = []
+    for i in range(6):
+        body = create_simple_feed(
+            title=f"Test {i}", entries=[{"gid": f"http://e.com/{i}"}]
+        )
+        headers = {"ETag": f'"{i}"'}
+        feed_urls.append(feed_server.add_feed(f"/feed{i}.xml", body, headers=headers))
+    missing_feed_url = feed_server.url("/missing.xml")
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=feed_urls + [missing_feed_url])
+
+    fetched_feeds = {feed.url: feed for feed in fetched_data.feeds}
+    assert fetched_feeds[missing_feed_url].fetch_failed
+    for i, feed_url in enumerate(feed_urls):
+        fetched_feed = fetched_feeds[feed_url]
+        assert not fetched_feed.fetch_failed
+        assert fetched_feed.title == f"Test {i}"
+        assert fetched_feed.caching_info.etag == f'"{i}"'
+    assert len(fetched_data.entries) == len(feed_urls)
+    assert feed_server.max_concurrent_requests == 2
+
+
+def test_feed_fetcher_asyncio_engine_not_modified(
+    db, fetchers_cache_dir, feed_server, settings
+):
+    settings.KUSTOSZ_FEED_FETCHER_ENGINE = FeedFetcherEnginesEnum.ASYNCIO
+    body = create_simple_feed(title="Test", entries=[{"gid": "http://e.com/1"}])
+    feed_url = feed_server.add_feed("/feed.xml", body, headers={"ETag": '"abc"'})
+    caching_info = {feed_url: FeedCachingInfo(etag='"abc"')}
+
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[feed_url], caching_info=caching_info
+    )
+
+    fetched_feed = fetched_data.feeds[0]
+    assert not fetched_feed.fetch_failed
+    assert fetched_feed.not_modified
+    assert not fetched_data.entries
+
+
+def test_asyncio_engine_retrieval_failure():
+    engine = AsyncioRetrievalEngine(max_connections=2, max_host_connections=1)
+    feeds = [SimpleNamespace(url=f"http://example.com/{i}.xml") for i in range(3)]
+    raised = []
+
+    def retrieve_fn(feed):
+        raise RuntimeError("retriever is broken")
+
+    def consume():
+        try:
+            list(engine.map(retrieve_fn, feeds))
+        except RuntimeError as e:
+            raised.append(e)
+
+    # map() must not wait forever for results of failed retrieval
+    consumer_thread = threading.Thread(target=consume, daemon=True)
+    consumer_thread.start()
+    consumer_thread.join(timeout=10)
+
+    assert not consumer_thread.is_alive()
+    assert [str(e) for e in raised] == ["retriever is broken"]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        pytest.param("120", 120, id="seconds"),
+        pytest.param("", None, id="empty"),
+        pytest.param("soon", None, id="invalid"),
+        pytest.param("Mon, 05 Oct 2026 10:00:00 GMT", 60, id="http_date"),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    with freeze_time("2026-10-05 09:59:00"):
+        assert parse_retry_after(value) == expected
+
+
+def test_feed_fetcher_spaces_requests_to_same_host(
+    db, fetchers_cache_dir, feed_server, settings
+):
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0.3
+    feed_urls = []
+    for i in range(3):
+        body = create_simple_feed(entries=[{"gid": f"http://e.com/{i}"}])
+        feed_urls.append(feed_server.add_feed(f"/feed{i}.xml", body))
+
+    FeedChannelsFetcher.fetch(feed_urls=feed_urls)
+
+    request_times = feed_server.request_times
+    assert len(request_times) == 3
+    for previous, current in zip(request_times, request_times[1:]):
+        assert current - previous >= 0.25
+
+
+def test_feed_fetcher_honors_retry_after(db, fetchers_cache_dir, feed_server):
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    limited_url = feed_server.add_feed(
+        "/a.xml", b"", headers={"Retry-After": "120"}, status=429
+    )
+    other_url = feed_server.add_feed("/b.xml", body)
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[limited_url, other_url])
+
+    assert all(feed.fetch_failed for feed in fetched_data.feeds)
+    assert len(feed_server.requests) == 1
+    retry_after_times = cache.get(HOSTS_RETRY_AFTER_CACHE_KEY)
+    assert retry_after_times["127.0.0.1"] > time.time() + 100
+
+
+def test_url_fetcher_honors_retry_after_from_feed_fetcher(
+    db, fetchers_cache_dir, feed_server
+):
+    limited_url = feed_server.add_feed(
+        "/feed.xml", b"", headers={"Retry-After": "120"}, status=429
+    )
+    FeedChannelsFetcher.fetch(feed_urls=[limited_url])
+    # page fetcher usually runs in another process
+    get_host_politeness_scheduler.cache_clear()
+
+    with pytest.raises(HostRateLimitedError):
+        SingleURLFetcher.fetch(feed_server.url("/page.html"))
+
+    assert len(feed_server.requests) == 1
+
+
+def test_url_fetcher_too_many_requests(db, fetchers_cache_dir, feed_server):
+    limited_url = feed_server.add_feed("/page.html", b"", status=429)
+
+    with pytest.raises(HostRateLimitedError):
+        SingleURLFetcher.fetch(limited_url)
+    with pytest.raises(HostRateLimitedError):
+        SingleURLFetcher.fetch(feed_server.url("/other.html"))
+
+    assert len(feed_server.requests) == 1
+
+
+def test_url_fetcher_limits_host_connections(
+    db, fetchers_cache_dir, feed_server, settings
+):
+    settings.KUSTOSZ_HOST_MAX_CONNECTIONS = 2
+    feed_server.response_delay = 0.2
+    page_urls = [
+        feed_server.add_feed(f"/page{i}.html", b"<html></html>") for i in range(5)
+    ]
+    threads = [
+        threading.Thread(target=SingleURLFetcher.fetch, args=(page_url,))
+        for page_url in page_urls
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(feed_server.requests) == len(page_urls)
+    assert feed_server.max_concurrent_requests == 2
+
+
+def test_feed_fetcher_limits_host_connections(
+    db, feed_parse_pool, feed_server, settings
+):
+    # feeds are retrieved by multiple threads when they are parsed in pool
+    settings.KUSTOSZ_HOST_MAX_CONNECTIONS = 1
+    feed_server.response_delay = 0.2
+    feed_urls = []
+    for i in range(4):
+        body = create_simple_feed(entries=[{"gid": f"http://e.com/{i}"}])
+        feed_urls.append(feed_server.add_feed(f"/feed{i}.xml", body))
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=feed_urls)
+
+    assert not any(feed.fetch_failed for feed in fetched_data.feeds)
+    assert feed_server.max_concurrent_requests == 1
+
+
+@pytest.mark.parametrize(
+    "feed,expected",
+    [
+        pytest.param({}, None, id="no_hints"),
+        pytest.param({"ttl": "60"}, 3600, id="ttl"),
+        pytest.param({"ttl": "soon"}, None, id="ttl_invalid"),
+        pytest.param({"ttl": "0"}, None, id="ttl_zero"),
+        pytest.param({"sy_updateperiod": "daily"}, 86400, id="sy_period"),
+        pytest.param(
+            {"sy_updateperiod": "hourly", "sy_updatefrequency": "2"},
+            1800,
+            id="sy_period_frequency",
+        ),
+        pytest.param({"sy_updateperiod": "sometimes"}, None, id="sy_period_invalid"),
+        pytest.param(
+            {"ttl": "30", "sy_updateperiod": "hourly"}, 3600, id="longest_wins"
+        ),
+    ],
+)
+def test_get_feed_update_hint(feed, expected):
+    assert get_feed_update_hint(feed) == expected
+
+
+@pytest.mark.parametrize(
+    "status,headers,expected",
+    [
+        pytest.param(200, {}, None, id="no_headers"),
+        pytest.param(200, {"Cache-Control": "max-age=600"}, 600, id="max_age"),
+        pytest.param(304, {"Cache-Control": "max-age=600"}, 600, id="not_modified"),
+        pytest.param(
+            200, {"Cache-Control": "no-cache, max-age=600"}, None, id="no_cache"
+        ),
+        pytest.param(
+            200,
+            {
+                "Date": "Mon, 05 Oct 2026 09:00:00 GMT",
+                "Expires": "Mon, 05 Oct 2026 10:00:00 GMT",
+            },
+            3600,
+            id="expires",
+        ),
+        pytest.param(500, {"Cache-Control": "max-age=600"}, None, id="error"),
+    ],
+)
+def test_get_http_update_hint(status, headers, expected):
+    with freeze_time("2026-10-05 09:00:00"):
+        assert get_http_update_hint(status, headers) == expected
+
+
+def test_feed_fetcher_receives_update_hint(db, fetchers_cache_dir, feed_server):
+    body = create_simple_feed(extra_elements="<ttl>30</ttl>")
+    ttl_url = feed_server.add_feed("/ttl.xml", body)
+    headers = {"Cache-Control": "max-age=7200"}
+    max_age_url = feed_server.add_feed("/max-age.xml", body, headers=headers)
+    no_hints_url = feed_server.add_feed("/no-hints.xml", create_simple_feed())
+
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[ttl_url, max_age_url, no_hints_url]
+    )
+
+    update_hints = {feed.url: feed.update_hint for feed in fetched_data.feeds}
+    assert update_hints == {
+        ttl_url: 1800,
+        max_age_url: 7200,
+        no_hints_url: None,
+    }
+
+
+def test_feed_fetcher_update_hint_limit(db, fetchers_cache_dir, feed_server, settings):
+    settings.KUSTOSZ_FEED_UPDATE_HINT_MAX = 3600
+    body = create_simple_feed(
+        extra_elements="<sy:updatePeriod>weekly</sy:updatePeriod>"
+    )
+    feed_url = feed_server.add_feed("/feed.xml", body)
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+
+    assert fetched_data.feeds[0].update_hint == 3600
+
+
+@pytest.mark.parametrize(
+    "engine", [FeedFetcherEnginesEnum.THREADS, FeedFetcherEnginesEnum.ASYNCIO]
+)
+def test_feed_fetcher_fetch_stats(
+    db, fetchers_cache_dir, feed_server, settings, engine
+):
+    settings.KUSTOSZ_FEED_FETCHER_ENGINE = engine
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0
+    feed_server.response_delay = 0.2
+    body = create_simple_feed(
+        title="Test", entries=[{"gid": "http://e.com/1"}, {"gid": "http://e.com/2"}]
+    )
+    feed_url = feed_server.add_feed("/feed.xml", body)
+    missing_feed_url = feed_server.url("/missing.xml")
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[feed_url, missing_feed_url])
+
+    fetch_stats = {feed.url: feed.fetch_stats for feed in fetched_data.feeds}
+    feed_stats = fetch_stats[feed_url]
+    assert feed_stats.fetch_duration >= 0.2
+    assert feed_stats.parse_duration > 0
+    assert feed_stats.response_size == len(body)
+    assert feed_stats.http_status == 200
+    assert feed_stats.new_entries == 2
+    assert feed_stats.updated_entries == 0
+    missing_feed_stats = fetch_stats[missing_feed_url]
+    assert missing_feed_stats.fetch_duration >= 0.2
+    assert missing_feed_stats.parse_duration is None
+    assert missing_feed_stats.http_status == 404
+    assert missing_feed_stats.new_entries == 0
+
+
+def test_feed_fetcher_fetch_stats_updated_entries(db, fetchers_cache_dir, feed_server):
+    feed_url = feed_server.add_feed(
+        "/feed.xml", create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    )
+    with freeze_time(django_now() - timedelta(days=1)):
+        FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+    feed_server.add_feed(
+        "/feed.xml",
+        create_simple_feed(
+            entries=[
+                {"gid": "http://e.com/1", "title": "Changed"},
+                {"gid": "http://e.com/2"},
+            ]
+        ),
+    )
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[feed_url])
+
+    feed_stats = fetched_data.feeds[0].fetch_stats
+    assert feed_stats.new_entries == 1
+    assert feed_stats.updated_entries == 1
+
+
+@pytest.mark.parametrize(
+    "feed,expected",
+    [
+        ({}, ("", "")),
+        (
+            {
+                "links": [
+                    {"rel": "alternate", "href": "http://example.com/"},
+                    {"rel": "hub", "href": "http://hub.example.com/"},
+                    {"rel": "self", "href": "http://example.com/feed.xml"},
+                ]
+            },
+            ("http://hub.example.com/", "http://example.com/feed.xml"),
+        ),
+        (
+            {"links": [{"rel": "hub", "href": "http://hub.example.com/"}]},
+            ("http://hub.example.com/", ""),
+        ),
+    ],
+)
+def test_get_feed_websub_links(feed, expected):
+    assert get_feed_websub_links(feed) == expected
+
+
+@pytest.mark.parametrize(
+    "extra_elements,entries,expected",
+    [
+        pytest.param("", (), {"links": []}, id="no_hints"),
+        pytest.param(
+            "<ttl>60</ttl><sy:updatePeriod>daily</sy:updatePeriod>"
+            "<sy:updateFrequency>2</sy:updateFrequency>",
+            (),
+            {
+                "links": [],
+                "ttl": "60",
+                "sy_updateperiod": "daily",
+                "sy_updatefrequency": "2",
+            },
+            id="hints",
+        ),
+        pytest.param(
+            '<atom:link xmlns:atom="http://www.w3.org/2005/Atom" '
+            'rel="hub" href="http://hub.example.com/"/>',
+            (),
+            {
+                "links": [
+                    {
+                        "xmlns:atom": "http://www.w3.org/2005/Atom",
+                        "rel": "hub",
+                        "href": "http://hub.example.com/",
+                    }
+                ]
+            },
+            id="links",
+        ),
+        pytest.param(
+            "&nbsp;<ttl>60</ttl>", (), {"links": [], "ttl": "60"}, id="not_well_formed"
+        ),
+        pytest.param(
+            "",
+            [{"gid": "http://e.com/1", "content": "<ttl>60</ttl>"}],
+            {"links": []},
+            id="entries_ignored",
+        ),
+    ],
+)
+def test_get_feed_head(extra_elements, entries, expected):
+    body = create_simple_feed(extra_elements=extra_elements, entries=entries)
+
+    assert get_feed_head(body) == expected
+
+
+@pytest.mark.parametrize(
+    "method,secret,expected",
+    [
+        ("sha1", "secret", True),
+        ("sha256", "secret", True),
+        ("sha256", "other secret", False),
+        ("md5", "secret", False),
+    ],
+)
+def test_is_valid_websub_signature(method, secret, expected):
+    content = b"<rss></rss>"
+    digestmod = getattr(hashlib, method)
+    signature = hmac.new(secret.encode(), content, digestmod).hexdigest()
+
+    assert (
+        is_valid_websub_signature("secret", content, f"{method}={signature}")
+        is expected
+    )
+
+
+def test_feed_fetcher_receives_websub_links(db, fetchers_cache_dir, feed_server):
+    body = create_simple_feed(
+        extra_elements=(
+            '<atom:link xmlns:atom="http://www.w3.org/2005/Atom" '
+            'rel="hub" href="http://hub.example.com/"/>'
+            '<atom:link xmlns:atom="http://www.w3.org/2005/Atom" '
+            'rel="self" href="http://example.com/feed.xml"/>'
+        )
+    )
+    feed_links_url = feed_server.add_feed("/feed-links.xml", body)
+    headers = {
+        "Link": (
+            '<http://other-hub.example.com/>; rel="hub", '
+            '<http://example.com/other.xml>; rel="self"'
+        )
+    }
+    http_links_url = feed_server.add_feed("/http-links.xml", body, headers=headers)
+    no_links_url = feed_server.add_feed("/no-links.xml", create_simple_feed())
+
+    fetched_data = FeedChannelsFetcher.fetch(
+        feed_urls=[feed_links_url, http_links_url, no_links_url]
+    )
+
+    websub_links = {
+        feed.url: (feed.websub_hub, feed.websub_topic) for feed in fetched_data.feeds
+    }
+    assert websub_links == {
+        feed_links_url: ("http://hub.example.com/", "http://example.com/feed.xml"),
+        http_links_url: (
+            "http://other-hub.example.com/",
+            "http://example.com/other.xml",
+        ),
+        no_links_url: ("", ""),
+    }
+
+
+@pytest.mark.parametrize(
+    "engine", [FeedFetcherEnginesEnum.THREADS, FeedFetcherEnginesEnum.ASYNCIO]
+)
+def test_feed_fetcher_parse_pool(
+    db, feed_parse_pool, feed_server, settings, mocker, engine
+):
+    settings.KUSTOSZ_FEED_FETCHER_ENGINE = engine
+    submit = mocker.spy(ProcessPoolExecutor, "submit")
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0
+    feed_urls = []
+    for i in range(4):
+        entries = [{"gid": f"http://e.com/{i}/{j}"} for j in range(i + 1)]
+        body = create_simple_feed(
+            title=f"Feed {i}",
+            entries=entries,
+            extra_elements=(
+                "<ttl>30</ttl>"
+                '<atom:link xmlns:atom="http://www.w3.org/2005/Atom" '
+                'rel="hub" href="http://hub.example.com/"/>'
+            ),
+        )
+        feed_urls.append(feed_server.add_feed(f"/feed{i}.xml", body))
+    broken_url = feed_server.add_feed("/broken.xml", b"", status=500)
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=feed_urls + [broken_url])
+
+    fetched_feeds = {feed.url: feed for feed in fetched_data.feeds}
+    assert fetched_feeds[broken_url].fetch_failed
+    for i, feed_url in enumerate(feed_urls):
+        fetched_feed = fetched_feeds[feed_url]
+        assert not fetched_feed.fetch_failed
+        assert fetched_feed.title == f"Feed {i}"
+        assert fetched_feed.update_hint == 1800
+        assert fetched_feed.websub_hub == "http://hub.example.com/"
+        assert fetched_feed.fetch_stats.new_entries == i + 1
+    assert len(fetched_data.entries) == 10
+    assert submit.call_count == len(feed_urls)
+
+
+def _parse_in_daemonic_process(body, queue):
+    update_hints = {}
+    parser = ProcessPoolFeedparserParser(update_hints, {})
+    try:
+        feed, entries = parser("http://example.com/feed.xml", io.BytesIO(body))
+    except Exception as e:
+        queue.put(repr(e))
+    else:
+        queue.put((feed.title, len(list(entries)), update_hints))
+
+
+def test_parse_pool_in_daemonic_process(feed_parse_pool):
+    # Celery prefork pool workers are daemonic and can't start pool
+    body = create_simple_feed(
+        title="Feed",
+        entries=[{"gid": "http://e.com/1"}],
+        extra_elements="<ttl>30</ttl>",
+    )
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(
+        target=_parse_in_daemonic_process, args=(body, queue), daemon=True
+    )
+
+    process.start()
+    result = queue.get(timeout=30)
+    process.join()
+
+    assert result == ("Feed", 1, {"http://example.com/feed.xml": 1800})
+
+
+def test_parse_pool_in_daemonic_process_warning(feed_parse_pool, mocker, caplog):
+    mocker.patch("kustosz.fetchers.parse_pool._daemonic_warning_logged", False)
+    mocker.patch(
+        "kustosz.fetchers.parse_pool.multiprocessing.current_process"
+    ).return_value.daemon = True
+
+    assert can_use_parse_pool() is False
+    assert can_use_parse_pool() is False
+
+    warnings = [
+        record
+        for record in caplog.records
+        if "KUSTOSZ_FEED_PARSER_PROCESSES" in record.getMessage()
+    ]
+    assert len(warnings) == 1
+    assert warnings[0].levelname == "WARNING"
+
+
+def test_feed_fetcher_parse_content(db, fetchers_cache_dir):
+    content = create_simple_feed(
+        title="Test",
+        entries=[{"gid": "http://e.com/1", "title": "First", "content": "Text"}],
+    )
+
+    fetched_data = FeedChannelsFetcher.parse_content(
+        "http://example.com/feed.xml", content, "application/rss+xml"
+    )
+
+    assert fetched_data.feeds[0].url == "http://example.com/feed.xml"
+    assert fetched_data.feeds[0].title == "Test"
+    fetched_entry = fetched_data.entries[0]
+    assert fetched_entry.feed_url == "http://example.com/feed.xml"
+    assert fetched_entry.gid == "http://e.com/1"
+    assert fetched_entry.title == "First"
+    assert fetched_entry.content[0].source == EntryContentSourceTypesEnum.FEED_SUMMARY
+    assert fetched_entry.content[0].content == "Text"
+
+
+def test_feed_fetcher_parse_invalid_content(db, fetchers_cache_dir):
+    with pytest.raises(PermanentFetcherError):
+        FeedChannelsFetcher.parse_content(
+            "http://example.com/feed.xml", b"\x00 not a feed", "application/rss+xml"
+        )
+
+
+def test_feed_fetcher_feed_deadline(db, fetchers_cache_dir, feed_server, settings):
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0
+    settings.KUSTOSZ_FEED_FETCH_DEADLINE = 0.3
+    settings.KUSTOSZ_FEED_FETCHER_CHUNK_DEADLINE = 0
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    slow_url = feed_server.add_feed("/slow.xml", body, trickle_delay=0.1)
+    fast_url = feed_server.add_feed("/fast.xml", body)
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=[slow_url, fast_url])
+
+    fetched_feeds = {feed.url: feed for feed in fetched_data.feeds}
+    assert fetched_feeds[slow_url].fetch_failed
+    assert not fetched_feeds[slow_url].abandoned
+    assert "not downloaded within" in fetched_feeds[slow_url].failure_reason
+    assert not fetched_feeds[fast_url].fetch_failed
+    assert not fetched_feeds[fast_url].failure_reason
+
+
+def test_feed_fetcher_chunk_deadline(db, fetchers_cache_dir, feed_server, settings):
+    settings.KUSTOSZ_HOST_REQUEST_INTERVAL = 0
+    settings.KUSTOSZ_FEED_FETCH_DEADLINE = 0
+    settings.KUSTOSZ_FEED_FETCHER_CHUNK_DEADLINE = 0.5
+    body = create_simple_feed(entries=[{"gid": "http://e.com/1"}])
+    feed_urls = [feed_server.add_feed(f"/feed{i}.xml", body) for i in range(3)]
+    slow_url = feed_server.add_feed("/slow.xml", body, trickle_delay=0.2)
+
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=feed_urls + [slow_url])
+
+    fetched_feeds = {feed.url: feed for feed in fetched_data.feeds}
+    slow_feed = fetched_feeds[slow_url]
+    assert slow_feed.fetch_failed
+    assert slow_feed.abandoned
+    assert slow_feed.failure_reason == ABANDONED_MESSAGE
+    abandoned_urls = [slow_url]
+    for feed_url in feed_urls:
+        fetched_feed = fetched_feeds[feed_url]
+        # feeds requested after deadline are abandoned without request
+        assert fetched_feed.abandoned == fetched_feed.fetch_failed
+        if fetched_feed.abandoned:
+            abandoned_urls.append(feed_url)
+
+    settings.KUSTOSZ_FEED_FETCHER_CHUNK_DEADLINE = 0
+    feed_server.add_feed("/slow.xml", body)
+    fetched_data = FeedChannelsFetcher.fetch(feed_urls=abandoned_urls)
+
+    # abandoned feeds were not marked as updated, so they can be fetched again
+    assert {feed.url for feed in fetched_data.feeds} == set(abandoned_urls)
+    assert not any(feed.fetch_failed for feed in fetched_data.feeds)
+
+
+def test_iterate_in_background():
+    consumer_thread = threading.get_ident()
+    producer_threads = set()
+
+    def make_iterable():
+        for i in range(5):
+            producer_threads.add(threading.get_ident())
+            yield i
+
+    assert list(iterate_in_background(make_iterable, max_size=2)) == list(range(5))
+    assert producer_threads and consumer_thread not in producer_threads
+
+
+def test_iterate_in_background_bounded():
+    produced = []
+
+    def make_iterable():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    items = iterate_in_background(make_iterable, max_size=2)
+    assert next(items) == 0
+    time.sleep(0.3)
+    # one item taken, two waiting in queue and one waiting to be put there
+    assert len(produced) == 4
+    items.close()
+
+
+def test_iterate_in_background_closed_early():
+    finished = threading.Event()
+
+    def make_iterable():
+        try:
+            yield from range(10)
+        finally:
+            finished.set()
+
+    items = iterate_in_background(make_iterable, max_size=2)
+    assert next(items) == 0
+    items.close()
+
+    assert finished.is_set()
+
+
+def test_iterate_in_background_exception():
+    def make_iterable():
+        yield 1
+        raise ValueError("producer failed")
+
+    items = iterate_in_background(make_iterable, max_size=2)
+    assert next(items) == 1
+    with pytest.raises(ValueError, match="producer failed"):
+        next(items)
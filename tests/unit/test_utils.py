@@ -1,16 +1,24 @@
 from datetime import datetime
+from datetime import timedelta
 
 import pytest
 from django.utils.http import http_date
+from django.utils.timezone import now as django_now
 from pytest import approx
 
 from ..framework.factories.models import EntryFactory
 from ..framework.factories.types import FakeRequestFactory
 from ..framework.utils import create_simple_html
+from kustosz.models import Entry
+from kustosz.models import EntryContent
 from kustosz.utils import estimate_reading_time
 from kustosz.utils import normalize_url
 from kustosz.utils.extract_metadata import MetadataExtractor
 from kustosz.utils.run_script import entry_data_env
+from kustosz.utils.update_schedule import estimate_update_frequency
+from kustosz.utils.update_schedule import get_backoff_delay
+from kustosz.utils.upsert import update_or_insert_objects
+from kustosz.utils.upsert import upsert_objects
 
 
 @pytest.mark.parametrize(
@@ -53,6 +61,23 @@ def test_normalize_url_unsorted_query(url, expected):
     assert normalize_url(url, sort_query=False) == expected
 
 
+@pytest.mark.parametrize(
+    "minutes_ago,expected",
+    [
+        pytest.param([], 86400, id="no entries"),
+        pytest.param([5, 15, 25, 35], 900, id="busy"),
+        pytest.param([60, 60 * 25, 60 * 49], 43200, id="daily"),
+        pytest.param([600, 660, 720, 780], 9000, id="hourly, quiet recently"),
+        pytest.param([60 * 24 * 60, 60 * 24 * 61], 86400, id="abandoned"),
+        pytest.param([240], 7200, id="single entry"),
+    ],
+)
+def test_estimate_update_frequency(minutes_ago, expected):
+    now = datetime(2026, 10, 18, 12, 0)
+    published_times = [now - timedelta(minutes=minutes) for minutes in minutes_ago]
+    assert estimate_update_frequency(published_times, now) == expected
+
+
 def test_metadata_extract_opengraph(faker):
     metadata = {
         "article:author": faker.name(),
@@ -433,3 +458,114 @@ def test_entry_data_env(db, faker):
         assert env[env_key] == str(getattr(entry.channel, key))
     other_env = {k: v for k, v in env.items() if not k.startswith("KUSTOSZ_")}
     assert other_env
+
+
+@pytest.mark.parametrize(
+    "update_frequency,consecutive_failures,expected",
+    [
+        pytest.param(3600, 0, 3600, id="no_failures"),
+        pytest.param(3600, 1, 7200, id="one_failure"),
+        pytest.param(3600, 4, 57600, id="four_failures"),
+        pytest.param(3600, 5, 86400, id="limited"),
+        pytest.param(3600, 1000, 86400, id="many_failures"),
+        pytest.param(172800, 3, 172800, id="update_frequency_above_limit"),
+    ],
+)
+def test_get_backoff_delay(update_frequency, consecutive_failures, expected, settings):
+    settings.KUSTOSZ_FAILING_CHANNEL_MAX_BACKOFF = 86400
+    assert get_backoff_delay(update_frequency, consecutive_failures) == expected
+
+
+def test_upsert_objects(db):
+    changed_entry, unchanged_entry = EntryFactory.create_batch(2, archived=True)
+    channel = changed_entry.channel
+    unchanged_entry.channel = channel
+    unchanged_entry.save()
+    objs = [
+        Entry(channel=channel, gid=changed_entry.gid, title="New title"),
+        Entry(
+            channel=channel,
+            gid=unchanged_entry.gid,
+            title=unchanged_entry.title,
+            updated_time=django_now(),
+        ),
+        Entry(channel=channel, gid="http://example.com/new"),
+    ]
+
+    result = upsert_objects(
+        Entry,
+        objs,
+        unique_fields=("channel", "gid"),
+        compared_fields=("title",),
+        inserted_marker="added_time",
+        touched_fields=("updated_time",),
+        batch_size=2,
+    )
+
+    assert [obj.gid for obj in result.inserted] == ["http://example.com/new"]
+    assert [obj.pk for obj in result.updated] == [changed_entry.pk]
+    assert Entry.objects.get(gid="http://example.com/new").pk == objs[2].pk
+    changed_entry.refresh_from_db()
+    assert changed_entry.title == "New title"
+    assert changed_entry.archived
+    old_updated_time = unchanged_entry.updated_time
+    unchanged_entry.refresh_from_db()
+    assert unchanged_entry.updated_time == old_updated_time
+
+
+def test_update_or_insert_objects(db):
+    entry = EntryFactory.create(content_set=2)
+    changed_content, unchanged_content = entry.content_set.order_by("pk")
+    objs = [
+        EntryContent(
+            entry=entry,
+            source=changed_content.source,
+            mimetype=changed_content.mimetype,
+            language=changed_content.language,
+            content="New content",
+            content_hash="new",
+            estimated_reading_time=0,
+            updated_time=django_now(),
+        ),
+        EntryContent(
+            entry=entry,
+            source=unchanged_content.source,
+            mimetype=unchanged_content.mimetype,
+            language=unchanged_content.language,
+            content="Ignored content",
+            content_hash=unchanged_content.content_hash,
+            estimated_reading_time=0,
+            updated_time=django_now(),
+        ),
+        EntryContent(
+            entry=entry,
+            source=unchanged_content.source,
+            mimetype="text/new",
+            language=unchanged_content.language,
+            content="Added content",
+            content_hash="added",
+            estimated_reading_time=0,
+            updated_time=django_now(),
+        ),
+    ]
+
+    result = update_or_insert_objects(
+        EntryContent,
+        objs,
+        key_fields=("entry", "source", "mimetype", "language"),
+        compared_fields=("content_hash",),
+        touched_fields=("content",),
+        batch_size=2,
+    )
+
+    assert [obj.content for obj in result.inserted] == ["Added content"]
+    assert [obj.pk for obj in result.updated] == [changed_content.pk]
+    assert entry.content_set.count() == 3
+    assert entry.content_set.get(mimetype="text/new").pk == objs[2].pk
+    old_updated_time = changed_content.updated_time
+    changed_content.refresh_from_db()
+    assert changed_content.content == "New content"
+    assert changed_content.updated_time == old_updated_time
+    old_content = unchanged_content.content
+    unchanged_content.refresh_from_db()
+    assert unchanged_content.content == old_content